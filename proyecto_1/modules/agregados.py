@@ -0,0 +1,237 @@
+import threading
+from collections import Counter
+from modules.cache_tokens import CacheTokensReclamos, cache_tokens_reclamos, tokenizar_nube
+from modules.dominio import Estado
+from modules.marca_agua import VIGENCIA_MARCA, MarcaDeAgua
+from modules.monticulos import PercentilesMoviles
+from modules.observador_reclamos import ObservadorReclamos
+from modules.repositorio_abstracto import RepositorioAbstracto
+
+# Estados para los que se calculan percentiles de tiempo_en_proceso
+ESTADOS_CON_TIEMPO = (Estado.EN_PROCESO.value, Estado.RESUELTO.value)
+# Percentiles de tiempo_en_proceso que se mantienen por estado (mediana y p90)
+PERCENTILES_TIEMPO = (50, 90)
+# Columnas de los reclamos modificados por otros procesos que se leen para sincronizar los agregados
+COLUMNAS_SINCRONIZACION = ("id_reclamo", "departamento", "estado", "contenido", "tiempo_en_proceso")
+
+
+def calcular_porcentajes(conteo):
+    """
+    Calcula el porcentaje de reclamos de cada estado.
+    Args:
+        conteo (Counter): Cantidad de reclamos por estado.
+    Returns:
+        dict: Porcentaje (0 a 100) de cada estado, vacío si no hay reclamos.
+    """
+    total = sum(conteo.values())
+    return {estado: (cantidad / total) * 100 for estado, cantidad in conteo.items()} if total else {}
+
+
+def percentil_histograma(histograma, percentil):
+    """
+    Calcula un percentil (con interpolación lineal, igual que MonticuloPercentil) a partir de un histograma.
+    Args:
+        histograma (dict): Cantidad de apariciones de cada valor.
+        percentil (float): Percentil entre 0 y 100.
+    Returns:
+        float or None: El percentil, o None si el histograma está vacío.
+    """
+    n = sum(histograma.values())
+    if n == 0:
+        return None
+    posicion, resto = divmod(percentil * (n - 1), 100)
+    posicion = int(posicion)
+    fraccion = resto / 100
+    # Valores en las posiciones posicion y posicion + 1 de la lista ordenada
+    vecinos = []
+    acumulado = 0
+    for valor, cantidad in sorted(histograma.items()):
+        acumulado += cantidad
+        while len(vecinos) < 2 and posicion + len(vecinos) < acumulado:
+            vecinos.append(valor)
+        if len(vecinos) == 2:
+            break
+    if fraccion == 0:
+        return vecinos[0]
+    return vecinos[0] + (vecinos[1] - vecinos[0]) * fraccion
+
+
+class EstadisticasDepartamento:
+    """
+    Agregados de los reclamos de un departamento: cantidad por estado, frecuencia de palabras
+    para la nube y los PERCENTILES_TIEMPO de tiempo_en_proceso por cada estado de ESTADOS_CON_TIEMPO.
+    Cada cambio incrementa la versión, que sirve para saber si algo derivado (gráficos, reportes) quedó viejo.
+    Guarda con qué estado, tiempo y contenido (su huella) se contó cada reclamo, así sumar dos veces el mismo
+    reclamo no lo cuenta de nuevo y quitar resta lo que realmente se había sumado (ver AgregadosReclamos).
+    """
+    def __init__(self, version=0):
+        '''Inicializa los agregados vacíos, con la versión indicada.'''
+        self.conteo = Counter()
+        self.palabras = Counter()
+        self.tiempos = {estado: PercentilesMoviles(PERCENTILES_TIEMPO) for estado in ESTADOS_CON_TIEMPO}
+        self.contados = {}      # id_reclamo -> (estado, tiempo_en_proceso, huella del contenido)
+        self.version = version
+
+    def sumar(self, id_reclamo, estado, contenido, tiempo_en_proceso):
+        """Suma un reclamo a los agregados. Si ya estaba sumado no hace nada."""
+        if id_reclamo in self.contados:
+            return
+        self.contados[id_reclamo] = (estado, tiempo_en_proceso, CacheTokensReclamos.huella(contenido))
+        self.conteo[estado] += 1
+        self.palabras.update(cache_tokens_reclamos.obtener(id_reclamo, contenido, tokenizar_nube, "nube"))
+        percentiles = self.tiempos.get(estado)
+        if percentiles is not None and tiempo_en_proceso is not None:
+            percentiles.agregar_valor(tiempo_en_proceso)
+        self.version += 1
+
+    def quitar(self, id_reclamo, contenido):
+        """
+        Resta un reclamo de los agregados, con el estado y el tiempo con que se sumó. Si no estaba no hace nada.
+        Devuelve False, sin restar nada, si el contenido no es con el que se sumó: sus palabras no se pueden
+        restar y hay que volver a calcular los agregados.
+        """
+        contado = self.contados.get(id_reclamo)
+        if contado is None:
+            return True
+        if contado[2] != CacheTokensReclamos.huella(contenido):
+            return False
+        del self.contados[id_reclamo]
+        estado, tiempo_en_proceso, _ = contado
+        self.conteo[estado] -= 1
+        if self.conteo[estado] <= 0:
+            del self.conteo[estado]
+        self.palabras.subtract(cache_tokens_reclamos.obtener(id_reclamo, contenido, tokenizar_nube, "nube"))
+        self.palabras = +self.palabras
+        percentiles = self.tiempos.get(estado)
+        if percentiles is not None and tiempo_en_proceso is not None:
+            percentiles.eliminar_valor(tiempo_en_proceso)
+        self.version += 1
+        return True
+
+    @property
+    def total(self):
+        return sum(self.conteo.values())
+
+
+class AgregadosReclamos(ObservadorReclamos):
+    """
+    Mantiene las estadísticas de cada departamento actualizadas a medida que se agregan o editan reclamos,
+    para que la página de analítica no tenga que recorrer todos los reclamos en cada visita.
+    Los agregados de un departamento se calculan desde el repositorio la primera vez que se piden;
+    a partir de ahí se actualizan con las notificaciones de GestorDeReclamos.
+    Un reclamo guardado justo antes de calcularlos puede aparecer en la consulta y además notificarse después;
+    como EstadisticasDepartamento recuerda qué reclamos contó y con qué estado, no se cuenta dos veces.
+    Los cambios que no pasan por GestorDeReclamos (otros procesos del servidor, los scripts de reclasificación
+    e importación) se incorporan con sincronizar, que se llama sola cada vigencia segundos al pedir un resumen
+    (ver MarcaDeAgua). Si además el total de un departamento no coincide con el de la base (hubo bajas), o no
+    se pueden restar las palabras de un reclamo, sus agregados se descartan y se vuelven a calcular.
+    """
+    def __init__(self, repo: RepositorioAbstracto, vigencia=VIGENCIA_MARCA):
+        """
+        Inicializa el almacén de agregados.
+        Args:
+            repo (RepositorioAbstracto): Repositorio de reclamos.
+            vigencia (float): Segundos entre consultas a la base para incorporar los cambios de otros procesos.
+        """
+        self.__repo = repo
+        self.__departamentos = {}
+        self.__versiones = {}       # departamento -> última versión de los agregados descartados
+        self.__marca = MarcaDeAgua(repo, COLUMNAS_SINCRONIZACION, vigencia)
+        self.__lock = threading.RLock()
+
+    def __obtener_departamento(self, departamento):
+        '''Devuelve los agregados del departamento, calculándolos si es la primera vez.'''
+        estadisticas = self.__departamentos.get(departamento)
+        if estadisticas is None:
+            # La versión sigue desde la de los agregados descartados, para que nunca se repita
+            estadisticas = EstadisticasDepartamento(self.__versiones.get(departamento, 0))
+            for id_reclamo, estado, contenido, tiempo in self.__repo.obtener_datos_analitica(departamento):
+                estadisticas.sumar(id_reclamo, estado, contenido, tiempo)
+            self.__departamentos[departamento] = estadisticas
+        return estadisticas
+
+    def __descartar(self, departamento):
+        '''Descarta los agregados del departamento; se vuelven a calcular la próxima vez que se pidan.'''
+        estadisticas = self.__departamentos.pop(departamento, None)
+        if estadisticas is not None:
+            self.__versiones[departamento] = estadisticas.version + 1
+
+    def sincronizar(self, forzar=True):
+        """
+        Incorpora a los agregados ya calculados los reclamos agregados o modificados en la base sin pasar por
+        GestorDeReclamos, y descarta los de los departamentos cuyo total no coincide con el de la base.
+        Args:
+            forzar (bool): Si es False solo consulta la base si pasó la vigencia desde la última vez.
+        """
+        with self.__lock:
+            cambios = self.__marca.cambios(forzar)
+            if cambios is None:
+                return
+            for id_reclamo, departamento, estado, contenido, tiempo in cambios:
+                huella = CacheTokensReclamos.huella(contenido)
+                for nombre, estadisticas in list(self.__departamentos.items()):
+                    contado = estadisticas.contados.get(id_reclamo)
+                    if nombre == departamento and contado == (estado, tiempo, huella):
+                        continue
+                    if not estadisticas.quitar(id_reclamo, contenido):
+                        self.__descartar(nombre)
+                    elif nombre == departamento:
+                        estadisticas.sumar(id_reclamo, estado, contenido, tiempo)
+            if self.__departamentos:
+                totales = self.__repo.contar_por_departamento()
+                for nombre, estadisticas in list(self.__departamentos.items()):
+                    if estadisticas.total != totales.get(nombre, 0):
+                        self.__descartar(nombre)
+
+    def obtener_resumen(self, departamento):
+        """
+        Devuelve un resumen de los reclamos del departamento.
+        Args:
+            departamento (str): Nombre del departamento.
+        Returns:
+            dict: Diccionario con las claves:
+                - "total" (int): Cantidad de reclamos.
+                - "conteo" (Counter): Cantidad de reclamos por estado.
+                - "mediana_proceso" (float or None): Mediana de tiempo_en_proceso de los reclamos "En proceso".
+                - "mediana_resueltos" (float or None): Mediana de tiempo_en_proceso de los reclamos "Resuelto".
+                - "p90_proceso" (float or None): Percentil 90 de tiempo_en_proceso de los reclamos "En proceso".
+                - "p90_resueltos" (float or None): Percentil 90 de tiempo_en_proceso de los reclamos "Resuelto".
+                - "palabras" (Counter): Frecuencia de palabras para la nube.
+                - "version" (int): Versión de los agregados del departamento.
+        """
+        with self.__lock:
+            self.sincronizar(forzar=False)
+            estadisticas = self.__obtener_departamento(departamento)
+            return {
+                "total": estadisticas.total,
+                "conteo": Counter(estadisticas.conteo),
+                "mediana_proceso": estadisticas.tiempos[Estado.EN_PROCESO.value].percentil(50),
+                "mediana_resueltos": estadisticas.tiempos[Estado.RESUELTO.value].percentil(50),
+                "p90_proceso": estadisticas.tiempos[Estado.EN_PROCESO.value].percentil(90),
+                "p90_resueltos": estadisticas.tiempos[Estado.RESUELTO.value].percentil(90),
+                "palabras": Counter(estadisticas.palabras),
+                "version": estadisticas.version
+            }
+
+    def __sumar(self, reclamo):
+        estadisticas = self.__departamentos.get(reclamo.departamento)
+        if estadisticas is not None:
+            estadisticas.sumar(reclamo.id_reclamo, reclamo.estado, reclamo.contenido, reclamo.tiempo_en_proceso)
+
+    def __quitar(self, reclamo):
+        estadisticas = self.__departamentos.get(reclamo.departamento)
+        if estadisticas is not None and not estadisticas.quitar(reclamo.id_reclamo, reclamo.contenido):
+            self.__descartar(reclamo.departamento)
+
+    def reclamo_agregado(self, reclamo):
+        with self.__lock:
+            self.__sumar(reclamo)
+
+    def reclamo_modificado(self, anterior, reclamo):
+        with self.__lock:
+            self.__quitar(anterior)
+            self.__sumar(reclamo)
+
+    def reclamo_eliminado(self, reclamo):
+        with self.__lock:
+            self.__quitar(reclamo)
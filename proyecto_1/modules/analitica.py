@@ -1,99 +1,182 @@
+from datetime import datetime
+from io import BytesIO
 from modules.repositorio_abstracto import RepositorioAbstracto
-from modules.monticulos import MonticuloMediana
-from modules.graficador import Graficador
-from modules.fabrica_exportadores import obtener_exportador
-from collections import Counter
+from modules.agregados import AgregadosReclamos
+from modules.cache_graficos import CacheGraficos
+from modules.cache_tokens import CacheLRU
+from modules.fabrica_exportadores import obtener_exportador, obtener_exportador_datos
+from modules.instantanea_reclamos import InstantaneaReclamos
+from modules.marca_agua import VENTANA_MARCA
+from modules.series_temporales import PERIODO_SERIE, armar_serie
 
 class Analitica():
     '''
     Clase Analitica para generar estadísticas y visualizaciones sobre reclamos de un departamento.
     Utiliza un repositorio que implementa la interfaz RepositorioAbstracto para acceder a los datos.'''
-    def __init__(self, repo: RepositorioAbstracto):
+    def __init__(self, repo: RepositorioAbstracto, agregados: AgregadosReclamos = None, graficos: CacheGraficos = None,
+                 reportes: CacheLRU = None, instantanea: InstantaneaReclamos = None):
         """
         Inicializa la clase con un repositorio dado.
         Args:
             repo (RepositorioAbstracto): Instancia de un repositorio que implementa la interfaz RepositorioAbstracto.
+            agregados (AgregadosReclamos): Almacén de agregados compartido y mantenido por GestorDeReclamos.
+                Si no se indica, se crea uno propio que calcula los agregados desde el repositorio.
+            graficos (CacheGraficos): Caché de gráficos compartida. Si no se indica, se crea una propia
+                (las imágenes ya dibujadas con los mismos datos se reutilizan igual, porque quedan en disco).
+            reportes (CacheLRU): Caché de reportes terminados, por departamento, formato y huella de los reclamos
+                del departamento en la base (ver exportar_por_partes).
+            instantanea (InstantaneaReclamos): Copia por columnas de los reclamos, compartida y mantenida por
+                GestorDeReclamos, de donde salen las estadísticas numéricas y la serie temporal. Si no se indica,
+                se crea una propia que se carga desde el repositorio.
         """
         self.__repo = repo
+        self.__agregados = agregados if agregados is not None else AgregadosReclamos(repo)
+        self.__graficos = graficos if graficos is not None else CacheGraficos(self.__agregados)
+        self.__reportes = reportes if reportes is not None else CacheLRU(16)
+        self.__instantanea = instantanea if instantanea is not None else InstantaneaReclamos(repo)
 
-    def generar_estadisticas(self, departamento):
+    def generar_serie_temporal(self, departamento, periodo=PERIODO_SERIE):
+        """
+        Genera la serie temporal de los reclamos del departamento (creados, resueltos, abiertos acumulados y tiempos
+        de resolución por período), agrupando por período los reclamos de la instantánea.
+        Parámetros:
+            departamento (str): Nombre del departamento.
+            periodo (str): "dia", "semana" o "mes".
+        Retorna:
+            list: Un diccionario por período (ver series_temporales.armar_serie).
+        Lanza:
+            ValueError: Si el período no es válido.
+        """
+        return armar_serie(self.__instantanea.conteos_por_periodo(departamento, periodo), periodo)
+
+    def generar_estadisticas(self, departamento, periodo=PERIODO_SERIE):
         """
         Genera estadísticas y gráficos basados en los reclamos de un departamento específico.
+        Los conteos, porcentajes, medianas, percentiles y la serie temporal se calculan con operaciones
+        vectorizadas sobre la instantánea por columnas; las palabras de la nube salen de los agregados.
         Parámetros:
             departamento (str): Nombre del departamento para filtrar los reclamos.
+            periodo (str): Período de la serie temporal ("dia", "semana" o "mes").
         Retorna:
             dict: Un diccionario con las siguientes claves:
                 - "total" (int): Cantidad total de reclamos encontrados.
                 - "porcentajes" (dict): Porcentaje de reclamos por estado.
                 - "mediana_proceso" (float or None): Mediana del tiempo en proceso de los reclamos en estado "En proceso".
                 - "mediana_resueltos" (float or None): Mediana del tiempo en proceso de los reclamos en estado "Resuelto".
+                - "p90_proceso" (float or None): Percentil 90 del tiempo en proceso de los reclamos en estado "En proceso".
+                - "p90_resueltos" (float or None): Percentil 90 del tiempo en proceso de los reclamos en estado "Resuelto".
                 - "ruta_nube" (str or None): Ruta al archivo generado del gráfico de nube de palabras.
                 - "ruta_torta" (str or None): Ruta al archivo generado del gráfico de torta de porcentajes por estado.
-        Excepciones:
-            Maneja internamente errores al calcular medianas y al generar gráficos, retornando None en caso de fallo.
+                - "periodo" (str): Período de la serie temporal.
+                - "serie" (list): Serie temporal por período (ver generar_serie_temporal).
+        Lanza:
+            ValueError: Si el período no es válido.
         """
-        lista_reclamos = self.__repo.obtener_registros_por_filtro("departamento", departamento)
+        resumen = self.__instantanea.obtener_resumen(departamento)
+        serie = self.generar_serie_temporal(departamento, periodo)
 
-        total = len(lista_reclamos)
+        total = resumen["total"]
         if total == 0:
             return {
                 "total": 0,
                 "porcentajes": {},
                 "mediana_proceso": None,
                 "mediana_resueltos": None,
+                "p90_proceso": None,
+                "p90_resueltos": None,
                 "ruta_nube": None,
-                "ruta_torta": None
+                "ruta_torta": None,
+                "imagen_nube": None,
+                "imagen_torta": None,
+                "periodo": periodo,
+                "serie": serie
             }
 
-        estados = [r.estado for r in lista_reclamos]
-        tiempos_proceso = [r.tiempo_en_proceso for r in lista_reclamos if r.estado == "En proceso"]
-        tiempos_resueltos = [r.tiempo_en_proceso for r in lista_reclamos if r.estado == "Resuelto"]
-
-        conteo = Counter(estados)
-        porcentajes = {estado: (conteo[estado] / total) * 100 for estado in conteo}
-
-       # Mediana tiempos - con control de errores
-        mediana_proceso = None
-        mediana_resueltos = None
-
-        try:
-            if tiempos_proceso:  # Verificamos que haya datos
-                monticulo_proceso = MonticuloMediana()
-                monticulo_proceso.construir_monticulo(tiempos_proceso)
-                mediana_proceso = monticulo_proceso.mediana
-        except Exception as e:
-            print(f"Error al calcular la mediana de tiempos en proceso: {e}")
-            mediana_proceso = None
-
-        try:
-            if tiempos_resueltos:  # Verificamos que haya datos
-                monticulo_resueltos = MonticuloMediana()
-                monticulo_resueltos.construir_monticulo(tiempos_resueltos)
-                mediana_resueltos = monticulo_resueltos.mediana
-        except Exception as e:
-            print(f"Error al calcular la mediana de tiempos resueltos: {e}")
-            mediana_resueltos = None
-
-        # Grafico de nube
-        textos = " ".join([r.contenido.lower() for r in lista_reclamos])
-        output_file_nube = Graficador.graficar_nube(textos)
-
-        # Grafico de torta
-        output_file_torta = Graficador.graficar_torta(porcentajes)    
+        porcentajes = resumen["porcentajes"]
 
+        # Graficos de nube y torta (solo se dibujan si cambiaron sus datos)
+        graficos = self.__graficos.obtener_graficos(departamento, {
+            "total": total, "conteo": resumen["conteo"],
+            "palabras": self.__agregados.obtener_resumen(departamento)["palabras"]})
 
         return {
             "total": total,
             "porcentajes": porcentajes,
-            "mediana_proceso": mediana_proceso,
-            "mediana_resueltos": mediana_resueltos,
-            "ruta_nube": output_file_nube,
-            "ruta_torta": output_file_torta
+            "mediana_proceso": resumen["mediana_proceso"],
+            "mediana_resueltos": resumen["mediana_resueltos"],
+            "p90_proceso": resumen["p90_proceso"],
+            "p90_resueltos": resumen["p90_resueltos"],
+            "ruta_nube": graficos["ruta_nube"],
+            "ruta_torta": graficos["ruta_torta"],
+            "imagen_nube": graficos["imagen_nube"],
+            "imagen_torta": graficos["imagen_torta"],
+            "periodo": periodo,
+            "serie": serie
         }
-    
-    def exportar_archivo(self, departamento: str, formato: str):
-        stats = self.generar_estadisticas(departamento)
+
+    def exportar_por_partes(self, departamento: str, formato: str):
+        """
+        Genera el reporte del departamento de a partes, para enviarlo al cliente a medida que se genera.
+        Los reportes se guardan en la caché con la huella de los reclamos del departamento en la base (cantidad y
+        último momento de modificación, RepositorioReclamosSQLAlchemy.obtener_huella), así que cualquier cambio,
+        lo haga este proceso u otro, genera un reporte nuevo. Como una modificación puede confirmarse con un
+        actualizado anterior al último (ver MarcaDeAgua), solo se guardan y reutilizan reportes de departamentos
+        sin modificaciones en los últimos VENTANA_MARCA. Antes de generar uno se ponen al día la instantánea
+        y los agregados, para no guardar con la huella nueva datos de antes del cambio.
+        Parámetros:
+            departamento (str): Nombre del departamento.
+            formato (str): Formato del reporte ("pdf" o "html").
+        Retorna:
+            tuple: (partes, mime_type, filename), donde partes es un iterador de bytes.
+        Lanza:
+            ValueError: Si el formato no está soportado.
+        """
         exportador = obtener_exportador(formato)
-        return exportador.generar_reporte(stats, departamento)
+        nombre = exportador.nombre_archivo(departamento)
+        huella = self.__repo.obtener_huella(departamento)
+        clave = (departamento, formato, huella)
+        estable = huella[1] is None or huella[1] <= datetime.now() - VENTANA_MARCA
+        if estable:
+            reporte = self.__reportes.buscar(clave)
+            if reporte is not None:
+                return iter([reporte]), exportador.mime, nombre
+        self.__instantanea.actualizar()
+        self.__agregados.sincronizar()
+        partes = exportador.generar_partes(self.generar_estadisticas(departamento), departamento)
+        if not estable:
+            return partes, exportador.mime, nombre
+        return self.__guardar_al_terminar(clave, partes), exportador.mime, nombre
+
+    def __guardar_al_terminar(self, clave, partes):
+        '''Entrega las partes del reporte y, si se llegaron a generar todas, guarda el reporte completo en la caché.'''
+        generadas = []
+        for parte in partes:
+            generadas.append(parte)
+            yield parte
+        self.__reportes.guardar(clave, b"".join(generadas))
+
+    def exportar_archivo(self, departamento: str, formato: str):
+        """
+        Genera el reporte completo del departamento (ver exportar_por_partes).
+        Retorna:
+            tuple: (buffer, mime_type, filename) con el reporte en un BytesIO.
+        """
+        partes, mime, nombre = self.exportar_por_partes(departamento, formato)
+        return BytesIO(b"".join(partes)), mime, nombre
+
+    def exportar_datos_por_partes(self, departamento: str, formato: str):
+        """
+        Exporta los datos crudos de los reclamos del departamento de a partes (CSV, JSON lines o Parquet).
+        Las filas se leen de la base por lotes a medida que se envían, sin construir entidades Reclamo.
+        Parámetros:
+            departamento (str): Nombre del departamento, o None para exportar todos los reclamos.
+            formato (str): Formato de exportación ("csv", "jsonl" o "parquet").
+        Retorna:
+            tuple: (partes, mime_type, filename), donde partes es un iterador de bytes.
+        Lanza:
+            ValueError: Si el formato no está soportado.
+        """
+        exportador = obtener_exportador_datos(formato)
+        return exportador.exportar(self.__repo, departamento), exportador.mime, exportador.nombre_archivo(departamento)
     
     
\ No newline at end of file
@@ -1,9 +1,6 @@
 from modules.gestor_usuarios import GestorDeUsuarios
 from modules.gestor_reclamos import GestorDeReclamos
 from modules.factoria import crear_repositorio
-from modules.modelos import ModeloUsuario
-from sqlalchemy import create_engine, update, text
-from sqlalchemy.orm import sessionmaker
 
 repo_reclamo, repo_usuario = crear_repositorio()
 gestor_reclamos = GestorDeReclamos(repo_reclamo)
@@ -63,19 +60,5 @@ if __name__ == "__main__":
 
     # insertar_usuarios_jefes(jefes)
 
-    engine=create_engine('sqlite:///data/base_datos.db')
-    Session = sessionmaker(bind=engine)
-    session = Session()
-
-  
-    session.execute(
-        update(ModeloUsuario)
-        .where(ModeloUsuario.rol=='Usuario_final')
-        .values(rol='Usuario_Final')
-    )
-
-
-    session.commit()
-    session.close()
-
-
+    # La corrección de los roles 'Usuario_final' es ahora la migración 3 (modules/migraciones.py)
+    print("Las correcciones de datos se aplican como migraciones: python -m modules.migraciones")
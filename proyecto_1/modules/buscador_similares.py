@@ -0,0 +1,208 @@
+import heapq
+import math
+import threading
+from collections import Counter
+from modules.cache_tokens import cache_tokens_reclamos
+from modules.dominio import ESTADOS_ACTIVOS
+from modules.marca_agua import VIGENCIA_MARCA, MarcaDeAgua
+from modules.observador_reclamos import ObservadorReclamos
+from modules.repositorio_abstracto import RepositorioAbstracto
+from modules.text_vectorizer import TextVectorizer
+
+# Cantidad de reclamos similares que se devuelven por defecto
+CANTIDAD_SIMILARES = 5
+# Columnas de los reclamos modificados por otros procesos que se leen para sincronizar los índices
+COLUMNAS_SINCRONIZACION = ("id_reclamo", "departamento", "estado", "contenido")
+
+
+class IndiceInvertido:
+    """
+    Índice invertido de reclamos ponderado con BM25 (una variante de TF-IDF que normaliza
+    por la longitud de cada reclamo).
+    Guarda, para cada token, los reclamos que lo contienen y cuántas veces aparece en cada uno,
+    por lo que una búsqueda solo recorre los reclamos que comparten algún token con la consulta.
+    Admite altas y bajas individuales sin reconstruir el índice.
+    """
+    def __init__(self, k1=1.2, b=0.75):
+        '''Inicializa un índice vacío con los parámetros de BM25 dados.'''
+        self.__k1 = k1
+        self.__b = b
+        self.__postings = {}        # token -> {id_reclamo: frecuencia}
+        self.__documentos = {}      # id_reclamo -> (longitud, tokens distintos)
+        self.__longitud_total = 0
+
+    def __len__(self):
+        return len(self.__documentos)
+
+    def __contains__(self, id_reclamo):
+        return id_reclamo in self.__documentos
+
+    def agregar(self, id_reclamo, tokens):
+        """Agrega (o reemplaza) un reclamo en el índice a partir de su lista de tokens."""
+        if id_reclamo in self.__documentos:
+            self.eliminar(id_reclamo)
+        frecuencias = Counter(tokens)
+        for token, frecuencia in frecuencias.items():
+            self.__postings.setdefault(token, {})[id_reclamo] = frecuencia
+        self.__documentos[id_reclamo] = (len(tokens), tuple(frecuencias))
+        self.__longitud_total += len(tokens)
+
+    def eliminar(self, id_reclamo):
+        """Quita un reclamo del índice. Si no estaba indexado no hace nada."""
+        documento = self.__documentos.pop(id_reclamo, None)
+        if documento is None:
+            return
+        longitud, tokens = documento
+        for token in tokens:
+            posting = self.__postings[token]
+            del posting[id_reclamo]
+            if not posting:
+                del self.__postings[token]
+        self.__longitud_total -= longitud
+
+    def buscar(self, tokens, k):
+        """
+        Devuelve los k reclamos con mayor puntaje BM25 para la consulta.
+        :param tokens: Lista de tokens de la consulta.
+        :param k: Cantidad máxima de resultados.
+        :return: Lista de tuplas (id_reclamo, puntaje) ordenada de mayor a menor puntaje.
+        """
+        n = len(self.__documentos)
+        if n == 0 or not tokens:
+            return []
+        longitud_promedio = self.__longitud_total / n or 1
+        puntajes = {}
+        for token, frecuencia_consulta in Counter(tokens).items():
+            posting = self.__postings.get(token)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for id_reclamo, frecuencia in posting.items():
+                longitud = self.__documentos[id_reclamo][0]
+                peso = frecuencia * (self.__k1 + 1) / (
+                    frecuencia + self.__k1 * (1 - self.__b + self.__b * longitud / longitud_promedio))
+                puntajes[id_reclamo] = puntajes.get(id_reclamo, 0) + frecuencia_consulta * idf * peso
+        return heapq.nlargest(k, puntajes.items(), key=lambda item: item[1])
+
+
+class BuscadorReclamosSimilares(ObservadorReclamos):
+    """
+    Busca, dentro de un departamento, los reclamos no resueltos (ESTADOS_ACTIVOS) más parecidos a un texto nuevo,
+    ya que solo tiene sentido adherirse a reclamos que todavía no fueron cerrados.
+    Mantiene un IndiceInvertido por departamento que se construye la primera vez que se consulta
+    y luego se actualiza de forma incremental, ya que el buscador se registra como observador
+    de GestorDeReclamos. Así el costo de cada búsqueda no depende del tamaño de la tabla.
+    Si un reclamo guardado justo antes de construir el índice se notifica después, IndiceInvertido.agregar
+    lo reemplaza en lugar de indexarlo dos veces.
+    Los cambios que no pasan por GestorDeReclamos (otros procesos del servidor, scripts) se incorporan con
+    sincronizar, que se llama sola cada vigencia segundos al buscar (ver MarcaDeAgua).
+    """
+    def __init__(self, repo: RepositorioAbstracto, tokenizador=None, cantidad=CANTIDAD_SIMILARES,
+                 vigencia=VIGENCIA_MARCA):
+        """
+        Inicializa el buscador.
+        Args:
+            repo (RepositorioAbstracto): Repositorio de reclamos.
+            tokenizador (callable): Función que recibe un texto y devuelve su lista de tokens.
+                Por defecto se usa el mismo preprocesamiento que el clasificador (TextVectorizer).
+            cantidad (int): Cantidad de reclamos similares a devolver por defecto.
+            vigencia (float): Segundos entre consultas a la base para incorporar los cambios de otros procesos.
+        """
+        self.__repo = repo
+        self.__tokenizador = tokenizador
+        self.__cantidad = cantidad
+        self.__indices = {}
+        self.__marca = MarcaDeAgua(repo, COLUMNAS_SINCRONIZACION, vigencia)
+        self.__lock = threading.RLock()
+
+    def __tokenizar(self, texto):
+        '''Tokeniza un texto. El TextVectorizer se crea recién cuando hace falta porque necesita los recursos de NLTK.'''
+        if self.__tokenizador is None:
+            self.__tokenizador = TextVectorizer().obtener_tokens
+        return self.__tokenizador(texto)
+
+    def __tokenizar_reclamo(self, id_reclamo, contenido):
+        '''Tokeniza un reclamo existente pasando por la caché de tokens por reclamo.'''
+        return cache_tokens_reclamos.obtener(id_reclamo, contenido, self.__tokenizar, "raices")
+
+    def __obtener_indice(self, departamento):
+        '''Devuelve el índice del departamento, construyéndolo desde el repositorio si todavía no existe.'''
+        self.sincronizar(forzar=False)
+        indice = self.__indices.get(departamento)
+        if indice is None:
+            indice = IndiceInvertido()
+            for id_reclamo, contenido in self.__repo.obtener_contenidos_activos(departamento, ESTADOS_ACTIVOS):
+                indice.agregar(id_reclamo, self.__tokenizar_reclamo(id_reclamo, contenido))
+            self.__indices[departamento] = indice
+        return indice
+
+    def sincronizar(self, forzar=True):
+        """
+        Incorpora a los índices ya construidos los reclamos agregados o modificados en la base sin pasar por
+        GestorDeReclamos, y descarta los índices cuya cantidad de reclamos no coincide con la de reclamos
+        activos del departamento en la base; se vuelven a construir en la próxima búsqueda.
+        Args:
+            forzar (bool): Si es False solo consulta la base si pasó la vigencia desde la última vez.
+        """
+        with self.__lock:
+            cambios = self.__marca.cambios(forzar)
+            if cambios is None or not self.__indices:
+                return
+            for id_reclamo, departamento, estado, contenido in cambios:
+                activo = estado in ESTADOS_ACTIVOS
+                for nombre, indice in self.__indices.items():
+                    if nombre == departamento and activo:
+                        indice.agregar(id_reclamo, self.__tokenizar_reclamo(id_reclamo, contenido))
+                    else:
+                        indice.eliminar(id_reclamo)
+            totales = self.__repo.contar_por_departamento(ESTADOS_ACTIVOS)
+            for nombre in [nombre for nombre, indice in self.__indices.items() if len(indice) != totales.get(nombre, 0)]:
+                del self.__indices[nombre]
+
+    def buscar(self, contenido, departamento, k=None):
+        """
+        Busca los reclamos activos del departamento más similares al contenido dado.
+        Args:
+            contenido (str): Texto del reclamo nuevo.
+            departamento (str): Departamento en el que buscar.
+            k (int): Cantidad máxima de resultados (por defecto la indicada al crear el buscador).
+        Returns:
+            list: Tuplas (id_reclamo, puntaje) ordenadas de mayor a menor similitud.
+        """
+        tokens = self.__tokenizar(contenido)
+        with self.__lock:
+            return self.__obtener_indice(departamento).buscar(tokens, k or self.__cantidad)
+
+    def buscar_reclamos(self, contenido, departamento, k=None):
+        """
+        Igual que buscar, pero devuelve los reclamos completos.
+        Solo se consultan en la base de datos los k reclamos encontrados.
+        Returns:
+            list: Tuplas (VistaReclamo, puntaje) ordenadas de mayor a menor similitud.
+        """
+        resultados = self.buscar(contenido, departamento, k)
+        if not resultados:
+            return []
+        reclamos = {r.id_reclamo: r for r in self.__repo.obtener_registros_por_ids([id_reclamo for id_reclamo, _ in resultados])}
+        return [(reclamos[id_reclamo], puntaje) for id_reclamo, puntaje in resultados if id_reclamo in reclamos]
+
+    def reclamo_agregado(self, reclamo):
+        if reclamo.estado not in ESTADOS_ACTIVOS:
+            return
+        with self.__lock:
+            indice = self.__indices.get(reclamo.departamento)
+            if indice is not None:
+                indice.agregar(reclamo.id_reclamo, self.__tokenizar_reclamo(reclamo.id_reclamo, reclamo.contenido))
+
+    def reclamo_modificado(self, anterior, reclamo):
+        with self.__lock:
+            indice_anterior = self.__indices.get(anterior.departamento)
+            if indice_anterior is not None:
+                indice_anterior.eliminar(anterior.id_reclamo)
+        self.reclamo_agregado(reclamo)
+
+    def reclamo_eliminado(self, reclamo):
+        with self.__lock:
+            indice = self.__indices.get(reclamo.departamento)
+            if indice is not None:
+                indice.eliminar(reclamo.id_reclamo)
@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.utils import secure_filename
+from modules.agregados import AgregadosReclamos, calcular_porcentajes
+from modules.graficador import Graficador, guardar_atomico
+from modules.observador_reclamos import ObservadorReclamos
+
+DIRECTORIO_GRAFICOS = 'static/images/graficos'
+# La nube se arma con las 15 palabras más frecuentes, así que solo esas definen la imagen
+PALABRAS_NUBE = 15
+# Segundos que se conserva el archivo de un gráfico después de reemplazarlo: una página que recibió la ruta
+# vieja justo antes del cambio todavía la puede pedir
+GRACIA_ARCHIVOS = 300
+
+
+def _huella(datos):
+    '''Devuelve una huella corta de los datos que definen un gráfico.'''
+    return hashlib.blake2b(repr(datos).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class CacheGraficos(ObservadorReclamos):
+    """
+    Caché de los gráficos de analítica (torta y nube de palabras) de cada departamento.
+    Cada gráfico se identifica por el departamento y una huella de los datos que lo definen
+    (porcentajes por estado para la torta, las palabras más frecuentes para la nube), y solo se vuelve a dibujar
+    cuando esa huella cambia. Las imágenes se guardan en un archivo por departamento y huella dentro de
+    DIRECTORIO_GRAFICOS, de modo que dos departamentos nunca comparten archivo y el navegador no muestra
+    una imagen vieja desde su caché.
+    Con pre_renderizar=True, cada vez que cambian los reclamos de un departamento que ya fue consultado
+    sus gráficos se vuelven a dibujar en un hilo de fondo, fuera del camino del pedido.
+    Los gráficos se dibujan fuera del lock (Graficador no comparte estado entre llamadas) y se escriben con
+    guardar_atomico, así que varios pedidos concurrentes nunca ven un archivo a medio escribir.
+    Además del archivo (que usa la página de analítica) se conserva la imagen en memoria para los reportes.
+    Los archivos reemplazados se borran recién cuando pasan gracia segundos, para no cortar una página
+    que ya tenía la ruta anterior.
+    """
+    def __init__(self, agregados: AgregadosReclamos = None, directorio=DIRECTORIO_GRAFICOS, pre_renderizar=False,
+                 gracia=GRACIA_ARCHIVOS):
+        """
+        Inicializa la caché.
+        Args:
+            agregados (AgregadosReclamos): Agregados de donde se leen los datos al pre-renderizar.
+            directorio (str): Carpeta donde se guardan las imágenes.
+            pre_renderizar (bool): Si es True, los gráficos se actualizan en segundo plano al cambiar los reclamos.
+            gracia (float): Segundos que se conservan los archivos de gráficos reemplazados antes de borrarlos.
+        """
+        if pre_renderizar and agregados is None:
+            raise ValueError("Para pre-renderizar los gráficos hace falta indicar los agregados")
+        self.__agregados = agregados
+        self.__directorio = directorio
+        self.__graficos = {}            # (tipo, departamento) -> (huella, ruta, imagen PNG en bytes)
+        self.__gracia = gracia
+        self.__reemplazados = []        # (momento en que se reemplazó, ruta), del más viejo al más nuevo
+        self.__lock = threading.Lock()
+        self.__pendientes = set()
+        self.__ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficos") if pre_renderizar else None
+
+    def obtener_graficos(self, departamento, resumen):
+        """
+        Devuelve las rutas de los gráficos del departamento, dibujándolos solo si sus datos cambiaron.
+        Args:
+            departamento (str): Nombre del departamento.
+            resumen (dict): Resumen de AgregadosReclamos.obtener_resumen (se usan "conteo" y "palabras").
+        Returns:
+            dict: Diccionario con las claves "ruta_nube" y "ruta_torta" (rutas de los archivos) e "imagen_nube"
+                e "imagen_torta" (PNG en bytes). Todas son None si el departamento no tiene reclamos.
+        """
+        if not resumen["total"]:
+            return {"ruta_nube": None, "ruta_torta": None, "imagen_nube": None, "imagen_torta": None}
+        porcentajes = calcular_porcentajes(resumen["conteo"])
+        palabras = resumen["palabras"]
+        ruta_nube, imagen_nube = self.__obtener("nube", departamento, palabras.most_common(PALABRAS_NUBE),
+                                                lambda: Graficador.generar_nube_frecuencias(palabras))
+        ruta_torta, imagen_torta = self.__obtener("torta", departamento, sorted(porcentajes.items()),
+                                                  lambda: Graficador.generar_torta(porcentajes))
+        return {"ruta_nube": ruta_nube, "ruta_torta": ruta_torta, "imagen_nube": imagen_nube, "imagen_torta": imagen_torta}
+
+    def __obtener(self, tipo, departamento, datos, generar):
+        '''Devuelve (ruta, imagen) del gráfico, dibujándolo si no existe uno con la misma huella.'''
+        huella = _huella(datos)
+        ruta = os.path.join(self.__directorio, f"{tipo}_{secure_filename(departamento)}_{huella}.png")
+        with self.__lock:
+            anterior = self.__graficos.get((tipo, departamento))
+            if anterior is not None and anterior[0] == huella and os.path.exists(ruta):
+                return ruta, anterior[2]
+        if os.path.exists(ruta):
+            # Dibujado por una instancia anterior (por ejemplo, antes de reiniciar el servidor)
+            with open(ruta, "rb") as archivo:
+                imagen = archivo.read()
+        else:
+            imagen = generar()
+            os.makedirs(self.__directorio, exist_ok=True)
+            guardar_atomico(imagen, ruta)
+        with self.__lock:
+            anterior = self.__graficos.get((tipo, departamento))
+            self.__graficos[(tipo, departamento)] = (huella, ruta, imagen)
+            if anterior is not None and anterior[1] != ruta:
+                self.__reemplazados.append((time.monotonic(), anterior[1]))
+            vencidos = self.__sacar_vencidos()
+        for ruta_vieja in vencidos:
+            try:
+                os.remove(ruta_vieja)
+            except FileNotFoundError:
+                pass
+        return ruta, imagen
+
+    def __sacar_vencidos(self):
+        '''Saca de los reemplazados (con el lock tomado) los que cumplieron la gracia y no volvieron a usarse.'''
+        limite = time.monotonic() - self.__gracia
+        vencidos = []
+        while self.__reemplazados and self.__reemplazados[0][0] <= limite:
+            vencidos.append(self.__reemplazados.pop(0)[1])
+        # Si los datos volvieron a un estado anterior, el archivo reemplazado es otra vez el actual
+        actuales = {ruta for _, ruta, _ in self.__graficos.values()}
+        return [ruta for ruta in vencidos if ruta not in actuales]
+
+    def __pre_renderizar(self, departamento):
+        '''Vuelve a dibujar en segundo plano los gráficos de un departamento ya consultado.'''
+        if self.__ejecutor is None or ("torta", departamento) not in self.__graficos:
+            return
+        with self.__lock:
+            if departamento in self.__pendientes:
+                return
+            self.__pendientes.add(departamento)
+        self.__ejecutor.submit(self.__renderizar, departamento)
+
+    def __renderizar(self, departamento):
+        with self.__lock:
+            self.__pendientes.discard(departamento)
+        self.obtener_graficos(departamento, self.__agregados.obtener_resumen(departamento))
+
+    def esperar(self):
+        """Espera a que terminen los gráficos que se están dibujando en segundo plano."""
+        if self.__ejecutor is not None:
+            self.__ejecutor.submit(lambda: None).result()
+
+    def reclamo_agregado(self, reclamo):
+        self.__pre_renderizar(reclamo.departamento)
+
+    def reclamo_modificado(self, anterior, reclamo):
+        self.__pre_renderizar(anterior.departamento)
+        if reclamo.departamento != anterior.departamento:
+            self.__pre_renderizar(reclamo.departamento)
+
+    def reclamo_eliminado(self, reclamo):
+        self.__pre_renderizar(reclamo.departamento)
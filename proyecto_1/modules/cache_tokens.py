@@ -0,0 +1,154 @@
+import hashlib
+import string
+import threading
+from collections import OrderedDict
+
+# Lista local de palabras vacías en español (puedes ampliarla si querés)
+STOPWORDS_ES = set([
+    "de", "la", "que", "el", "en", "y", "a", "los", "del", "se", "las", "por",
+    "un", "para", "con", "no", "una", "su", "al", "lo", "como", "más", "pero",
+    "sus", "le", "ya", "o", "este", "sí", "porque", "esta", "entre", "cuando"
+])
+TABLA_PUNTUACION = str.maketrans('', '', string.punctuation)
+
+
+def tokenizar_nube(texto):
+    """
+    Separa un texto en las palabras que se usan para la nube: pasa a minúsculas,
+    elimina signos de puntuación y descarta las palabras vacías definidas en STOPWORDS_ES.
+    Está aquí y no en Graficador para que los agregados puedan contar palabras sin importar matplotlib.
+
+    :param texto: Texto a procesar.
+    :return: Lista de palabras.
+    """
+    texto_limpio = texto.lower().translate(TABLA_PUNTUACION)
+    return [p for p in texto_limpio.split() if p not in STOPWORDS_ES]
+
+
+class CacheLRU:
+    """
+    Caché acotada que descarta el elemento usado hace más tiempo (LRU) cuando se llena.
+    Lleva la cuenta de aciertos y fallos para poder medir su efectividad.
+    Es segura para usarse desde varios hilos.
+    """
+    def __init__(self, tamano_maximo=10000):
+        '''Inicializa la caché vacía con la capacidad máxima indicada.'''
+        if not isinstance(tamano_maximo, int) or tamano_maximo <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser un entero positivo")
+        self.__tamano_maximo = tamano_maximo
+        self.__datos = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__aciertos = 0
+        self.__fallos = 0
+
+    @property
+    def tamano_maximo(self):
+        return self.__tamano_maximo
+
+    @property
+    def aciertos(self):
+        return self.__aciertos
+
+    @property
+    def fallos(self):
+        return self.__fallos
+
+    def __len__(self):
+        return len(self.__datos)
+
+    def obtener(self, clave, calcular):
+        """
+        Devuelve el valor guardado para la clave. Si no está, lo calcula con calcular(clave),
+        lo guarda y lo devuelve.
+        :param clave: Clave a buscar (debe ser hasheable).
+        :param calcular: Función que recibe la clave y devuelve el valor a guardar.
+        """
+        with self.__lock:
+            if clave in self.__datos:
+                self.__datos.move_to_end(clave)
+                self.__aciertos += 1
+                return self.__datos[clave]
+            self.__fallos += 1
+        # Se calcula fuera del lock para no bloquear a otros hilos durante el cálculo
+        valor = calcular(clave)
+        self.guardar(clave, valor)
+        return valor
+
+    def buscar(self, clave):
+        """
+        Devuelve el valor guardado para la clave, o None si no está (cuenta como acierto o fallo).
+        Sirve cuando el valor no se puede calcular con una función, por ejemplo porque se arma de a partes.
+        """
+        with self.__lock:
+            if clave in self.__datos:
+                self.__datos.move_to_end(clave)
+                self.__aciertos += 1
+                return self.__datos[clave]
+            self.__fallos += 1
+            return None
+
+    def guardar(self, clave, valor):
+        """Guarda el valor para la clave, descartando el menos usado si la caché se llena."""
+        with self.__lock:
+            self.__datos[clave] = valor
+            self.__datos.move_to_end(clave)
+            if len(self.__datos) > self.__tamano_maximo:
+                self.__datos.popitem(last=False)
+
+    def limpiar(self):
+        """Vacía la caché y reinicia los contadores."""
+        with self.__lock:
+            self.__datos.clear()
+            self.__aciertos = 0
+            self.__fallos = 0
+
+    def estadisticas(self):
+        """Devuelve un diccionario con el tamaño actual, el máximo, los aciertos, los fallos y la tasa de aciertos."""
+        consultas = self.__aciertos + self.__fallos
+        return {
+            "tamano": len(self.__datos),
+            "tamano_maximo": self.__tamano_maximo,
+            "aciertos": self.__aciertos,
+            "fallos": self.__fallos,
+            "tasa_aciertos": self.__aciertos / consultas if consultas else 0.0
+        }
+
+
+class CacheTokensReclamos:
+    """
+    Caché de los tokens de cada reclamo, indexada por id del reclamo y una huella de su contenido.
+    Si el contenido de un reclamo cambia, la huella cambia y los tokens se vuelven a calcular.
+    Como distintos componentes tokenizan de forma distinta (raíces para el clasificador y el buscador,
+    palabras para la nube), cada entrada guarda además el tipo de tokenización.
+    """
+    def __init__(self, tamano_maximo=20000):
+        '''Inicializa la caché con la capacidad máxima indicada (en cantidad de reclamos).'''
+        self.__cache = CacheLRU(tamano_maximo)
+
+    @staticmethod
+    def huella(contenido):
+        """Devuelve una huella corta y estable del contenido de un reclamo."""
+        return hashlib.blake2b(contenido.encode("utf-8"), digest_size=8).hexdigest()
+
+    def obtener(self, id_reclamo, contenido, tokenizador, tipo):
+        """
+        Devuelve los tokens del reclamo, calculándolos con el tokenizador solo si no estaban en caché.
+        :param id_reclamo: Id del reclamo.
+        :param contenido: Texto del reclamo.
+        :param tokenizador: Función que recibe un texto y devuelve una lista de tokens.
+        :param tipo: Nombre del tipo de tokenización (por ejemplo "raices" o "nube").
+        :return: Tupla de tokens.
+        """
+        clave = (tipo, id_reclamo, self.huella(contenido))
+        return self.__cache.obtener(clave, lambda _: tuple(tokenizador(contenido)))
+
+    def limpiar(self):
+        self.__cache.limpiar()
+
+    def estadisticas(self):
+        return self.__cache.estadisticas()
+
+
+# Instancias compartidas por el vectorizador, el buscador de similares y la nube de palabras
+cache_raices = CacheLRU(tamano_maximo=50000)
+cache_tokens_reclamos = CacheTokensReclamos(tamano_maximo=20000)
@@ -1,12 +1,16 @@
 import pickle
 
+RUTA_MODELO = './data/claims_clf.pkl'
+
 class Clasificador:
 
-    def __init__(self):
+    def __init__(self, ruta_modelo=RUTA_MODELO):
         """
         Inicializa la clase cargando un modelo de clasificación previamente entrenado.
+        Args:
+            ruta_modelo (str): Ruta al archivo pickle del modelo (por defecto ./data/claims_clf.pkl).
         """
-        with open('./data/claims_clf.pkl', 'rb') as archivo:
+        with open(ruta_modelo, 'rb') as archivo:
             self.clf = pickle.load(archivo)
 
     def clasificar(self, reclamos: list):
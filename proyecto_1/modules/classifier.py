@@ -9,16 +9,21 @@ from sklearn.utils.validation import check_X_y, check_array, check_is_fitted
 
 class ClaimsClassifier(BaseEstimator, ClassifierMixin):
     
-    def __init__(self):
-        pass
+    def __init__(self, sparse=False):
+        """
+        Args:
+            sparse (bool): Si es True el vectorizador produce matrices dispersas (CSR) y el escalado
+                se hace sin centrar (with_mean=False), que es lo que admite StandardScaler para ese formato.
+        """
+        self.sparse = sparse
 
     def fit(self, X, y):
         # X, y = check_X_y(X, y, accept_sparse=True) #No lo puedo usar con strings
         self.encoder_ = LabelEncoder()
         y = self.encoder_.fit_transform(y)
         pipe = Pipeline([
-            ('vectorizer', TextVectorizer()),
-            ('scaler', StandardScaler()),
+            ('vectorizer', TextVectorizer(sparse=self.sparse)),
+            ('scaler', StandardScaler(with_mean=not self.sparse)),
             ('classifier', RandomForestClassifier(max_depth=20, max_features='log2', n_estimators=10))
         ])
         self.clf_ = pipe.fit(X, y)
@@ -0,0 +1,210 @@
+import threading
+from datetime import datetime
+from modules.dominio import ESTADOS_ACTIVOS
+from modules.marca_agua import VIGENCIA_MARCA, MarcaDeAgua
+from modules.monticulos import MonticuloIndexado
+from modules.observador_reclamos import ObservadorReclamos
+from modules.repositorio_abstracto import RepositorioAbstracto
+
+# Pesos de la urgencia, expresada en "días de antigüedad equivalentes"
+PESO_ANTIGUEDAD = 1.0                                   # por cada día desde fecha_y_hora
+PESO_ADHERENTE = 2.0                                    # cada adherente equivale a dos días de antigüedad
+PESO_ESTADO = {"Pendiente": 5.0, "En proceso": 0.0}     # un reclamo que nadie tomó todavía es más urgente
+SEGUNDOS_POR_DIA = 86400
+# Columnas de los reclamos modificados por otros procesos que se leen para sincronizar la cola
+COLUMNAS_SINCRONIZACION = ("id_reclamo", "departamento", "estado", "fecha_y_hora")
+# Cantidad de reclamos por consulta al recontar adherentes al sincronizar
+TAMANO_LOTE_ADHERENTES = 500
+
+
+def calcular_urgencia(estado, fecha_y_hora, n_adherentes, ahora=None):
+    """
+    Calcula la urgencia de un reclamo activo:
+        PESO_ESTADO[estado] + PESO_ADHERENTE * n_adherentes + PESO_ANTIGUEDAD * días desde fecha_y_hora
+    Args:
+        estado (str): Estado del reclamo (uno de ESTADOS_ACTIVOS).
+        fecha_y_hora (datetime): Fecha de creación del reclamo.
+        n_adherentes (int): Cantidad de adherentes.
+        ahora (datetime): Momento en el que se evalúa (por defecto, ahora).
+    Returns:
+        float: Urgencia del reclamo.
+    """
+    ahora = ahora if ahora is not None else datetime.now()
+    return _prioridad(estado, fecha_y_hora, n_adherentes) + PESO_ANTIGUEDAD * ahora.timestamp() / SEGUNDOS_POR_DIA
+
+
+def _prioridad(estado, fecha_y_hora, n_adherentes):
+    '''
+    Parte de la urgencia que no depende del momento en que se evalúa.
+    Como la antigüedad crece igual para todos los reclamos, ordenar por esta prioridad es lo mismo que ordenar
+    por la urgencia en cualquier instante, y así las prioridades del montículo nunca quedan viejas.
+    '''
+    return (PESO_ESTADO.get(estado, 0.0) + PESO_ADHERENTE * n_adherentes
+            - PESO_ANTIGUEDAD * fecha_y_hora.timestamp() / SEGUNDOS_POR_DIA)
+
+
+class _ColaDepartamento:
+    '''Montículo de prioridades de un departamento junto con los datos de los que sale cada prioridad.'''
+    def __init__(self):
+        self.monticulo = MonticuloIndexado()
+        self.datos = {}     # id_reclamo -> [estado, fecha_y_hora, n_adherentes]
+
+    def poner(self, id_reclamo, estado, fecha_y_hora, n_adherentes):
+        self.datos[id_reclamo] = [estado, fecha_y_hora, n_adherentes]
+        self.monticulo.insertar(id_reclamo, _prioridad(estado, fecha_y_hora, n_adherentes))
+
+    def sacar(self, id_reclamo):
+        '''Quita el reclamo y devuelve su cantidad de adherentes, o None si no estaba.'''
+        datos = self.datos.pop(id_reclamo, None)
+        if datos is None:
+            return None
+        self.monticulo.quitar(id_reclamo)
+        return datos[2]
+
+
+class ColaUrgenciaReclamos(ObservadorReclamos):
+    """
+    Cola de prioridad por departamento con los reclamos activos (ESTADOS_ACTIVOS) ordenados por urgencia
+    (ver calcular_urgencia). Permite que los jefes de departamento atiendan primero los reclamos más urgentes
+    sin ordenar todos los reclamos en cada pedido: obtener los k más urgentes cuesta O(k log k).
+    La cola de un departamento se arma desde el repositorio la primera vez que se pide y luego se mantiene
+    con las notificaciones de GestorDeReclamos (altas, cambios de estado, derivaciones) y de GestorDeUsuarios
+    (cada nueva adhesión sube la prioridad del reclamo en O(log n)). Las notificaciones de un reclamo que ya
+    estaba en la consulta con la que se armó la cola (guardado justo antes) no lo agregan dos veces.
+    Los cambios que no pasan por los gestores (otros procesos del servidor, scripts) se incorporan con
+    sincronizar, que se llama sola cada vigencia segundos al consultar la cola (ver MarcaDeAgua); las
+    adhesiones se ven porque asociar_registro actualiza la columna actualizado del reclamo.
+    """
+    def __init__(self, repo: RepositorioAbstracto, vigencia=VIGENCIA_MARCA):
+        """
+        Inicializa la cola.
+        Args:
+            repo (RepositorioAbstracto): Repositorio de reclamos.
+            vigencia (float): Segundos entre consultas a la base para incorporar los cambios de otros procesos.
+        """
+        self.__repo = repo
+        self.__departamentos = {}
+        self.__marca = MarcaDeAgua(repo, COLUMNAS_SINCRONIZACION, vigencia)
+        self.__lock = threading.RLock()
+
+    def __obtener_departamento(self, departamento):
+        '''Devuelve la cola del departamento, armándola desde el repositorio si es la primera vez.'''
+        self.sincronizar(forzar=False)
+        cola = self.__departamentos.get(departamento)
+        if cola is None:
+            cola = _ColaDepartamento()
+            for id_reclamo, estado, fecha_y_hora, n_adherentes in self.__repo.obtener_datos_urgencia(departamento, ESTADOS_ACTIVOS):
+                cola.poner(id_reclamo, estado, fecha_y_hora, n_adherentes)
+            self.__departamentos[departamento] = cola
+        return cola
+
+    def __contar_adherentes(self, ids_reclamos):
+        '''Cuenta los adherentes de varios reclamos, de a TAMANO_LOTE_ADHERENTES por consulta.'''
+        adherentes = {}
+        for inicio in range(0, len(ids_reclamos), TAMANO_LOTE_ADHERENTES):
+            adherentes.update(self.__repo.contar_adherentes_por_varios_reclamos(
+                ids_reclamos[inicio:inicio + TAMANO_LOTE_ADHERENTES]))
+        return adherentes
+
+    def sincronizar(self, forzar=True):
+        """
+        Incorpora a las colas ya armadas los reclamos agregados o modificados en la base sin pasar por los
+        gestores (estado, departamento y adherentes), y descarta las colas cuya cantidad de reclamos activos
+        no coincide con la de la base; se vuelven a armar la próxima vez que se consultan.
+        Args:
+            forzar (bool): Si es False solo consulta la base si pasó la vigencia desde la última vez.
+        """
+        with self.__lock:
+            cambios = self.__marca.cambios(forzar)
+            if cambios is None or not self.__departamentos:
+                return
+            adherentes = self.__contar_adherentes([id_reclamo for id_reclamo, departamento, estado, _ in cambios
+                                                   if estado in ESTADOS_ACTIVOS and departamento in self.__departamentos])
+            for id_reclamo, departamento, estado, fecha_y_hora in cambios:
+                activo = estado in ESTADOS_ACTIVOS
+                for nombre, cola in self.__departamentos.items():
+                    if nombre != departamento or not activo:
+                        cola.sacar(id_reclamo)
+                    elif cola.datos.get(id_reclamo) != [estado, fecha_y_hora, adherentes.get(id_reclamo, 0)]:
+                        cola.sacar(id_reclamo)
+                        cola.poner(id_reclamo, estado, fecha_y_hora, adherentes.get(id_reclamo, 0))
+            totales = self.__repo.contar_por_departamento(ESTADOS_ACTIVOS)
+            for nombre in [nombre for nombre, cola in self.__departamentos.items()
+                           if len(cola.datos) != totales.get(nombre, 0)]:
+                del self.__departamentos[nombre]
+
+    def cantidad(self, departamento):
+        """Devuelve la cantidad de reclamos activos del departamento."""
+        with self.__lock:
+            return len(self.__obtener_departamento(departamento).monticulo)
+
+    def obtener_mas_urgentes(self, departamento, cantidad, desde=0, ahora=None):
+        """
+        Devuelve los reclamos más urgentes del departamento, de mayor a menor urgencia.
+        Args:
+            departamento (str): Nombre del departamento.
+            cantidad (int): Cantidad de reclamos a devolver.
+            desde (int): Cantidad de reclamos a saltear (para paginar).
+            ahora (datetime): Momento en el que se evalúa la urgencia (por defecto, ahora).
+        Returns:
+            list: Lista de tuplas (id_reclamo, urgencia).
+        """
+        ahora = ahora if ahora is not None else datetime.now()
+        antiguedad = PESO_ANTIGUEDAD * ahora.timestamp() / SEGUNDOS_POR_DIA
+        with self.__lock:
+            primeros = self.__obtener_departamento(departamento).monticulo.primeros(desde + cantidad)
+        return [(id_reclamo, prioridad + antiguedad) for prioridad, id_reclamo in primeros[desde:]]
+
+    def listar_reclamos_urgentes(self, departamento, cantidad, desde=0):
+        """
+        Igual que obtener_mas_urgentes pero devuelve los reclamos como diccionarios (to_dict), en el mismo formato
+        que GestorDeReclamos.listar_reclamos_paginados, con las claves extra "n_adherentes" y "urgencia".
+        """
+        urgentes = self.obtener_mas_urgentes(departamento, cantidad, desde)
+        with self.__lock:
+            cola = self.__obtener_departamento(departamento)
+            adherentes = {id_reclamo: cola.datos[id_reclamo][2] for id_reclamo, _ in urgentes if id_reclamo in cola.datos}
+        reclamos = {r.id_reclamo: r for r in self.__repo.obtener_registros_por_ids([id_reclamo for id_reclamo, _ in urgentes])}
+        resultado = []
+        for id_reclamo, urgencia in urgentes:
+            if id_reclamo not in reclamos:
+                continue
+            reclamo = reclamos[id_reclamo].to_dict()
+            reclamo["n_adherentes"] = adherentes.get(id_reclamo, 0)
+            reclamo["urgencia"] = urgencia
+            resultado.append(reclamo)
+        return resultado
+
+    def reclamo_agregado(self, reclamo):
+        with self.__lock:
+            cola = self.__departamentos.get(reclamo.departamento)
+            # Si la cola se armó después de guardarse el reclamo ya lo tiene, con sus adherentes
+            if cola is not None and reclamo.estado in ESTADOS_ACTIVOS and reclamo.id_reclamo not in cola.datos:
+                cola.poner(reclamo.id_reclamo, reclamo.estado, reclamo.fecha_y_hora, 0)
+
+    def reclamo_modificado(self, anterior, reclamo):
+        with self.__lock:
+            n_adherentes = None
+            cola_anterior = self.__departamentos.get(anterior.departamento)
+            if cola_anterior is not None:
+                n_adherentes = cola_anterior.sacar(anterior.id_reclamo)
+            cola = self.__departamentos.get(reclamo.departamento)
+            if cola is not None and reclamo.estado in ESTADOS_ACTIVOS:
+                if n_adherentes is None:
+                    n_adherentes = self.__repo.contar_adherentes_por_varios_reclamos([reclamo.id_reclamo]).get(reclamo.id_reclamo, 0)
+                cola.poner(reclamo.id_reclamo, reclamo.estado, reclamo.fecha_y_hora, n_adherentes)
+
+    def reclamo_eliminado(self, reclamo):
+        with self.__lock:
+            cola = self.__departamentos.get(reclamo.departamento)
+            if cola is not None:
+                cola.sacar(reclamo.id_reclamo)
+
+    def adherente_agregado(self, id_usuario, id_reclamo):
+        with self.__lock:
+            for cola in self.__departamentos.values():
+                datos = cola.datos.get(id_reclamo)
+                if datos is not None:
+                    datos[2] += 1
+                    cola.monticulo.cambiar_prioridad(id_reclamo, _prioridad(*datos))
+                    return
@@ -1,7 +1,6 @@
 from flask import Flask
 from flask_session import Session
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from modules.base_datos import URL_BD, crear_engine
 #from flask_login import LoginManager
 from flask_bootstrap import Bootstrap
 import datetime
@@ -9,14 +8,6 @@ import datetime
 app = Flask("server")
 app.config['SECRET_KEY'] = '8BYkEfBA6O6donzWlSihBXox7C0sKR6b'
 
-URL_BD = 'sqlite:///data/base_datos.db'
-
-def crear_engine():
-    '''Crea un engine de SQLAlchemy para conectarse a la base de datos.'''
-    engine = create_engine(URL_BD)
-    Session = sessionmaker(bind=engine)
-    return Session
-
 app.config.from_object(__name__)
 app.config["SESSION_TYPE"] = "filesystem"
 app.config["SESSION_FILE_DIR"] = "./flask_session_cache"
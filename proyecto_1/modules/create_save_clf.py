@@ -6,7 +6,7 @@ datos = crear_csv("./data/frases.json")
 X = datos['reclamo']
 y = datos['etiqueta']
 
-clf = ClaimsClassifier()
+clf = ClaimsClassifier(sparse=True)
 clf.fit(X, y)
 
 with open('./data/claims_clf.pkl', 'wb') as archivo:
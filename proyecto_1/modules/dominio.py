@@ -1,11 +1,14 @@
+import sys
 from datetime import datetime
 from enum import Enum as enum
+from typing import NamedTuple
 
 
-class Estado(enum):
+class Estado(str, enum):
     """
     Clase Estado
-    Representa los posibles estados de un reclamo.
+    Representa los posibles estados de un reclamo. Cada estado es igual a su valor de texto
+    (Estado.PENDIENTE == "Pendiente"), así que se puede usar donde se espera el texto.
     Atributos:
         PENDIENTE (str): Estado inicial del reclamo.
         EN_PROCESO (str): Estado cuando el reclamo está siendo atendido.
@@ -17,6 +20,11 @@ class Estado(enum):
     RESUELTO = "Resuelto"
     INVALIDO = "Invalido"
 
+# Valores de texto de los estados, en el orden de Estado
+VALORES_ESTADO = tuple(estado.value for estado in Estado)
+# Estados de los reclamos que todavía no se cerraron (a los que se puede adherir y que hay que atender)
+ESTADOS_ACTIVOS = (Estado.PENDIENTE.value, Estado.EN_PROCESO.value)
+
 class Reclamo:
     """
     Clase Reclamo
@@ -43,7 +51,12 @@ class Reclamo:
         r_imagen: Getter y setter para la ruta de la imagen.
     Excepciones:
         ValueError: Si alguno de los valores asignados a los atributos no cumple con las validaciones correspondientes.
+    Los atributos se guardan en __slots__ (sin __dict__ por instancia) y el estado y el departamento se guardan
+    como textos compartidos entre todos los reclamos, para que mantener muchos reclamos en memoria cueste poco.
     """
+    __slots__ = ("__id_reclamo", "__id_creador", "__estado", "__fecha_y_hora", "__contenido", "__departamento",
+                 "__tiempo_en_proceso", "__r_imagen")
+
     def __init__(self,id_reclamo,id_creador,estado,contenido,departamento,r_imagen=None,fecha_y_hora=None, tiempo_en_proceso=None):
         '''Inicializa un nuevo reclamo con los parámetros proporcionados.'''
         self.id_reclamo = id_reclamo
@@ -108,10 +121,9 @@ class Reclamo:
 
     @estado.setter
     def estado(self, estado):
-        estados_validos = ["Pendiente", "En proceso", "Resuelto", "Invalido"]
-        if estado not in estados_validos:
-            raise ValueError(f"Estado inválido. Debe ser uno de: {', '.join(estados_validos)}.")
-        self.__estado = estado
+        if estado not in VALORES_ESTADO:
+            raise ValueError(f"Estado inválido. Debe ser uno de: {', '.join(VALORES_ESTADO)}.")
+        self.__estado = Estado(estado).value
 
     @fecha_y_hora.setter
     def fecha_y_hora(self, fecha_y_hora):
@@ -129,7 +141,7 @@ class Reclamo:
     def departamento(self, departamento):
         if not isinstance(departamento, str) or not departamento.strip():
             raise ValueError("El departamento no puede estar vacío.")
-        self.__departamento = departamento.strip().title()
+        self.__departamento = sys.intern(departamento.strip().title())
 
     @tiempo_en_proceso.setter
     def tiempo_en_proceso(self, tiempo_en_proceso):
@@ -163,7 +175,39 @@ class Reclamo:
             "r_imagen":self.r_imagen
             
         }
-    
+
+
+class VistaReclamo(NamedTuple):
+    """
+    Clase VistaReclamo
+    Vista de solo lectura de un reclamo, armada directamente con las columnas leídas de la base.
+    No pasa por las validaciones de Reclamo (los datos guardados ya las cumplieron al escribirse), así que
+    leer un reclamo cuesta solo armar una tupla. Tiene los mismos atributos y el mismo to_dict que Reclamo;
+    para modificar un reclamo se usa Reclamo, que vuelve a validar los datos.
+    """
+    id_reclamo: int
+    id_creador: int
+    estado: str
+    fecha_y_hora: datetime
+    departamento: str
+    contenido: str
+    tiempo_en_proceso: int
+    r_imagen: str
+
+    def to_dict(self):
+        '''Devuelve un diccionario igual al de Reclamo.to_dict.'''
+        return {
+            "id_reclamo": self.id_reclamo,
+            "id_creador": self.id_creador,
+            "estado": self.estado,
+            "fecha_y_hora": self.fecha_y_hora.strftime("%d-%m-%Y %H:%M:%S"),
+            "departamento": self.departamento,
+            "contenido": self.contenido,
+            "tiempo_en_proceso": self.tiempo_en_proceso,
+            "r_imagen": self.r_imagen
+        }
+
+
 class Usuario:
     """
     Clase Usuario
@@ -184,8 +228,10 @@ class Usuario:
             Devuelve un diccionario con los atributos del usuario.
     Excepciones:
         ValueError: Si alguno de los valores asignados no cumple con las validaciones correspondientes.
+    Los atributos se guardan en __slots__ (sin __dict__ por instancia).
     """
-    
+    __slots__ = ("__id", "__nombre", "__email", "__password", "__apellido", "__nombre_usuario", "__claustro", "__rol")
+
     def __init__(self,id,nombre,email,password,apellido,nombre_usuario,claustro, rol):
         '''Inicializa un nuevo usuario con los parámetros proporcionados.'''
         self.id = id
@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class EscritorAgrupado:
+    """
+    Agrupa en una sola transacción las escrituras que llegan a la vez desde distintos pedidos (group commit).
+    En SQLite cada commit toma el lock de escritura y sincroniza al disco; con muchos pedidos concurrentes
+    conviene que un único hilo escritor confirme varias escrituras juntas en lugar de una por una.
+
+    Cada escritura es una función que recibe la sesión del escritor y devuelve un resultado. Quien la envía
+    queda esperando hasta que la transacción del lote confirma. Si una escritura de un lote falla, el error le
+    llega a quien la envió y el lote se deshace; las demás escrituras del lote se vuelven a ejecutar, cada una en
+    su propia transacción (si falla el commit, todas). Por eso una escritura puede ejecutarse más de una vez:
+    solo debe trabajar sobre la sesión que recibe, sin efectos fuera de la transacción (archivos, avisos, etc.).
+    """
+    def __init__(self, fabrica_sesiones, max_lote=64, espera=0.002, tiempo_maximo=60.0):
+        """
+        Inicializa el escritor y arranca su hilo.
+        Args:
+            fabrica_sesiones (sessionmaker): Crea las sesiones del hilo escritor.
+            max_lote (int): Cantidad máxima de escrituras por transacción.
+            espera (float): Segundos que se espera a que lleguen más escrituras antes de confirmar un lote.
+            tiempo_maximo (float): Segundos que ejecutar espera una escritura antes de lanzar TimeoutError
+                (None para esperar sin límite).
+        """
+        if not isinstance(max_lote, int) or max_lote <= 0:
+            raise ValueError("El tamaño máximo del lote debe ser un entero positivo")
+        self.__fabrica_sesiones = fabrica_sesiones
+        self.__max_lote = max_lote
+        self.__espera = espera
+        self.__tiempo_maximo = tiempo_maximo
+        self.__cola = queue.Queue()
+        self.__lock = threading.Lock()
+        self.__cerrado = False
+        self.__lotes = 0
+        self.__escrituras = 0
+        self.__hilo = threading.Thread(target=self.__procesar, name="escritor_agrupado", daemon=True)
+        self.__hilo.start()
+
+    def ejecutar(self, escritura):
+        """
+        Ejecuta escritura(sesion) en el hilo escritor y devuelve su resultado una vez confirmada la transacción.
+        Raises:
+            La excepción de la escritura o del commit, RuntimeError si el escritor está cerrado y TimeoutError
+            si la escritura no terminó en tiempo_maximo segundos. Si al vencer el tiempo la escritura todavía
+            estaba en la cola se cancela y no se ejecuta; si ya había empezado (su lote se está escribiendo)
+            no se puede cancelar y todavía puede confirmarse, lo que se indica en el mensaje del TimeoutError.
+        """
+        futuro = Future()
+        # Con el lock, ninguna escritura puede quedar en la cola detrás del aviso de cierre
+        with self.__lock:
+            if self.__cerrado:
+                raise RuntimeError("El escritor agrupado está cerrado")
+            self.__cola.put((escritura, futuro))
+        try:
+            return futuro.result(self.__tiempo_maximo)
+        except TimeoutError:
+            if futuro.cancel():
+                raise TimeoutError(f"La escritura no empezó en {self.__tiempo_maximo} segundos y se canceló") from None
+            if futuro.done():
+                # Terminó justo al vencer el tiempo
+                return futuro.result()
+            raise TimeoutError(f"La escritura no terminó en {self.__tiempo_maximo} segundos; "
+                               "ya había empezado y todavía puede confirmarse") from None
+
+    def __procesar(self):
+        '''Bucle del hilo escritor: junta escrituras en lotes y los confirma.'''
+        while True:
+            pedido = self.__cola.get()
+            if pedido is None:
+                return
+            lote = [pedido]
+            limite = time.monotonic() + self.__espera
+            terminar = False
+            while len(lote) < self.__max_lote:
+                try:
+                    pedido = self.__cola.get(timeout=max(limite - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if pedido is None:
+                    terminar = True
+                    break
+                lote.append(pedido)
+            # Las escrituras que se cancelaron por tiempo mientras esperaban en la cola no se ejecutan
+            lote = [(escritura, futuro) for escritura, futuro in lote if futuro.set_running_or_notify_cancel()]
+            if lote:
+                self.__escribir(lote)
+            if terminar:
+                return
+
+    def __escribir(self, lote):
+        '''
+        Ejecuta el lote en una transacción. Si falla una escritura, el error se le informa a quien la envió y las
+        demás se vuelven a ejecutar cada una en su propia transacción; si falla el commit de un lote de varias,
+        se vuelven a ejecutar todas (con una sola, el error se le informa a quien la envió).
+        '''
+        fallida = None
+        try:
+            with self.__fabrica_sesiones() as sesion:
+                resultados = []
+                for posicion, (escritura, _) in enumerate(lote):
+                    fallida = posicion
+                    resultados.append(escritura(sesion))
+                fallida = None
+                sesion.commit()
+        except Exception as e:
+            if fallida is not None:
+                lote[fallida][1].set_exception(e)
+                resto = lote[:fallida] + lote[fallida + 1:]
+            elif len(lote) == 1:
+                lote[0][1].set_exception(e)
+                resto = []
+            else:
+                resto = lote
+            for pedido in resto:
+                self.__escribir([pedido])
+            return
+        with self.__lock:
+            self.__lotes += 1
+            self.__escrituras += len(lote)
+        for (_, futuro), resultado in zip(lote, resultados):
+            futuro.set_result(resultado)
+
+    def estadisticas(self):
+        """Devuelve la cantidad de transacciones confirmadas, de escrituras y el promedio de escrituras por lote."""
+        with self.__lock:
+            lotes, escrituras = self.__lotes, self.__escrituras
+        return {
+            "lotes": lotes,
+            "escrituras": escrituras,
+            "escrituras_por_lote": escrituras / lotes if lotes else 0.0
+        }
+
+    def cerrar(self):
+        """Confirma las escrituras pendientes y detiene el hilo escritor."""
+        with self.__lock:
+            if self.__cerrado:
+                return
+            self.__cerrado = True
+            self.__cola.put(None)
+        self.__hilo.join()
+        # Si el hilo terminó por un error inesperado pueden quedar escrituras sin ejecutar: se les avisa
+        while True:
+            try:
+                pedido = self.__cola.get_nowait()
+            except queue.Empty:
+                return
+            if pedido is not None and not pedido[1].done():
+                pedido[1].set_exception(RuntimeError("El escritor agrupado se cerró antes de ejecutar la escritura"))
@@ -1,13 +1,54 @@
+import os
 from abc import ABC, abstractmethod
+from io import BytesIO
+
+# Tamaño de cada parte que se envía al cliente al exportar un reporte por partes
+TAMANO_PARTE = 64 * 1024
+
+
+def imagen_de(stats, tipo):
+    """
+    Devuelve la imagen PNG (bytes) de un gráfico de las estadísticas.
+    Usa la imagen en memoria (stats["imagen_<tipo>"]) y, si no está, lee el archivo de stats["ruta_<tipo>"].
+    Parámetros
+    ----------
+    stats : dict
+        Estadísticas generadas por Analitica.
+    tipo : str
+        "torta" o "nube".
+    Returns
+    -------
+    bytes or None
+        La imagen, o None si no hay gráfico.
+    """
+    imagen = stats.get(f"imagen_{tipo}")
+    if imagen:
+        return imagen
+    ruta = stats.get(f"ruta_{tipo}")
+    if ruta and os.path.exists(ruta):
+        with open(ruta, "rb") as archivo:
+            return archivo.read()
+    return None
+
+
 @abstractmethod
 class ExportadorReporte(ABC):
     """
-    Clase base abstracta para exportadores de reportes.   
+    Clase base abstracta para exportadores de reportes.
+    Las subclases definen mime, extension y generar_partes; generar_reporte arma el reporte completo a partir de las partes.
     """
-    def generar_reporte(self, stats, departamento):
+    mime = None
+    extension = None
+
+    def nombre_archivo(self, departamento):
+        """Devuelve el nombre sugerido para el archivo del reporte."""
+        return f"reporte_{departamento}.{self.extension}"
+
+    def generar_partes(self, stats, departamento):
         """
-        Método abstracto que debe ser implementado por las subclases para generar un reporte
-        a partir de las estadísticas proporcionadas y el departamento especificado.
+        Método abstracto que debe ser implementado por las subclases para generar un reporte de a partes
+        (un iterador de bytes), de modo que se pueda enviar al cliente a medida que se genera. Los formatos
+        que no se pueden generar de a partes (PDF) arman el documento en memoria y lo entregan dividido.
         Parámetros
         ----------
         stats : dict
@@ -19,4 +60,80 @@ class ExportadorReporte(ABC):
         NotImplementedError
         Si la subclase no implementa este método.
         """
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def generar_reporte(self, stats, departamento):
+        """
+        Genera el reporte completo a partir de las estadísticas proporcionadas y el departamento especificado.
+        Parámetros
+        ----------
+        stats : dict
+            Diccionario que contiene las estadísticas a incluir en el reporte.
+        departamento : str
+            Nombre del departamento para el cual se genera el reporte.
+        Returns
+        -------
+        tuple
+            (buffer, mime_type, filename) con el reporte en un BytesIO, su tipo MIME y el nombre sugerido.
+        """
+        buffer = BytesIO()
+        for parte in self.generar_partes(stats, departamento):
+            buffer.write(parte)
+        buffer.seek(0)
+        return buffer, self.mime, self.nombre_archivo(departamento)
+
+
+# Cantidad de filas que se piden a la base por vez al exportar los datos crudos
+TAMANO_LOTE_DATOS = 5000
+
+
+class ExportadorDatos(ABC):
+    """
+    Clase base abstracta para exportadores de los datos crudos de los reclamos (una fila por reclamo).
+    Las filas se leen de la base por lotes y se escriben a medida que llegan, así que nunca se tienen
+    todos los reclamos en memoria ni se construyen entidades Reclamo.
+    Las subclases definen mime, extension y generar_partes.
+    """
+    mime = None
+    extension = None
+    # Columnas exportadas, en orden
+    COLUMNAS = ("id_reclamo", "id_creador", "estado", "contenido", "departamento", "tiempo_en_proceso",
+                "fecha_y_hora", "r_imagen")
+
+    def nombre_archivo(self, departamento=None):
+        """Devuelve el nombre sugerido para el archivo con los datos (de un departamento o de todos)."""
+        if departamento is None:
+            return f"reclamos.{self.extension}"
+        return f"reclamos_{departamento}.{self.extension}"
+
+    def generar_partes(self, lotes):
+        """
+        Método abstracto que convierte los lotes de filas en partes del archivo exportado.
+        Parámetros
+        ----------
+        lotes : iterable
+            Listas de tuplas con los valores de COLUMNAS, en ese orden.
+        Yields
+        ------
+        bytes
+            Partes del archivo.
+        """
+        raise NotImplementedError
+
+    def exportar(self, repo, departamento=None, tamano_lote=TAMANO_LOTE_DATOS):
+        """
+        Exporta los reclamos del repositorio de a partes.
+        Parámetros
+        ----------
+        repo : RepositorioReclamosSQLAlchemy
+            Repositorio de reclamos.
+        departamento : str, optional
+            Departamento a exportar; si no se indica, se exportan todos los reclamos.
+        tamano_lote : int
+            Cantidad de filas que se leen de la base por vez.
+        Returns
+        -------
+        iterator
+            Iterador de bytes con el archivo.
+        """
+        return self.generar_partes(repo.iterar_filas(self.COLUMNAS, departamento, tamano_lote))
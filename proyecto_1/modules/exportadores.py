@@ -1,29 +1,35 @@
-from modules.exportador import ExportadorReporte
-import os
-import io
-from io import BytesIO
+from modules.exportador import ExportadorReporte, TAMANO_PARTE, imagen_de
+from modules.series_temporales import COLUMNAS_SERIE, NOMBRES_PERIODOS
 import base64
+import html
+from io import BytesIO
 from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader, simpleSplit
 from reportlab.pdfgen import canvas
 
 class ExportadorPDF(ExportadorReporte):
-    def generar_reporte(self, stats : dict, departamento):
+    mime = 'application/pdf'
+    extension = 'pdf'
+
+    def generar_partes(self, stats : dict, departamento):
         """
         Genera un reporte en formato PDF con estadísticas y gráficos para un departamento específico.
+        Los gráficos se leen de las imágenes en memoria de stats, sin pasar por disco.
+        A diferencia del HTML, el PDF no se genera de a partes: reportlab arma el documento completo en un BytesIO
+        antes de entregar la primera parte, así que el pico de memoria es el PDF entero y las partes solo evitan
+        copiarlo de nuevo al enviarlo.
         Args:
             stats (dict): Diccionario con estadísticas del departamento, incluyendo:
                 - 'total': Total de reclamos.
                 - 'porcentajes': Distribución porcentual por estado.
                 - 'mediana_proceso': Mediana del tiempo de resolución para reclamos en proceso.
                 - 'mediana_resueltos': Mediana del tiempo de resolución para reclamos resueltos.
-                - 'ruta_torta': Ruta al archivo de imagen del gráfico de torta (opcional).
-                - 'ruta_nube': Ruta al archivo de imagen de la nube de palabras (opcional).
+                - 'p90_proceso' / 'p90_resueltos': Percentil 90 del tiempo de resolución.
+                - 'imagen_torta' / 'imagen_nube': Gráficos en PNG (bytes); si faltan se usan 'ruta_torta' / 'ruta_nube'.
+                - 'serie' / 'periodo' (opcionales): Serie temporal por período, que se agrega en una página aparte.
             departamento (str): Nombre o identificador del departamento.
-        Returns:
-            tuple: (buffer, mime_type, filename)
-                - buffer (BytesIO): Buffer con el contenido del PDF generado.
-                - mime_type (str): Tipo MIME del archivo ('application/pdf').
-                - filename (str): Nombre sugerido para el archivo PDF.
+        Yields:
+            bytes: Partes de hasta TAMANO_PARTE bytes del PDF generado.
         """
 
         buffer = BytesIO()
@@ -52,99 +58,132 @@ class ExportadorPDF(ExportadorReporte):
         c.drawString(70, y, f"En proceso: {stats['mediana_proceso'] or 'N/A'}")
         y -= 18
         c.drawString(70, y, f"Resueltos: {stats['mediana_resueltos'] or 'N/A'}")
+        y -= 25
+        c.drawString(50, y, "Percentil 90 del Tiempo de Resolución:")
+        y -= 20
+        c.drawString(70, y, f"En proceso: {stats['p90_proceso'] or 'N/A'}")
+        y -= 18
+        c.drawString(70, y, f"Resueltos: {stats['p90_resueltos'] or 'N/A'}")
         y -= 40
 
-        if stats['ruta_torta'] and os.path.exists(stats['ruta_torta']):
-            c.drawString(50, y, "Gráfico de Torta:")
-            y -= 160
-            c.drawImage(stats['ruta_torta'], 50, y, width=400, height=150, preserveAspectRatio=True)
-            y -= 160
+        for titulo, tipo in (("Gráfico de Torta:", "torta"), ("Nube de Palabras:", "nube")):
+            imagen = imagen_de(stats, tipo)
+            if imagen:
+                c.drawString(50, y, titulo)
+                y -= 160
+                c.drawImage(ImageReader(BytesIO(imagen)), 50, y, width=400, height=150, preserveAspectRatio=True)
+                y -= 160
 
-        if stats['ruta_nube'] and os.path.exists(stats['ruta_nube']):
-            c.drawString(50, y, "Nube de Palabras:")
-            y -= 160
-            c.drawImage(stats['ruta_nube'], 50, y, width=400, height=150, preserveAspectRatio=True)
-            y -= 160
+        if stats.get('serie'):
+            c.showPage()
+            y = height - 50
+            c.setFont("Helvetica-Bold", 14)
+            c.drawString(50, y, f"Evolución por {NOMBRES_PERIODOS[stats['periodo']]}")
+            for fila in [None] + stats['serie']:
+                y -= 18
+                if y < 50:
+                    c.showPage()
+                    y = height - 50
+                # La primera fila es la de los títulos, partidos en renglones para que entren en la columna
+                if fila is None:
+                    c.setFont("Helvetica-Bold", 9)
+                    renglones = [simpleSplit(titulo, "Helvetica-Bold", 9, 74)
+                                 for titulo in ["Inicio"] + [titulo for _, titulo in COLUMNAS_SERIE]]
+                    for i, lineas in enumerate(renglones):
+                        for j, linea in enumerate(lineas):
+                            c.drawString(50 + 78 * i, y - 10 * j, linea)
+                    y -= 10 * (max(len(lineas) for lineas in renglones) - 1)
+                    continue
+                c.setFont("Helvetica", 9)
+                valores = [str(fila['periodo'])] + [str(fila[clave] if fila[clave] is not None else 'N/A')
+                                                    for clave, _ in COLUMNAS_SERIE]
+                for i, valor in enumerate(valores):
+                    c.drawString(50 + 78 * i, y, valor)
 
         c.save()
-        buffer.seek(0)
-        return buffer, 'application/pdf', f'reporte_{departamento}.pdf'
+        # reportlab arma el documento completo en memoria; se entrega de a partes para no copiarlo entero de nuevo
+        vista = buffer.getbuffer()
+        try:
+            for inicio in range(0, len(vista), TAMANO_PARTE):
+                yield bytes(vista[inicio:inicio + TAMANO_PARTE])
+        finally:
+            vista.release()
 
 class ExportadorHTML(ExportadorReporte):
     """
     Clase para exportar reportes en formato HTML, incluyendo estadísticas y gráficos embebidos en base64.
     Esta clase permite generar un archivo HTML que resume información estadística de reclamos para un departamento específico,
     incluyendo gráficos (como tortas y nubes de palabras) embebidos directamente en el HTML mediante codificación base64.
+    El HTML se genera de a partes, así que nunca se arma el documento completo en un solo string.
     Métodos:
-        __imagen_a_base64(path):
-            Convierte una imagen en la ruta especificada a una cadena base64 para embeber en HTML.
+        generar_partes(stats, departamento):
+            Genera el reporte HTML de a partes (bytes en UTF-8).
         generar_reporte(stats, departamento):
             Genera un reporte HTML con estadísticas y gráficos para el departamento dado, devolviendo un buffer listo para guardar o enviar.
     """
-    #Este metodo es necesario para embeber las imagenes en el html
-    def __imagen_a_base64(self, path):
-        """
-        Convierte un archivo de imagen a una cadena codificada en base64.
-        Args:
-            path (str): Ruta al archivo de imagen.
-        Returns:
-            str: Cadena codificada en base64 de la imagen.
-        Raises:
-            FileNotFoundError: Si el archivo no existe.
-            IOError: Si el archivo no puede ser leído.
+    mime = 'text/html'
+    extension = 'html'
+
+    def __imagen_base64(self, imagen, descripcion):
+        '''Genera la etiqueta <img> con la imagen embebida, codificando el base64 de a partes.'''
+        if not imagen:
+            yield f"<p>No se pudo generar {descripcion}</p>\n".encode('utf-8')
+            return
+        yield b"<img src='data:image/png;base64,"
+        # Cada parte es múltiplo de 3 bytes para que el base64 de las partes concatenadas sea el de la imagen completa
+        paso = (TAMANO_PARTE // 4) * 3
+        for inicio in range(0, len(imagen), paso):
+            yield base64.b64encode(imagen[inicio:inicio + paso])
+        yield b"' width='400'><br>\n"
+
+    def generar_partes(self, stats : dict, departamento):
         """
-        with open(path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode('utf-8')
-            
-    def generar_reporte(self, stats : dict, departamento):
-        """           
         Genera un reporte HTML con estadísticas y gráficos para un departamento específico.
         Args:
-            stats (dict): Diccionario con estadísticas y rutas de imágenes generadas. Debe contener las claves:
-                - 'ruta_torta': Ruta al archivo de imagen del gráfico de torta.
-                - 'ruta_nube': Ruta al archivo de imagen de la nube de palabras.
+            stats (dict): Diccionario con estadísticas e imágenes generadas. Debe contener las claves:
+                - 'imagen_torta' / 'imagen_nube': Gráficos en PNG (bytes); si faltan se usan 'ruta_torta' / 'ruta_nube'.
                 - 'total': Total de reclamos.
                 - 'porcentajes': Diccionario con porcentajes por estado.
                 - 'mediana_proceso': Mediana de tiempos para reclamos en proceso.
                 - 'mediana_resueltos': Mediana de tiempos para reclamos resueltos.
+                - 'p90_proceso' / 'p90_resueltos': Percentil 90 de tiempos.
+                - 'serie' / 'periodo' (opcionales): Serie temporal por período, que se agrega como tabla.
             departamento (str): Nombre del departamento para el cual se genera el reporte.
-        Returns:
-            tuple: (buffer_html, 'text/html', nombre_archivo)
-                - buffer_html (io.BytesIO): Buffer con el contenido HTML codificado en UTF-8.
-                - 'text/html': Tipo MIME del contenido.
-                - nombre_archivo (str): Nombre sugerido para el archivo HTML generado.
-        """
-        if stats['ruta_torta'] and os.path.exists(stats['ruta_torta']):
-            img_torta_base64 = self.__imagen_a_base64(stats['ruta_torta'])
-        else:
-            img_torta_base64 = ""
-
-        if stats['ruta_nube'] and os.path.exists(stats['ruta_nube']):
-            img_nube_base64 = self.__imagen_a_base64(stats['ruta_nube'])
-        else:
-            img_nube_base64 = ""
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="es">
-        <head><meta charset="UTF-8"><title>Reporte {departamento}</title></head>
-        <body>
-            <h1>Reporte del Departamento {departamento}</h1>
-            <p><strong>Total de Reclamos:</strong> {stats['total']}</p>
-            <h3>Distribución por Estado</h3>
-            <ul>
-                {''.join(f'<li>{estado}: {round(p, 2)}%</li>' for estado, p in stats['porcentajes'].items())}
-            </ul>
-            <h3>Mediana de Tiempos</h3>
-            <p>En proceso: {stats['mediana_proceso'] or 'N/A'}</p>
-            <p>Resueltos: {stats['mediana_resueltos'] or 'N/A'}</p>
-            <h3>Gráficos</h3>
-            {"<img src='data:image/png;base64," + img_torta_base64 + "' width='400'><br>" if img_torta_base64 else "<p>No se pudo generar la gráfica de torta</p>"}
-            {"<img src='data:image/png;base64," + img_nube_base64 + "' width='400'>" if img_nube_base64 else "<p>No se pudo generar la nube de palabras</p>"}
-        </body>
-        </html>
+        Yields:
+            bytes: Partes del HTML codificadas en UTF-8.
         """
-        buffer_html = io.BytesIO(html_content.encode('utf-8'))
-        buffer_html.seek(0)
-        return buffer_html, 'text/html', f'reporte_{departamento}.html'
-    
\ No newline at end of file
+        departamento = html.escape(departamento)
+        estados = ''.join(f'<li>{html.escape(estado)}: {round(p, 2)}%</li>' for estado, p in stats['porcentajes'].items())
+        yield f"""<!DOCTYPE html>
+<html lang="es">
+<head><meta charset="UTF-8"><title>Reporte {departamento}</title></head>
+<body>
+    <h1>Reporte del Departamento {departamento}</h1>
+    <p><strong>Total de Reclamos:</strong> {stats['total']}</p>
+    <h3>Distribución por Estado</h3>
+    <ul>
+        {estados}
+    </ul>
+    <h3>Mediana de Tiempos</h3>
+    <p>En proceso: {stats['mediana_proceso'] or 'N/A'}</p>
+    <p>Resueltos: {stats['mediana_resueltos'] or 'N/A'}</p>
+    <h3>Percentil 90 de Tiempos</h3>
+    <p>En proceso: {stats['p90_proceso'] or 'N/A'}</p>
+    <p>Resueltos: {stats['p90_resueltos'] or 'N/A'}</p>
+    <h3>Gráficos</h3>
+""".encode('utf-8')
+        yield from self.__imagen_base64(imagen_de(stats, "torta"), "la gráfica de torta")
+        yield from self.__imagen_base64(imagen_de(stats, "nube"), "la nube de palabras")
+        if stats.get('serie'):
+            yield from self.__tabla_serie(stats['serie'], stats['periodo'])
+        yield b"</body>\n</html>\n"
+
+    def __tabla_serie(self, serie, periodo):
+        '''Genera la tabla de la serie temporal, de a una fila por parte.'''
+        titulos = ''.join(f'<th>{titulo}</th>' for _, titulo in COLUMNAS_SERIE)
+        yield (f"<h3>Evolución por {NOMBRES_PERIODOS[periodo]}</h3>\n"
+               f"<table border='1'>\n<tr><th>Inicio</th>{titulos}</tr>\n").encode('utf-8')
+        for fila in serie:
+            celdas = ''.join(f"<td>{fila[clave] if fila[clave] is not None else 'N/A'}</td>" for clave, _ in COLUMNAS_SERIE)
+            yield f"<tr><td>{fila['periodo']}</td>{celdas}</tr>\n".encode('utf-8')
+        yield b"</table>\n"
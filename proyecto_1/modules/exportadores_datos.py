@@ -0,0 +1,126 @@
+from modules.exportador import ExportadorDatos
+import csv
+import io
+import json
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet es opcional: solo está disponible si pyarrow está instalado
+    pyarrow = None
+
+
+class ExportadorCSV(ExportadorDatos):
+    """Exporta los reclamos en CSV (UTF-8, con una fila de encabezado)."""
+    mime = 'text/csv'
+    extension = 'csv'
+
+    def generar_partes(self, lotes):
+        '''Escribe el encabezado y después cada lote de filas como una parte del CSV.'''
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        escritor.writerow(self.COLUMNAS)
+        yield buffer.getvalue().encode('utf-8')
+        for lote in lotes:
+            buffer.seek(0)
+            buffer.truncate()
+            escritor.writerows(lote)
+            yield buffer.getvalue().encode('utf-8')
+
+
+class ExportadorJSONL(ExportadorDatos):
+    """Exporta los reclamos en JSON lines: un objeto JSON por línea, con las fechas en formato ISO 8601."""
+    mime = 'application/x-ndjson'
+    extension = 'jsonl'
+
+    @staticmethod
+    def __serializar(valor):
+        '''Convierte a texto los valores que json no sabe serializar (las fechas).'''
+        return valor.isoformat()
+
+    def generar_partes(self, lotes):
+        '''Escribe cada lote de filas como una parte con una línea por reclamo.'''
+        for lote in lotes:
+            lineas = (json.dumps(dict(zip(self.COLUMNAS, fila)), ensure_ascii=False, default=self.__serializar)
+                      for fila in lote)
+            yield ''.join(linea + '\n' for linea in lineas).encode('utf-8')
+
+
+class _SalidaPorPartes:
+    """
+    Archivo de solo escritura que acumula lo escrito hasta que se lo vacía.
+    Lleva la posición total escrita, porque el escritor de Parquet la usa para los offsets del pie del archivo.
+    """
+    def __init__(self):
+        self.__partes = []
+        self.__posicion = 0
+        self.closed = False
+
+    def write(self, datos):
+        datos = bytes(datos)
+        self.__partes.append(datos)
+        self.__posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self.__posicion
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def vaciar(self):
+        """Devuelve lo escrito desde la última vez que se vació."""
+        datos = b''.join(self.__partes)
+        self.__partes.clear()
+        return datos
+
+
+class ExportadorParquet(ExportadorDatos):
+    """
+    Exporta los reclamos en Parquet (formato columnar), escribiendo un grupo de filas por lote.
+    Requiere pyarrow.
+    """
+    mime = 'application/vnd.apache.parquet'
+    extension = 'parquet'
+
+    @staticmethod
+    def disponible():
+        """Indica si pyarrow está instalado y, por lo tanto, se puede exportar en Parquet."""
+        return pyarrow is not None
+
+    @staticmethod
+    def esquema():
+        """Devuelve el esquema de pyarrow de las columnas exportadas."""
+        return pyarrow.schema([
+            ("id_reclamo", pyarrow.int64()),
+            ("id_creador", pyarrow.int64()),
+            ("estado", pyarrow.string()),
+            ("contenido", pyarrow.string()),
+            ("departamento", pyarrow.string()),
+            ("tiempo_en_proceso", pyarrow.int64()),
+            ("fecha_y_hora", pyarrow.timestamp("us")),
+            ("r_imagen", pyarrow.string()),
+        ])
+
+    def generar_partes(self, lotes):
+        '''Escribe cada lote como un grupo de filas y entrega lo escrito; al final entrega el pie del archivo.'''
+        esquema = self.esquema()
+        salida = _SalidaPorPartes()
+        escritor = pyarrow.parquet.ParquetWriter(salida, esquema)
+        try:
+            for lote in lotes:
+                columnas = list(zip(*lote))
+                tabla = pyarrow.Table.from_arrays(
+                    [pyarrow.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+                    schema=esquema)
+                escritor.write_table(tabla)
+                yield salida.vaciar()
+        finally:
+            escritor.close()
+        yield salida.vaciar()
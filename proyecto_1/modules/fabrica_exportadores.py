@@ -1,18 +1,51 @@
 from modules.exportadores import ExportadorPDF, ExportadorHTML
+from modules.exportadores_datos import ExportadorCSV, ExportadorJSONL, ExportadorParquet
+
+# Exportadores de reportes (estadísticas y gráficos de un departamento)
+EXPORTADORES_REPORTE = {
+    'pdf': ExportadorPDF,
+    'html': ExportadorHTML,
+}
+
+# Exportadores de los datos crudos de los reclamos
+EXPORTADORES_DATOS = {
+    'csv': ExportadorCSV,
+    'jsonl': ExportadorJSONL,
+    'parquet': ExportadorParquet,
+}
+
+
 def obtener_exportador(formato: str):
     """
-    Devuelve una instancia del exportador correspondiente según el formato especificado.
+    Devuelve una instancia del exportador de reportes correspondiente según el formato especificado.
     Parámetros:
-        formato (str): El formato de exportación deseado.
+        formato (str): El formato de exportación deseado ("pdf" o "html").
     Retorna:
         Una instancia de la clase exportadora correspondiente al formato.
+    Lanza:
+        ValueError: Si el formato no está soportado.
     Ejemplo:
         exportador = obtener_exportador('pdf')
-    Nota:
-        Las clases ExportadorFORMATO deben estar definidas previamente.
     """
-    if formato == 'pdf':
-        return ExportadorPDF()
-    elif formato == 'html':
-        return ExportadorHTML()
-  # elif... para seguir agregando exportadores con otro formato
+    if formato not in EXPORTADORES_REPORTE:
+        raise ValueError(f"Formato de reporte no soportado: {formato}")
+    return EXPORTADORES_REPORTE[formato]()
+
+
+def obtener_exportador_datos(formato: str):
+    """
+    Devuelve una instancia del exportador de datos crudos correspondiente según el formato especificado.
+    Parámetros:
+        formato (str): El formato de exportación deseado ("csv", "jsonl" o "parquet").
+    Retorna:
+        Una instancia de la clase exportadora correspondiente al formato.
+    Lanza:
+        ValueError: Si el formato no está soportado, o si es "parquet" y pyarrow no está instalado.
+    Ejemplo:
+        exportador = obtener_exportador_datos('csv')
+    """
+    if formato not in EXPORTADORES_DATOS:
+        raise ValueError(f"Formato de exportación no soportado: {formato}")
+    if formato == 'parquet' and not ExportadorParquet.disponible():
+        raise ValueError("Para exportar en Parquet hace falta instalar pyarrow")
+    return EXPORTADORES_DATOS[formato]()
@@ -1,17 +1,21 @@
 from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy, RepositorioUsuariosSQLAlchemy
-from modules.config import crear_engine
+from modules.base_datos import AGRUPAR_ESCRITURAS, crear_engine, obtener_sesion_por_hilo
+from modules.escritor_agrupado import EscritorAgrupado
 
 def crear_repositorio():
     """
     Crea y devuelve instancias de los repositorios para reclamos y usuarios.
 
-    Esta función inicializa una sesión de base de datos usando la función `crear_engine`
-    y luego crea objetos repositorios concretos para reclamos y usuarios, vinculados
-    a dicha sesión.
+    Los repositorios usan la sesión con alcance por hilo de `obtener_sesion_por_hilo`: pueden compartirse
+    entre pedidos, pero cada hilo trabaja con su propia sesión (y su propia conexión del pool), que se
+    libera al terminar cada pedido (ver `liberar_sesion_por_hilo`).
+
+    Con AGRUPAR_ESCRITURAS, el repositorio de reclamos confirma sus escrituras a través de un EscritorAgrupado.
 
     :return: Una tupla (repo_reclamo, repo_usuario) con los repositorios instanciados.
     """
-    session = crear_engine()
-    repo_reclamo =  RepositorioReclamosSQLAlchemy(session())
-    repo_usuario = RepositorioUsuariosSQLAlchemy(session())
+    session = obtener_sesion_por_hilo()
+    escritor = EscritorAgrupado(crear_engine()) if AGRUPAR_ESCRITURAS else None
+    repo_reclamo =  RepositorioReclamosSQLAlchemy(session, escritor)
+    repo_usuario = RepositorioUsuariosSQLAlchemy(session)
     return repo_reclamo, repo_usuario
\ No newline at end of file
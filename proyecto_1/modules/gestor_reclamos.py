@@ -1,30 +1,49 @@
-from modules.dominio import Reclamo
+from itertools import islice
+from modules.dominio import Reclamo, VALORES_ESTADO
 from modules.repositorio_abstracto import RepositorioAbstracto
 
+# Cantidad de reclamos que las operaciones masivas escriben (y notifican a los observadores) juntos
+TAMANO_LOTE_MASIVO = 1000
+
 class GestorDeReclamos:
     """
     Clase encargada de gestionar las operaciones relacionadas con los reclamos.
     Utiliza un repositorio que implementa la interfaz RepositorioAbstracto.
     """
 
-    def __init__(self, repo: RepositorioAbstracto):
+    def __init__(self, repo: RepositorioAbstracto, observadores=None):
         """
-        Inicializa el gestor con un repositorio dado y calcula el número de reclamos existentes.
+        Inicializa el gestor con un repositorio dado. No lee los reclamos: el número de reclamos
+        existentes se cuenta recién la primera vez que se pide (ver numero_Reclamos).
 
         :param repo: Instancia de RepositorioAbstracto para acceder a los datos de reclamos.
+        :param observadores: Lista de ObservadorReclamos a notificar cuando cambian los reclamos (opcional).
         """
         self.__repo = repo    
-        self.__numero_Reclamos = len(self.__repo.obtener_todos_los_registros())    
+        self.__observadores = list(observadores) if observadores else []
+        self.__numero_Reclamos = None
 
     @property
     def numero_Reclamos(self):
         """
         Retorna el número actual de reclamos registrados.
+        La primera vez se cuenta en la base con una consulta COUNT (contar_total_reclamos) y después
+        se mantiene con las altas y bajas hechas a través del gestor.
 
         :return: Cantidad de reclamos como entero.
         """
+        if self.__numero_Reclamos is None:
+            self.__numero_Reclamos = self.__repo.contar_total_reclamos()
         return self.__numero_Reclamos
 
+    def agregar_observador(self, observador):
+        """
+        Registra un observador que será notificado de las altas, modificaciones y bajas de reclamos.
+
+        :param observador: Instancia de ObservadorReclamos.
+        """
+        self.__observadores.append(observador)
+
     def listar_Reclamos_existentes(self):
         """
         Lista todos los reclamos registrados en formato de diccionario.
@@ -49,7 +68,78 @@ class GestorDeReclamos:
         """
         reclamo = Reclamo(id_reclamo=None, id_creador=id_creador,estado= estado,contenido= contenido,departamento= departamento,tiempo_en_proceso= tiempo_en_proceso,r_imagen= r_imagen)
         self.__repo.guardar_registro(reclamo)
-        self.__numero_Reclamos += 1
+        if self.__numero_Reclamos is not None:
+            self.__numero_Reclamos += 1
+        for observador in self.__observadores:
+            observador.reclamo_agregado(reclamo)
+
+    def agregar_Reclamos(self, reclamos, tamano_lote=TAMANO_LOTE_MASIVO):
+        """
+        Guarda muchos reclamos nuevos de una vez (guardar_registros del repositorio, un INSERT por lote)
+        y notifica a los observadores cada reclamo guardado, igual que agregar_nuevo_Reclamo.
+
+        :param reclamos: Iterable de instancias de Reclamo nuevas (se les asigna el id_reclamo).
+        :param tamano_lote: Cantidad de reclamos que se guardan y se notifican juntos.
+        :raises ValueError: Si algún objeto no es un Reclamo (los lotes anteriores ya quedan guardados y notificados).
+        """
+        for lote in self.__en_lotes(reclamos, tamano_lote):
+            self.__repo.guardar_registros(lote)
+            if self.__numero_Reclamos is not None:
+                self.__numero_Reclamos += len(lote)
+            for reclamo in lote:
+                for observador in self.__observadores:
+                    observador.reclamo_agregado(reclamo)
+
+    def editar_Reclamos(self, reclamos, tamano_lote=TAMANO_LOTE_MASIVO):
+        """
+        Modifica muchos reclamos existentes de una vez (modificar_registros del repositorio, un UPDATE por lote)
+        y notifica a los observadores cada modificación, igual que editar_Reclamo.
+
+        :param reclamos: Iterable de instancias de Reclamo con los valores nuevos.
+        :param tamano_lote: Cantidad de reclamos que se modifican y se notifican juntos.
+        :raises ValueError: Si algún reclamo no existe (los lotes anteriores ya quedan modificados y notificados).
+        """
+        for lote in self.__en_lotes(reclamos, tamano_lote):
+            anteriores = self.__obtener_anteriores(reclamo.id_reclamo for reclamo in lote)
+            self.__repo.modificar_registros(lote)
+            for reclamo in lote:
+                for observador in self.__observadores:
+                    observador.reclamo_modificado(anteriores[reclamo.id_reclamo], reclamo)
+
+    def cambiar_departamentos(self, cambios, tamano_lote=TAMANO_LOTE_MASIVO):
+        """
+        Cambia el departamento de muchos reclamos de una vez (actualizar_departamentos del repositorio)
+        y notifica a los observadores cada cambio como una modificación del reclamo.
+
+        :param cambios: Diccionario {id_reclamo: nuevo_departamento}.
+        :param tamano_lote: Cantidad de reclamos que se actualizan y se notifican juntos.
+        :raises ValueError: Si algún reclamo no existe (los lotes anteriores ya quedan actualizados y notificados).
+        """
+        for lote in self.__en_lotes(cambios.items(), tamano_lote):
+            lote = dict(lote)
+            anteriores = self.__obtener_anteriores(lote)
+            self.__repo.actualizar_departamentos(lote)
+            for id_reclamo, departamento in lote.items():
+                anterior = anteriores[id_reclamo]
+                for observador in self.__observadores:
+                    observador.reclamo_modificado(anterior, anterior._replace(departamento=departamento))
+
+    def __obtener_anteriores(self, ids_reclamos):
+        '''Devuelve {id_reclamo: VistaReclamo} con el estado actual de los reclamos, controlando que existan todos.'''
+        ids_reclamos = set(ids_reclamos)
+        anteriores = {r.id_reclamo: r for r in self.__repo.obtener_registros_por_ids(list(ids_reclamos))}
+        if len(anteriores) != len(ids_reclamos):
+            raise ValueError("El Reclamo no existe en la base de datos")
+        return anteriores
+
+    @staticmethod
+    def __en_lotes(elementos, tamano_lote):
+        '''Divide un iterable en listas de a lo sumo tamano_lote elementos.'''
+        if not isinstance(tamano_lote, int) or tamano_lote <= 0:
+            raise ValueError("El tamaño de lote debe ser un entero positivo")
+        elementos = iter(elementos)
+        while lote := list(islice(elementos, tamano_lote)):
+            yield lote
 
     def devolver_Reclamo(self, id_Reclamo):         
         """
@@ -75,16 +165,19 @@ class GestorDeReclamos:
         """
         if not isinstance(id_Reclamo, int) or id_Reclamo <= 0:
             raise ValueError("El ID del reclamo debe ser un entero positivo")
-        if estado not in ["Pendiente", "En proceso", "Resuelto", "Invalido"] :
+        if estado not in VALORES_ESTADO:
             raise ValueError("El estado del reclamo es erroneo. Debe ser uno de los siguientes: 'Pendiente', 'En proceso', 'Resuelto', 'Invalido'")
         if tiempo_en_proceso is not None: #Al crear un nuevo reclamo tiempo_en_proceso siempre es None, por eso es necesaria esta validación.
             if not isinstance(tiempo_en_proceso, int) or tiempo_en_proceso <= 0 or tiempo_en_proceso > 15:
                 raise ValueError("El tiempo en proceso debe ser un entero entre 1 y 15 o None si aún no fue asignado")
-        if self.__repo.obtener_registro_por_filtro("id_reclamo", id_Reclamo) is None:
+        anterior = self.__repo.obtener_registro_por_filtro("id_reclamo", id_Reclamo)
+        if anterior is None:
             raise ValueError("El Reclamo no existe en la base de datos")
 
         reclamo = Reclamo(id_reclamo = id_Reclamo, id_creador = id_creador, estado = estado, contenido = contenido, departamento = departamento, tiempo_en_proceso = tiempo_en_proceso, r_imagen = r_imagen, fecha_y_hora = fecha_y_hora)
         self.__repo.modificar_registro(reclamo)
+        for observador in self.__observadores:
+            observador.reclamo_modificado(anterior, reclamo)
 
     def eliminar_Reclamo_seleccionado(self, id_Reclamo):  #Por el momento no se usa
         """
@@ -93,10 +186,14 @@ class GestorDeReclamos:
         :param id_Reclamo: ID del reclamo a eliminar.
         :raises ValueError: Si el reclamo no existe.
         """
-        if self.__repo.obtener_registro_por_filtro("id_reclamo", id_Reclamo) is None:
+        anterior = self.__repo.obtener_registro_por_filtro("id_reclamo", id_Reclamo)
+        if anterior is None:
             raise ValueError("El Reclamo no existe en la base de datos")
         self.__repo.eliminar_registro(id_Reclamo)
-        self.__numero_Reclamos -= 1
+        if self.__numero_Reclamos is not None:
+            self.__numero_Reclamos -= 1
+        for observador in self.__observadores:
+            observador.reclamo_eliminado(anterior)
 
     def devolver_reclamos_segun_usuario(self, id_creador):
         """
@@ -121,15 +218,41 @@ class GestorDeReclamos:
 
     def listar_reclamos_paginados(self, page=1, per_page=20, departamento=None):
         reclamos, total = self.__repo.obtener_reclamos_paginados(page, per_page, departamento)
+        self.__agregar_adherentes(reclamos)
+        return reclamos, total
 
+    def listar_reclamos_por_cursor(self, per_page=20, departamento=None, antes_de=None, despues_de=None):
+        """
+        Lista una página de reclamos (del más nuevo al más viejo) paginando por cursor sobre id_reclamo.
+
+        :param per_page: Cantidad de reclamos por página.
+        :param departamento: Departamento a filtrar, o None para todos.
+        :param antes_de: Cursor de la página siguiente (id del último reclamo de la página actual).
+        :param despues_de: Cursor de la página anterior (id del primer reclamo de la página actual).
+        :return: Tupla (reclamos, pagina), donde pagina es un diccionario con "anterior" y "siguiente"
+            (los cursores para pedir esas páginas, o None si no hay) y "total" (cantidad de reclamos).
+        """
+        reclamos, hay_mas = self.__repo.obtener_reclamos_por_cursor(per_page, departamento, antes_de, despues_de)
+        self.__agregar_adherentes(reclamos)
+        pagina = {"anterior": None, "siguiente": None, "total": self.__repo.contar_reclamos(departamento)}
+        if reclamos:
+            # Hay página anterior si se llegó avanzando, o si retrocediendo quedaron más; la siguiente, al revés
+            if despues_de is not None:
+                pagina["anterior"] = reclamos[0]['id_reclamo'] if hay_mas else None
+                pagina["siguiente"] = reclamos[-1]['id_reclamo']
+            else:
+                pagina["anterior"] = reclamos[0]['id_reclamo'] if antes_de is not None else None
+                pagina["siguiente"] = reclamos[-1]['id_reclamo'] if hay_mas else None
+        return reclamos, pagina
+
+    def __agregar_adherentes(self, reclamos):
+        '''Agrega a cada reclamo (diccionario) la cantidad de adherentes, con una sola consulta.'''
         ids_reclamos = [r['id_reclamo'] for r in reclamos]
         adherentes_por_reclamo = self.__repo.contar_adherentes_por_varios_reclamos(ids_reclamos)
 
         for reclamo in reclamos:
             reclamo['n_adherentes'] = adherentes_por_reclamo.get(reclamo['id_reclamo'], 0)
 
-        return reclamos, total
-
 
     def obtener_reclamos_departamento(self,departamento):
         reclamos = self.__repo.obtener_registros_por_filtro("departamento",departamento)
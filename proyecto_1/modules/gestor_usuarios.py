@@ -6,9 +6,15 @@ from werkzeug.security import generate_password_hash, check_password_hash
 class GestorDeUsuarios:
     '''Clase encargada de gestionar las operaciones relacionadas con los usuarios.
     Utiliza un repositorio que implementa la interfaz RepositorioAbstracto para acceder a los datos.'''
-    def __init__(self, repo: RepositorioAbstracto):
-        '''Inicializa el gestor con un repositorio dado.'''
+    def __init__(self, repo: RepositorioAbstracto, observadores=None):
+        '''Inicializa el gestor con un repositorio dado y, opcionalmente, una lista de ObservadorReclamos
+        a notificar cuando un usuario se adhiere a un reclamo.'''
         self.__repo = repo
+        self.__observadores = list(observadores) if observadores else []
+
+    def agregar_observador(self, observador):
+        '''Registra un ObservadorReclamos que será notificado de las nuevas adhesiones.'''
+        self.__observadores.append(observador)
 
     def registrar_nuevo_usuario(self, nombre, email, password, apellido, nombre_usuario, claustro, rol):
         """
@@ -83,6 +89,8 @@ class GestorDeUsuarios:
             raise ValueError("Usted ya se encuentra adherido al reclamo")
 
         self.__repo.asociar_registro(id_usuario, id_reclamo)
+        for observador in self.__observadores:
+            observador.adherente_agregado(id_usuario, id_reclamo)
 
     def contar_adherentes_de_reclamo(self, id_Reclamo):
         """
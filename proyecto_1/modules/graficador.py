@@ -1,22 +1,62 @@
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+import io
+import os
+import tempfile
 from collections import Counter
-import string
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from wordcloud import WordCloud
+from modules.cache_tokens import STOPWORDS_ES, tokenizar_nube
+
+def guardar_atomico(contenido, ruta_salida):
+    """
+    Escribe el contenido en un archivo temporal de la misma carpeta y luego lo renombra a ruta_salida.
+    El renombrado es atómico, así que quien lea ruta_salida ve la imagen anterior o la nueva completa,
+    nunca un archivo a medio escribir, aunque varios hilos o procesos escriban la misma ruta a la vez.
+
+    :param contenido: Bytes a escribir.
+    :param ruta_salida: Ruta final del archivo.
+    :return: Ruta final del archivo.
+    """
+    carpeta = os.path.dirname(ruta_salida) or "."
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as archivo:
+            archivo.write(contenido)
+        os.chmod(ruta_temporal, 0o644)   # mkstemp crea el archivo solo legible por el dueño
+        os.replace(ruta_temporal, ruta_salida)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+    return ruta_salida
 
-# Lista local de palabras vacías en español (puedes ampliarla si querés)
-STOPWORDS_ES = set([
-    "de", "la", "que", "el", "en", "y", "a", "los", "del", "se", "las", "por",
-    "un", "para", "con", "no", "una", "su", "al", "lo", "como", "más", "pero",
-    "sus", "le", "ya", "o", "este", "sí", "porque", "esta", "entre", "cuando"
-])
 
 class Graficador():
     """
     Clase que proporciona métodos estáticos para generar gráficos:
     - Gráfico de torta (pie chart) a partir de porcentajes.
     - Nube de palabras a partir de textos, filtrando palabras vacías.
+    Los métodos generar_* devuelven la imagen PNG en memoria (bytes) y los graficar_* la guardan en disco.
+    No se usa el estado global de pyplot: cada gráfico tiene su propia Figure dibujada con el backend Agg,
+    por lo que se pueden llamar desde varios hilos o desde un pool de procesos a la vez.
     """
 
+    @staticmethod
+    def generar_torta(porcentajes):
+        """
+        Genera un gráfico de torta (pie chart) con etiquetas y porcentajes.
+
+        :param porcentajes: Diccionario con etiquetas como claves y valores numéricos (porcentajes).
+        :return: Imagen PNG en bytes.
+        """
+        figura = Figure(figsize=(6, 6))
+        FigureCanvasAgg(figura)
+        ejes = figura.add_subplot()
+        ejes.pie(list(porcentajes.values()), labels=list(porcentajes.keys()), autopct='%1.1f%%')
+        buffer = io.BytesIO()
+        figura.savefig(buffer, format="png")
+        return buffer.getvalue()
+
     @staticmethod
     def graficar_torta(porcentajes, ruta_salida='static/images/torta.png'):
         """
@@ -26,12 +66,17 @@ class Graficador():
         :param ruta_salida: Ruta donde se guardará la imagen generada (PNG).
         :return: Ruta donde se guardó la imagen.
         """
-        labels = porcentajes.keys()
-        sizes = porcentajes.values()
-        plt.figure(figsize=(6, 6))
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%')
-        plt.savefig(ruta_salida)
-        return ruta_salida
+        return guardar_atomico(Graficador.generar_torta(porcentajes), ruta_salida)
+
+    @staticmethod
+    def tokenizar_nube(texto):
+        """
+        Separa un texto en las palabras que se usan para la nube (ver cache_tokens.tokenizar_nube).
+
+        :param texto: Texto a procesar.
+        :return: Lista de palabras.
+        """
+        return tokenizar_nube(texto)
 
     @staticmethod
     def graficar_nube(textos_contenidos, ruta_salida = 'static/images/nube.png'):
@@ -44,15 +89,35 @@ class Graficador():
         :param textos_contenidos: Texto en formato string a procesar.
         :return: Ruta donde se guardó la imagen generada (PNG).
         """
-        ruta_salida = 'static/images/nube.png'
-        texto_limpio = textos_contenidos.translate(str.maketrans('', '', string.punctuation))
-        palabras = texto_limpio.split()
-        palabras_filtradas = [p for p in palabras if p not in STOPWORDS_ES]
-        frecuencia = Counter(palabras_filtradas).most_common(15)
+        return Graficador.graficar_nube_frecuencias(Counter(Graficador.tokenizar_nube(textos_contenidos)), ruta_salida)
+
+    @staticmethod
+    def generar_nube_frecuencias(frecuencias):
+        """
+        Genera una imagen de nube de palabras con las 15 palabras más frecuentes,
+        a partir de las frecuencias ya contadas. Permite reutilizar los tokens cacheados de cada
+        reclamo en lugar de volver a procesar todo el texto del departamento.
+
+        :param frecuencias: Counter con la cantidad de apariciones de cada palabra.
+        :return: Imagen PNG en bytes.
+        """
+        frecuencia = frecuencias.most_common(15)
         texto_final = " ".join([(" " + palabra) * freq for palabra, freq in frecuencia])
         nube = WordCloud(width=800, height=400, background_color='white', collocations=False).generate(texto_final)
-        nube.to_file(ruta_salida)
-        return ruta_salida
+        buffer = io.BytesIO()
+        nube.to_image().save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    @staticmethod
+    def graficar_nube_frecuencias(frecuencias, ruta_salida = 'static/images/nube.png'):
+        """
+        Genera y guarda una imagen de nube de palabras con las 15 palabras más frecuentes (ver generar_nube_frecuencias).
+
+        :param frecuencias: Counter con la cantidad de apariciones de cada palabra.
+        :param ruta_salida: Ruta donde se guardará la imagen generada (PNG).
+        :return: Ruta donde se guardó la imagen generada (PNG).
+        """
+        return guardar_atomico(Graficador.generar_nube_frecuencias(frecuencias), ruta_salida)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+# Importa reclamos a la base configurada (URL_BD) con la carga masiva del repositorio (COPY en PostgreSQL).
+# Lee los archivos de la exportación de datos (CSV o JSON Lines) o copia los reclamos de otra base,
+# por ejemplo para pasar de SQLite a PostgreSQL.
+# Uso (desde la carpeta proyecto_1):
+#     python -m modules.importar_reclamos reclamos.csv [--lote 5000] [--sin-ids]
+#     URL_BD=postgresql+psycopg://... python -m modules.importar_reclamos --desde sqlite:///data/base_datos.db
+import argparse
+import csv
+import json
+import time
+from datetime import datetime
+from sqlalchemy import create_engine, select
+from modules.exportador import ExportadorDatos, TAMANO_LOTE_DATOS
+from modules.modelos import ModeloReclamo
+
+COLUMNAS = ExportadorDatos.COLUMNAS
+COLUMNAS_ENTERAS = ("id_reclamo", "id_creador", "tiempo_en_proceso")
+
+
+def convertir_fila(datos, columnas=COLUMNAS):
+    """
+    Convierte un reclamo leído de un archivo exportado (valores de texto) en una tupla con los valores de las columnas.
+    Args:
+        datos (dict): Valores del reclamo por columna (los vacíos o ausentes se toman como nulos).
+        columnas (tuple): Columnas a devolver, en orden.
+    Returns:
+        tuple: Valores de las columnas.
+    Raises:
+        ValueError: Si un número o una fecha no tienen un formato válido.
+    """
+    fila = []
+    for columna in columnas:
+        valor = datos.get(columna)
+        if valor == "" or valor is None:
+            valor = None
+        elif columna in COLUMNAS_ENTERAS:
+            valor = int(valor)
+        elif columna == "fecha_y_hora" and isinstance(valor, str):
+            valor = datetime.fromisoformat(valor)
+        fila.append(valor)
+    return tuple(fila)
+
+
+def leer_archivo(ruta, columnas=COLUMNAS, tamano_lote=TAMANO_LOTE_DATOS):
+    """
+    Lee un archivo CSV o JSON Lines (según la extensión) y devuelve los reclamos por lotes.
+    Returns:
+        Generador de listas de tuplas con los valores de las columnas.
+    Raises:
+        ValueError: Si la extensión no es .csv ni .jsonl.
+    """
+    if ruta.endswith(".csv"):
+        def leer(archivo):
+            return csv.DictReader(archivo)
+    elif ruta.endswith(".jsonl"):
+        def leer(archivo):
+            return (json.loads(linea) for linea in archivo if linea.strip())
+    else:
+        raise ValueError("Formato de archivo no soportado (debe ser .csv o .jsonl)")
+
+    def lotes():
+        with open(ruta, encoding="utf-8", newline="") as archivo:
+            lote = []
+            for datos in leer(archivo):
+                lote.append(convertir_fila(datos, columnas))
+                if len(lote) == tamano_lote:
+                    yield lote
+                    lote = []
+            if lote:
+                yield lote
+
+    return lotes()
+
+
+def leer_base(url, columnas=COLUMNAS, tamano_lote=TAMANO_LOTE_DATOS):
+    """
+    Lee los reclamos de otra base y los devuelve por lotes, ordenados por id_reclamo.
+    La base de origen solo se lee: se abre con un engine propio (no el de modules/base_datos.py, que la migraría
+    y le cambiaría los PRAGMAs) y en una transacción de solo lectura.
+    Args:
+        url (str): URL de la base de origen.
+    Returns:
+        Generador de listas de tuplas con los valores de las columnas.
+    """
+    def lotes():
+        engine = create_engine(url)
+        try:
+            with engine.connect() as conexion:
+                if conexion.dialect.name == "sqlite":
+                    conexion.exec_driver_sql("PRAGMA query_only = ON")
+                elif conexion.dialect.name == "postgresql":
+                    conexion.exec_driver_sql("SET TRANSACTION READ ONLY")
+                consulta = select(*(ModeloReclamo.__table__.c[columna] for columna in columnas)).order_by(
+                    ModeloReclamo.id_reclamo)
+                resultado = conexion.execution_options(yield_per=tamano_lote).execute(consulta)
+                for lote in resultado.partitions():
+                    yield [tuple(fila) for fila in lote]
+        finally:
+            engine.dispose()
+
+    return lotes()
+
+
+if __name__ == "__main__":
+    from modules.base_datos import URL_BD
+    from modules.factoria import crear_repositorio
+
+    parser = argparse.ArgumentParser(description=f"Importa reclamos a la base {URL_BD}.")
+    origen = parser.add_mutually_exclusive_group(required=True)
+    origen.add_argument("archivo", nargs="?", help="Archivo .csv o .jsonl de la exportación de datos")
+    origen.add_argument("--desde", help="URL de otra base de la que copiar todos los reclamos")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE_DATOS,
+                        help=f"Cantidad de reclamos por lote (por defecto {TAMANO_LOTE_DATOS})")
+    parser.add_argument("--sin-ids", action="store_true",
+                        help="No conserva los ids de origen (la base destino asigna ids nuevos)")
+    args = parser.parse_args()
+
+    columnas = tuple(c for c in COLUMNAS if not (args.sin_ids and c == "id_reclamo"))
+    if args.desde:
+        lotes = leer_base(args.desde, columnas, args.lote)
+    else:
+        lotes = leer_archivo(args.archivo, columnas, args.lote)
+    repo_reclamo, _ = crear_repositorio()
+    inicio = time.perf_counter()
+    total = repo_reclamo.importar_filas(columnas, lotes)
+    print(f"Listo: {total} reclamos importados en {time.perf_counter() - inicio:.1f} s.")
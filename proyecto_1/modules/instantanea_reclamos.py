@@ -0,0 +1,257 @@
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+import numpy as np
+from modules.agregados import ESTADOS_CON_TIEMPO, calcular_porcentajes
+from modules.dominio import VALORES_ESTADO
+from modules.marca_agua import VENTANA_MARCA
+from modules.observador_reclamos import ObservadorReclamos
+from modules.repositorio_abstracto import RepositorioAbstracto
+from modules.repositorio_concreto import PERIODOS
+
+# Columnas de la tabla reclamos que se cargan en la instantánea, en el orden en que se leen
+COLUMNAS_INSTANTANEA = ("id_reclamo", "estado", "departamento", "tiempo_en_proceso", "fecha_y_hora", "actualizado")
+# Cantidad de filas que se traen de la base por vez
+TAMANO_LOTE_INSTANTANEA = 50000
+# Valor de tiempo_en_proceso que representa "sin asignar" (los tiempos válidos van de 1 a 15)
+TIEMPO_SIN_ASIGNAR = 0
+# Segundos durante los que se usan los arreglos sin volver a consultar la base (los cambios hechos a través
+# de GestorDeReclamos se aplican antes, con las notificaciones de ObservadorReclamos)
+VIGENCIA_INSTANTANEA = 5
+
+
+class InstantaneaReclamos(ObservadorReclamos):
+    """
+    Copia en memoria, por columnas, de los datos de los reclamos que usa la analítica: un arreglo de numpy
+    por columna (id_reclamo, estado, departamento, tiempo_en_proceso y fecha_y_hora), ordenados por id y con
+    estado y departamento guardados como códigos enteros chicos. Así los porcentajes por estado, las medianas
+    y percentiles de tiempo y las series por período se calculan con operaciones vectorizadas, aun con
+    millones de reclamos.
+    Para enterarse de los cambios que hacen otros procesos se recuerda el mayor valor de la columna actualizado
+    ya leído (marca_agua): cada actualización vuelve a leer los reclamos con actualizado desde marca_agua menos
+    VENTANA_MARCA (con índice), así que también aparecen los que se confirmaron tarde, y los reemplaza o
+    inserta en los arreglos. Las bajas no dejan filas para leer: si la cantidad de reclamos de la base no
+    coincide con la de los arreglos, se vuelve a cargar todo. Cuando la base sigue con la misma cantidad de
+    reclamos y el mismo máximo de actualizado, y ya se leyó la ventana pasado VENTANA_MARCA desde la marca
+    (no puede faltar confirmarse nada anterior), no se lee ninguna fila.
+    Los cambios hechos a través de GestorDeReclamos se aplican enseguida con las notificaciones de
+    ObservadorReclamos; los de otros procesos, a lo sumo vigencia segundos después.
+    """
+    def __init__(self, repo: RepositorioAbstracto, tamano_lote=TAMANO_LOTE_INSTANTANEA, vigencia=VIGENCIA_INSTANTANEA):
+        """
+        Inicializa la instantánea vacía; los reclamos se cargan la primera vez que se consulta.
+        Args:
+            repo (RepositorioAbstracto): Repositorio de reclamos (debe implementar iterar_filas y obtener_huella).
+            tamano_lote (int): Cantidad de filas que se traen de la base por vez.
+            vigencia (float): Segundos entre consultas a la base para incorporar los cambios de otros procesos.
+        """
+        self.__repo = repo
+        self.__tamano_lote = tamano_lote
+        self.__vigencia = vigencia
+        self.__lock = threading.RLock()
+        self.__codigos_estado = {estado: codigo for codigo, estado in enumerate(VALORES_ESTADO)}
+        self.__departamentos = []
+        self.__codigos_departamento = {}
+        self.__ids = np.empty(0, dtype=np.int64)
+        self.__estados = np.empty(0, dtype=np.int8)
+        self.__departamento = np.empty(0, dtype=np.int16)
+        self.__tiempos = np.empty(0, dtype=np.int8)
+        self.__fechas = np.empty(0, dtype="datetime64[s]")
+        self.__marca_agua = None
+        self.__leido_en = None          # Momento en que empezó la última lectura de la base
+        self.__ultima_actualizacion = None
+
+    @property
+    def marca_agua(self):
+        """Devuelve el mayor valor de actualizado leído de la base (None si todavía no se cargó nada)."""
+        return self.__marca_agua
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__ids)
+
+    def __codigo_departamento(self, departamento):
+        '''Devuelve el código de un departamento, asignándole uno nuevo si es la primera vez que aparece.'''
+        codigo = self.__codigos_departamento.get(departamento)
+        if codigo is None:
+            codigo = self.__codigos_departamento[departamento] = len(self.__departamentos)
+            self.__departamentos.append(departamento)
+        return codigo
+
+    def __tiempo(self, tiempo_en_proceso):
+        return TIEMPO_SIN_ASIGNAR if tiempo_en_proceso is None else tiempo_en_proceso
+
+    def __columnas(self, filas):
+        '''Convierte filas (id, estado, departamento, tiempo, fecha) en una tupla de arreglos como los de la instantánea.'''
+        ids, estados, departamentos, tiempos, fechas = zip(*filas) if filas else ((),) * 5
+        return (np.array(ids, dtype=np.int64),
+                np.array([self.__codigos_estado[estado] for estado in estados], dtype=np.int8),
+                np.array([self.__codigo_departamento(d) for d in departamentos], dtype=np.int16),
+                np.array([self.__tiempo(tiempo) for tiempo in tiempos], dtype=np.int8),
+                np.array(fechas, dtype="datetime64[s]"))
+
+    def __leer(self, actualizados_desde=None):
+        '''Lee de la base los reclamos (todos o los modificados desde un momento) y avanza la marca de agua.'''
+        lotes = []
+        for lote in self.__repo.iterar_filas(COLUMNAS_INSTANTANEA, tamano_lote=self.__tamano_lote,
+                                             actualizados_desde=actualizados_desde):
+            lotes.append(self.__columnas([fila[:-1] for fila in lote]))
+            marcas = [fila[-1] for fila in lote if fila[-1] is not None]
+            if marcas and (self.__marca_agua is None or max(marcas) > self.__marca_agua):
+                self.__marca_agua = max(marcas)
+        if not lotes:
+            return self.__columnas([])
+        return tuple(np.concatenate([lote[i] for lote in lotes]) for i in range(5))
+
+    def __reemplazar(self, columnas):
+        '''Reemplaza en los arreglos los reclamos ya cargados e inserta los demás, manteniendo el orden por id.'''
+        ids = columnas[0]
+        if not len(ids):
+            return
+        actuales = (self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas)
+        posiciones = np.searchsorted(self.__ids, ids)
+        existentes = posiciones < len(self.__ids)
+        existentes[existentes] = self.__ids[posiciones[existentes]] == ids[existentes]
+        for actual, nueva in zip(actuales, columnas):
+            actual[posiciones[existentes]] = nueva[existentes]
+        if not existentes.all():
+            nuevos = ~existentes
+            actuales = tuple(np.insert(actual, posiciones[nuevos], nueva[nuevos])
+                             for actual, nueva in zip(actuales, columnas))
+        self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas = actuales
+
+    def actualizar(self):
+        """
+        Incorpora los reclamos agregados o modificados en la base desde la última actualización (por la columna
+        actualizado, con VENTANA_MARCA de margen), y vuelve a cargar todo si la cantidad de reclamos de la base
+        no coincide con la de la instantánea (hubo bajas).
+        Returns:
+            int: Cantidad de reclamos leídos de la base.
+        """
+        with self.__lock:
+            momento = datetime.now()
+            cantidad, ultima = self.__repo.obtener_huella()
+            if self.__marca_agua is None:
+                columnas = self.__leer()
+                self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas = columnas
+                cantidad = len(self.__ids)
+            elif (cantidad == len(self.__ids) and ultima == self.__marca_agua
+                  and self.__leido_en >= self.__marca_agua + VENTANA_MARCA):
+                self.__ultima_actualizacion = time.monotonic()
+                return 0
+            else:
+                columnas = self.__leer(self.__marca_agua - VENTANA_MARCA)
+                self.__reemplazar(columnas)
+                cantidad, _ = self.__repo.obtener_huella()
+            leidos = len(columnas[0])
+            if cantidad != len(self.__ids):
+                self.__marca_agua = None
+                columnas = self.__leer()
+                self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas = columnas
+                leidos = len(columnas[0])
+            self.__leido_en = momento
+            self.__ultima_actualizacion = time.monotonic()
+            return leidos
+
+    def __al_dia(self):
+        '''Actualiza la instantánea si nunca se cargó o si pasaron vigencia segundos desde la última vez.'''
+        if self.__ultima_actualizacion is None or time.monotonic() - self.__ultima_actualizacion >= self.__vigencia:
+            self.actualizar()
+
+    def __filtro(self, departamento):
+        '''Devuelve la máscara de los reclamos del departamento, o de todos si es None.'''
+        if departamento is None:
+            return np.ones(len(self.__ids), dtype=bool)
+        codigo = self.__codigos_departamento.get(departamento)
+        return self.__departamento == (-1 if codigo is None else codigo)
+
+    def obtener_resumen(self, departamento=None):
+        """
+        Calcula las estadísticas de los reclamos de un departamento (o de todos).
+        Args:
+            departamento (str): Nombre del departamento, o None para todos los reclamos.
+        Returns:
+            dict: Diccionario con las claves:
+                - "total" (int): Cantidad de reclamos.
+                - "conteo" (Counter): Cantidad de reclamos por estado.
+                - "porcentajes" (dict): Porcentaje de reclamos por estado.
+                - "mediana_proceso", "mediana_resueltos" (float or None): Mediana de tiempo_en_proceso de los
+                  reclamos "En proceso" y "Resuelto" (sin contar los que no tienen tiempo asignado).
+                - "p90_proceso", "p90_resueltos" (float or None): Percentil 90 de tiempo_en_proceso, ídem.
+        """
+        with self.__lock:
+            self.__al_dia()
+            mascara = self.__filtro(departamento)
+            cantidades = np.bincount(self.__estados[mascara], minlength=len(VALORES_ESTADO))
+            conteo = Counter({estado: int(cantidades[codigo]) for estado, codigo in self.__codigos_estado.items()
+                              if cantidades[codigo]})
+            resumen = {"total": int(cantidades.sum()), "conteo": conteo, "porcentajes": calcular_porcentajes(conteo)}
+            for estado, sufijo in zip(ESTADOS_CON_TIEMPO, ("proceso", "resueltos")):
+                tiempos = self.__tiempos[mascara & (self.__estados == self.__codigos_estado[estado])
+                                         & (self.__tiempos != TIEMPO_SIN_ASIGNAR)]
+                mediana, p90 = np.percentile(tiempos, (50, 90)) if len(tiempos) else (None, None)
+                resumen[f"mediana_{sufijo}"] = None if mediana is None else float(mediana)
+                resumen[f"p90_{sufijo}"] = None if p90 is None else float(p90)
+            return resumen
+
+    def conteos_por_periodo(self, departamento=None, periodo="semana"):
+        """
+        Cuenta los reclamos agrupados por período de creación (según fecha_y_hora), estado y tiempo en proceso,
+        como RepositorioReclamosSQLAlchemy.obtener_conteos_por_periodo pero sin consultar la base.
+        Args:
+            departamento (str): Nombre del departamento, o None para todos los reclamos.
+            periodo (str): "dia", "semana" (empiezan el lunes) o "mes".
+        Returns:
+            list: Tuplas (inicio del período (date), estado, tiempo_en_proceso, cantidad), ordenadas por período;
+                el formato que recibe series_temporales.armar_serie.
+        Raises:
+            ValueError: Si el período no es válido.
+        """
+        if periodo not in PERIODOS:
+            raise ValueError(f"Período inválido. Debe ser uno de: {', '.join(PERIODOS)}.")
+        with self.__lock:
+            self.__al_dia()
+            mascara = self.__filtro(departamento)
+            dias = self.__fechas[mascara].astype("datetime64[D]")
+            estados, tiempos = self.__estados[mascara], self.__tiempos[mascara]
+        if periodo == "semana":
+            # El 1/1/1970 (día 0) fue jueves: se retrocede hasta el lunes anterior
+            numeros = dias.astype(np.int64)
+            dias = (numeros - (numeros + 3) % 7).astype("datetime64[D]")
+        elif periodo == "mes":
+            dias = dias.astype("datetime64[M]").astype("datetime64[D]")
+        # Se agrupa por una única clave entera (día, estado y tiempo en bits separados; ambos entran en un byte)
+        claves, cantidades = np.unique((dias.astype(np.int64) << 16) | (estados.astype(np.int64) << 8) | tiempos,
+                                       return_counts=True)
+        return [(np.datetime64(clave >> 16, "D").astype(object), VALORES_ESTADO[(clave >> 8) & 0xFF],
+                 None if clave & 0xFF == TIEMPO_SIN_ASIGNAR else clave & 0xFF, cantidad)
+                for clave, cantidad in zip(claves.tolist(), cantidades.tolist())]
+
+    def __posicion(self, id_reclamo):
+        '''Devuelve la posición del reclamo en los arreglos, o None si no está cargado.'''
+        posicion = int(np.searchsorted(self.__ids, id_reclamo))
+        if posicion < len(self.__ids) and self.__ids[posicion] == id_reclamo:
+            return posicion
+        return None
+
+    def __aplicar(self, reclamo):
+        with self.__lock:
+            # Si todavía no se cargó nada, el reclamo se leerá con la primera carga
+            if self.__ultima_actualizacion is not None:
+                self.__reemplazar(self.__columnas([(reclamo.id_reclamo, reclamo.estado, reclamo.departamento,
+                                                    reclamo.tiempo_en_proceso, reclamo.fecha_y_hora)]))
+
+    def reclamo_agregado(self, reclamo):
+        self.__aplicar(reclamo)
+
+    def reclamo_modificado(self, anterior, reclamo):
+        self.__aplicar(reclamo)
+
+    def reclamo_eliminado(self, reclamo):
+        with self.__lock:
+            posicion = self.__posicion(reclamo.id_reclamo)
+            if posicion is not None:
+                self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas = (
+                    np.delete(columna, posicion) for columna in
+                    (self.__ids, self.__estados, self.__departamento, self.__tiempos, self.__fechas))
@@ -0,0 +1,76 @@
+import time
+from datetime import datetime, timedelta
+from modules.repositorio_abstracto import RepositorioAbstracto
+
+# Margen con el que se vuelven a leer los reclamos modificados antes de la marca de agua: una transacción
+# puede confirmarse después de otra con un valor de actualizado posterior al suyo (se supone que ninguna
+# tarda más que esto entre que fija actualizado y se confirma)
+VENTANA_MARCA = timedelta(minutes=5)
+# Segundos entre consultas a la base para incorporar los cambios hechos por otros procesos
+VIGENCIA_MARCA = 5
+
+
+class MarcaDeAgua:
+    """
+    Sigue los cambios que se hacen en la tabla reclamos sin pasar por los observadores de este proceso
+    (otros procesos del servidor, los scripts reclasificar e importar_reclamos), para los componentes que
+    mantienen datos derivados en memoria: agregados, índice de similares y cola de urgencia.
+    Recuerda el mayor valor de la columna actualizado ya visto (la marca) y, cada vigencia segundos, devuelve
+    los reclamos con actualizado desde la marca menos VENTANA_MARCA, así que también aparecen los que se
+    confirmaron tarde. De esos solo se devuelven los que no se devolvieron ya con el mismo valor de actualizado.
+    Si la base tiene la misma cantidad de reclamos y el mismo máximo de actualizado que en la lectura anterior,
+    y esa lectura se hizo pasado VENTANA_MARCA desde la marca, no se lee ninguna fila.
+    Las bajas no dejan filas para leer: cada vez que hay cambios el componente debe comparar sus totales
+    con los de la base (RepositorioReclamosSQLAlchemy.contar_por_departamento).
+    """
+    def __init__(self, repo: RepositorioAbstracto, columnas, vigencia=VIGENCIA_MARCA):
+        """
+        Inicializa la marca; la primera llamada a cambios solo la fija en el estado actual de la base.
+        Args:
+            repo (RepositorioAbstracto): Repositorio de reclamos (debe implementar iterar_filas y obtener_huella).
+            columnas (tuple): Columnas de la tabla reclamos que se devuelven de cada reclamo modificado.
+            vigencia (float): Segundos entre consultas a la base.
+        """
+        self.__repo = repo
+        self.__columnas = tuple(columnas) + ("actualizado",)
+        self.__vigencia = vigencia
+        self.__marca = None
+        self.__cantidad = None
+        self.__leido_en = None
+        self.__consultado = None
+        self.__vistos = {}          # id_reclamo -> actualizado, de los reclamos ya devueltos dentro de la ventana
+
+    def cambios(self, forzar=False):
+        """
+        Devuelve los reclamos agregados o modificados en la base desde la llamada anterior. Puede incluir cambios
+        que los observadores ya aplicaron, así que aplicarlos tiene que ser idempotente.
+        Args:
+            forzar (bool): Si es True consulta la base aunque no haya pasado la vigencia.
+        Returns:
+            list or None: Tuplas con los valores de las columnas de cada reclamo modificado. None si no hubo
+                cambios, si todavía no pasó la vigencia o si es la primera llamada (los datos derivados que se
+                calculen a partir de ahora ya los incluyen). Una lista, aun vacía, indica que la base cambió.
+        """
+        if not forzar and self.__consultado is not None and time.monotonic() - self.__consultado < self.__vigencia:
+            return None
+        self.__consultado = time.monotonic()
+        momento = datetime.now()
+        cantidad, ultima = self.__repo.obtener_huella()
+        primera = self.__leido_en is None
+        sin_cambios = (cantidad == self.__cantidad and ultima == self.__marca
+                       and (ultima is None or self.__leido_en >= ultima + VENTANA_MARCA))
+        filas = None
+        if not primera and not sin_cambios:
+            desde = None if self.__marca is None else self.__marca - VENTANA_MARCA
+            filas = []
+            for lote in self.__repo.iterar_filas(self.__columnas, actualizados_desde=desde):
+                for fila in lote:
+                    if self.__vistos.get(fila[0]) != fila[-1]:
+                        self.__vistos[fila[0]] = fila[-1]
+                        filas.append(fila[:-1])
+            if desde is not None:
+                self.__vistos = {id_reclamo: actualizado for id_reclamo, actualizado in self.__vistos.items()
+                                 if actualizado is not None and actualizado >= desde}
+        # Se guarda la huella tomada antes de leer: si algo se confirmó en el medio, la próxima vez se vuelve a leer
+        self.__marca, self.__cantidad, self.__leido_en = ultima, cantidad, momento
+        return filas
@@ -0,0 +1,216 @@
+# Migraciones numeradas del esquema de la base de datos. Cada una se aplica una sola vez, en orden,
+# y queda registrada en la tabla schema_version. Se aplican solas al crear el engine (ver base_datos.obtener_engine).
+# Uso manual (desde la carpeta proyecto_1):
+#     python -m modules.migraciones [--url sqlite:///data/base_datos.db] [--hasta N]
+import argparse
+from datetime import datetime
+from sqlalchemy import (Column, DateTime, ForeignKey, Integer, MetaData, String, Table, create_engine, func, inspect,
+                        select, text)
+
+_metadata_versiones = MetaData()
+tabla_versiones = Table('schema_version', _metadata_versiones,
+    Column('version', Integer(), primary_key=True),
+    Column('descripcion', String(200), nullable=False),
+    Column('aplicada', DateTime, nullable=False)
+)
+
+
+# Clave del lock de PostgreSQL (pg_advisory_xact_lock) que toman los procesos que migran la base
+CLAVE_LOCK_MIGRACIONES = 20240501
+
+# Tablas tal como estaban antes de las migraciones. Quedan fijas aquí (no se toman de modules/modelos.py) para que
+# la migración 1 cree siempre el mismo esquema, aunque los modelos cambien: los cambios van en migraciones nuevas.
+_metadata_inicial = MetaData()
+Table('reclamos', _metadata_inicial,
+    Column('id_reclamo', Integer(), primary_key=True),
+    Column('id_creador', Integer(), nullable=False),
+    Column('estado', String(20), nullable=False),
+    Column('contenido', String(1000), nullable=False),
+    Column('r_imagen', String(255)),
+    Column('fecha_y_hora', DateTime, nullable=False),
+    Column('departamento', String(50)),
+    Column('tiempo_en_proceso', Integer())
+)
+Table('usuarios', _metadata_inicial,
+    Column('id', Integer(), primary_key=True, autoincrement=True),
+    Column('nombre', String(50), nullable=False),
+    Column('apellido', String(50), nullable=False),
+    Column('email', String(255), nullable=False, unique=True),
+    Column('nombre_usuario', String(30), nullable=False, unique=True),
+    Column('password', String(256), nullable=False),
+    Column('claustro', String(20)),
+    Column('rol', String(50), nullable=False)
+)
+Table('usuarios_reclamos', _metadata_inicial,
+    Column('id_usuario', Integer, ForeignKey('usuarios.id'), primary_key=True),
+    Column('id_reclamo', Integer, ForeignKey('reclamos.id_reclamo'), primary_key=True)
+)
+
+
+def _esquema_inicial(conexion):
+    '''Crea las tablas iniciales que todavía no existan (bases nuevas o creadas antes de las migraciones).'''
+    _metadata_inicial.create_all(conexion)
+
+
+# Índices de las columnas por las que filtran las consultas frecuentes:
+#  - (departamento, estado, id_reclamo): conteos y listados por departamento y estado (agregados, cola de urgencia).
+#  - (departamento, id_reclamo): paginación por cursor de los reclamos de un departamento.
+#  - (id_creador): reclamos de un usuario.
+#  - (fecha_y_hora): consultas por período.
+#  - usuarios_reclamos (id_reclamo): adherentes de un reclamo (la clave primaria empieza por id_usuario).
+INDICES_FILTROS = (
+    ("ix_reclamos_departamento_estado_id", "reclamos", ("departamento", "estado", "id_reclamo")),
+    ("ix_reclamos_departamento_id", "reclamos", ("departamento", "id_reclamo")),
+    ("ix_reclamos_id_creador", "reclamos", ("id_creador",)),
+    ("ix_reclamos_fecha_y_hora", "reclamos", ("fecha_y_hora",)),
+    ("ix_usuarios_reclamos_id_reclamo", "usuarios_reclamos", ("id_reclamo",)),
+)
+
+
+def _indices_filtros(conexion):
+    '''Crea los índices de INDICES_FILTROS (si la tabla se creó con los modelos actuales, ya existen).'''
+    for nombre, tabla, columnas in INDICES_FILTROS:
+        conexion.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({', '.join(columnas)})"))
+
+
+def _normalizar_valores(conexion):
+    '''Corrige valores viejos que antes se arreglaban con los scripts de bd_utils (departamento y rol).'''
+    conexion.execute(text("UPDATE reclamos SET departamento = 'Secretaria_Tecnica' "
+                          "WHERE departamento = 'Secretaría Técnica'"))
+    conexion.execute(text("UPDATE usuarios SET rol = 'Usuario_Final' WHERE rol = 'Usuario_final'"))
+
+
+def _latido_trabajos(conexion):
+    '''Agrega a la tabla trabajos el proceso que ejecuta cada trabajo y su último latido (ver modules/trabajos.py).'''
+    inspector = inspect(conexion)
+    if not inspector.has_table("trabajos"):
+        return
+    existentes = {columna["name"] for columna in inspector.get_columns("trabajos")}
+    if "proceso" not in existentes:
+        conexion.execute(text("ALTER TABLE trabajos ADD COLUMN proceso VARCHAR(100)"))
+    if "latido" not in existentes:
+        conexion.execute(text("ALTER TABLE trabajos ADD COLUMN latido TIMESTAMP"))
+
+
+# Tabla de trabajos en segundo plano con todas sus columnas, fija por el mismo motivo que _metadata_inicial
+_metadata_trabajos = MetaData()
+Table('trabajos', _metadata_trabajos,
+    Column('id_trabajo', String(32), primary_key=True),
+    Column('tipo', String(30), nullable=False),
+    Column('parametros', String(500), nullable=False),
+    Column('estado', String(20), nullable=False),
+    Column('id_usuario', Integer()),
+    Column('creado', DateTime, nullable=False),
+    Column('terminado', DateTime),
+    Column('error', String(500)),
+    Column('ruta_resultado', String(255)),
+    Column('mime', String(100)),
+    Column('nombre_archivo', String(255)),
+    Column('proceso', String(100)),
+    Column('latido', DateTime)
+)
+
+
+def _tabla_trabajos(conexion):
+    '''
+    Crea la tabla trabajos (ver modules/trabajos.py). En las bases donde ya la había creado ColaTrabajos no hace
+    nada: ahí la migración 4 le agregó las columnas que le faltaban, así que queda igual que en una base nueva.
+    '''
+    _metadata_trabajos.create_all(conexion)
+
+
+def _actualizado_reclamos(conexion):
+    '''
+    Agrega a reclamos el momento de su última modificación (actualizado), con un índice, para poder leer solo los
+    reclamos que cambiaron (ver modules/instantanea_reclamos.py). En los reclamos existentes es su fecha de creación.
+    '''
+    if "actualizado" not in {columna["name"] for columna in inspect(conexion).get_columns("reclamos")}:
+        conexion.execute(text("ALTER TABLE reclamos ADD COLUMN actualizado TIMESTAMP"))
+    conexion.execute(text("UPDATE reclamos SET actualizado = fecha_y_hora WHERE actualizado IS NULL"))
+    conexion.execute(text("CREATE INDEX IF NOT EXISTS ix_reclamos_actualizado ON reclamos (actualizado)"))
+
+
+# (versión, descripción, función que recibe la conexión). Las migraciones ya publicadas no se modifican:
+# para cambiar el esquema se agrega una nueva al final.
+MIGRACIONES = (
+    (1, "Esquema inicial", _esquema_inicial),
+    (2, "Índices de las columnas de filtro de reclamos y adherentes", _indices_filtros),
+    (3, "Normalizar el departamento Secretaria_Tecnica y el rol Usuario_Final", _normalizar_valores),
+    (4, "Proceso y latido de los trabajos en segundo plano", _latido_trabajos),
+    (5, "Tabla de trabajos en segundo plano", _tabla_trabajos),
+    (6, "Momento de la última modificación de cada reclamo", _actualizado_reclamos),
+)
+
+
+def version_actual(engine):
+    """
+    Devuelve la última versión del esquema aplicada en la base (0 si nunca se migró).
+    """
+    with engine.connect() as conexion:
+        return _leer_version(conexion)
+
+
+def _leer_version(conexion):
+    if not inspect(conexion).has_table(tabla_versiones.name):
+        return 0
+    return conexion.execute(select(func.max(tabla_versiones.c.version))).scalar() or 0
+
+
+def _bloquear(conexion):
+    '''
+    Empieza la transacción de la conexión tomando el lock de migraciones, que se libera al terminarla:
+    en SQLite con BEGIN IMMEDIATE (reserva la escritura de la base) y en PostgreSQL con un advisory lock.
+    '''
+    if conexion.dialect.name == "sqlite":
+        conexion.exec_driver_sql("BEGIN IMMEDIATE")
+    elif conexion.dialect.name == "postgresql":
+        conexion.execute(text("SELECT pg_advisory_xact_lock(:clave)"), {"clave": CLAVE_LOCK_MIGRACIONES})
+
+
+def migrar(engine, hasta=None, informar=None):
+    """
+    Aplica en orden las migraciones pendientes, cada una en su propia transacción.
+    Varios procesos pueden migrar la misma base a la vez (por ejemplo, al arrancar varios servidores): cada
+    migración se aplica con el lock de migraciones tomado y después de volver a leer la versión, así que
+    solo la aplica uno de ellos y los demás la saltean.
+    Args:
+        engine (Engine): Engine de la base a migrar.
+        hasta (int): Última versión a aplicar (por defecto, todas).
+        informar (callable): Función que recibe los mensajes de progreso (por defecto no se informa nada).
+    Returns:
+        list: Versiones aplicadas por esta llamada.
+    """
+    pendientes = [(version, descripcion, funcion) for version, descripcion, funcion in MIGRACIONES
+                  if hasta is None or version <= hasta]
+    # Sin nada pendiente no hace falta tomar el lock
+    if not pendientes or version_actual(engine) >= pendientes[-1][0]:
+        return []
+    aplicadas = []
+    for version, descripcion, funcion in pendientes:
+        with engine.connect() as conexion:
+            _bloquear(conexion)
+            tabla_versiones.create(conexion, checkfirst=True)
+            if _leer_version(conexion) >= version:
+                conexion.rollback()
+                continue
+            funcion(conexion)
+            conexion.execute(tabla_versiones.insert().values(version=version, descripcion=descripcion,
+                                                             aplicada=datetime.now()))
+            conexion.commit()
+        aplicadas.append(version)
+        if informar is not None:
+            informar(f"Migración {version} aplicada: {descripcion}")
+    return aplicadas
+
+
+if __name__ == "__main__":
+    from modules.base_datos import URL_BD
+
+    parser = argparse.ArgumentParser(description="Aplica las migraciones pendientes del esquema.")
+    parser.add_argument("--url", default=URL_BD, help=f"URL de la base de datos (por defecto {URL_BD})")
+    parser.add_argument("--hasta", type=int, default=None, help="Última versión a aplicar (por defecto, todas)")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    aplicadas = migrar(engine, args.hasta, informar=print)
+    print(f"Esquema en la versión {version_actual(engine)} ({len(aplicadas)} migraciones aplicadas).")
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, DateTime, Index
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -8,12 +9,21 @@ Base = declarative_base()
 
 asociacion_usuarios_reclamos = Table('usuarios_reclamos', Base.metadata,
     Column('id_usuario', Integer, ForeignKey('usuarios.id'), primary_key=True),
-    Column('id_reclamo', Integer, ForeignKey('reclamos.id_reclamo'), primary_key=True)
+    Column('id_reclamo', Integer, ForeignKey('reclamos.id_reclamo'), primary_key=True),
+    Index('ix_usuarios_reclamos_id_reclamo', 'id_reclamo')
 )
 
 class ModeloReclamo(Base):
     """Modelo que representa un reclamo en la base de datos."""
     __tablename__ = 'reclamos'
+    # Los mismos índices que crean las migraciones 2 y 6 (modules/migraciones.py) en las bases ya existentes
+    __table_args__ = (
+        Index('ix_reclamos_departamento_estado_id', 'departamento', 'estado', 'id_reclamo'),
+        Index('ix_reclamos_departamento_id', 'departamento', 'id_reclamo'),
+        Index('ix_reclamos_id_creador', 'id_creador'),
+        Index('ix_reclamos_fecha_y_hora', 'fecha_y_hora'),
+        Index('ix_reclamos_actualizado', 'actualizado'),
+    )
     id_reclamo = Column(Integer(), primary_key=True)
     id_creador = Column(Integer(), nullable=False)
     estado = Column(String(20), nullable=False)
@@ -22,6 +32,9 @@ class ModeloReclamo(Base):
     fecha_y_hora = Column(DateTime, nullable=False, default=func.now())
     departamento = Column(String(50))
     tiempo_en_proceso = Column(Integer())
+    # Momento del alta o de la última modificación (también en las escrituras masivas con update()); las escrituras
+    # con SQL directo tienen que actualizarlo a mano para que los lectores por marca de agua vean el cambio
+    actualizado = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 class ModeloUsuario(Base):
     """Modelo que representa un usuario en la base de datos."""
@@ -38,4 +51,22 @@ class ModeloUsuario(Base):
 
 
 
-    reclamos_adheridos = relationship('ModeloReclamo', secondary=asociacion_usuarios_reclamos, backref= 'usuarios_adherentes')
\ No newline at end of file
+    reclamos_adheridos = relationship('ModeloReclamo', secondary=asociacion_usuarios_reclamos, backref= 'usuarios_adherentes')
+
+
+class ModeloTrabajo(Base):
+    """Modelo que representa un trabajo en segundo plano (ver modules/trabajos.py). La tabla la crea la migración 5."""
+    __tablename__ = 'trabajos'
+    id_trabajo = Column(String(32), primary_key=True)
+    tipo = Column(String(30), nullable=False)
+    parametros = Column(String(500), nullable=False)
+    estado = Column(String(20), nullable=False)
+    id_usuario = Column(Integer())
+    creado = Column(DateTime, nullable=False)
+    terminado = Column(DateTime)
+    error = Column(String(500))
+    ruta_resultado = Column(String(255))
+    mime = Column(String(100))
+    nombre_archivo = Column(String(255))
+    proceso = Column(String(100))
+    latido = Column(DateTime)
@@ -1,109 +1,242 @@
-class MonticuloMediana:
+import operator
+from collections import Counter
+
+
+class MonticuloPercentil:
+    """
+    Clase que mantiene un percentil (por ejemplo p50, p90 o p99) de una colección de numeros que cambia con el tiempo.
+    Utiliza dos monticulos binarios: uno de maximo con los valores menores o iguales al percentil y otro de minimo con el resto.
+    Agregar, eliminar o actualizar un valor cuesta O(log n); las eliminaciones son diferidas: el valor se anota en un contador
+    y se descarta recién cuando llega a la raíz de su monticulo.
+    El percentil se calcula como numpy.percentile (interpolación lineal entre los dos valores vecinos).
+    """
+    def __init__(self, percentil=50):
+        '''Inicializa los monticulos vacios. El percentil debe estar entre 0 y 100 y el valor se inicializa como None.'''
+        if not isinstance(percentil, (int, float)) or not 0 <= percentil <= 100:
+            raise ValueError("El percentil debe ser un número entre 0 y 100")
+        self.__percentil = percentil
+        self.__valor = None
+        self.__inferior = MonticuloBinario("max")
+        self.__superior = MonticuloBinario("min")
+        self.__tamano_inferior = 0
+        self.__tamano_superior = 0
+        self.__borrados_inferior = Counter()
+        self.__borrados_superior = Counter()
+        self.__cantidades = Counter()
+
+    @property
+    def percentil(self):
+        """Devuelve el percentil que mantiene el montículo."""
+        return self.__percentil
+
+    @property
+    def valor(self):
+        """Devuelve el valor actual del percentil, o None si no hay valores."""
+        return self.__valor
+
+    @property
+    def monticulo_inferior(self):
+        """Devuelve el montículo de maximo con los valores menores o iguales al percentil."""
+        return self.__inferior
+
+    @property
+    def monticulo_superior(self):
+        """Devuelve el montículo de minimo con los valores mayores o iguales al percentil."""
+        return self.__superior
+
+    def construir_monticulo(self, p_lista):
+        """Agrega todos los valores de una lista de numeros."""
+        for n in p_lista:
+            self.agregar_valor(n)
+
+    def agregar_valor(self, p_valor):
+        """Agrega un valor y actualiza el percentil."""
+        if not isinstance(p_valor, (int, float)):
+            raise TypeError("El valor a agregar debe ser un número entero o decimal")
+        if self.__tamano_inferior == 0 or p_valor <= self.__inferior.listaMonticulo[1]:
+            self.__inferior.insertar(p_valor)
+            self.__tamano_inferior += 1
+        else:
+            self.__superior.insertar(p_valor)
+            self.__tamano_superior += 1
+        self.__cantidades[p_valor] += 1
+        self.__rebalancear()
+
+    def eliminar_valor(self, p_valor):
+        """
+        Elimina una aparición del valor y actualiza el percentil.
+        Lanza ValueError si el valor no está en el montículo.
+        """
+        if self.__cantidades[p_valor] <= 0:
+            raise ValueError(f"El valor {p_valor} no está en el montículo")
+        self.__cantidades[p_valor] -= 1
+        if self.__cantidades[p_valor] == 0:
+            del self.__cantidades[p_valor]
+        # Todos los valores vigentes del inferior son <= a los del superior, así que alcanza con mirar la raíz
+        if self.__tamano_inferior > 0 and p_valor <= self.__inferior.listaMonticulo[1]:
+            self.__borrados_inferior[p_valor] += 1
+            self.__tamano_inferior -= 1
+        else:
+            self.__borrados_superior[p_valor] += 1
+            self.__tamano_superior -= 1
+        self.__podar()
+        self.__rebalancear()
+
+    def actualizar_valor(self, p_anterior, p_nuevo):
+        """Reemplaza una aparición de p_anterior por p_nuevo (por ejemplo, cuando cambia el tiempo de un reclamo)."""
+        if not isinstance(p_nuevo, (int, float)):
+            raise TypeError("El valor a agregar debe ser un número entero o decimal")
+        self.eliminar_valor(p_anterior)
+        self.agregar_valor(p_nuevo)
+
+    def __podar(self):
+        '''Descarta de las raíces los valores que ya fueron eliminados.'''
+        while self.__inferior.tamanoActual > 0 and self.__borrados_inferior[self.__inferior.listaMonticulo[1]] > 0:
+            self.__borrados_inferior[self.__inferior.eliminar()] -= 1
+        while self.__superior.tamanoActual > 0 and self.__borrados_superior[self.__superior.listaMonticulo[1]] > 0:
+            self.__borrados_superior[self.__superior.eliminar()] -= 1
+        self.__borrados_inferior = +self.__borrados_inferior
+        self.__borrados_superior = +self.__borrados_superior
+
+    def __posicion(self):
+        '''Devuelve la posición (entera, fracción) del percentil dentro de los valores ordenados.'''
+        posicion, resto = divmod(self.__percentil * (self.devolver_tamaño() - 1), 100)
+        return int(posicion), resto / 100
+
+    def __rebalancear(self):
+        '''Mueve valores entre los monticulos para que el inferior tenga exactamente los valores hasta la posición del percentil.'''
+        objetivo = self.__posicion()[0] + 1 if self.devolver_tamaño() > 0 else 0
+        while self.__tamano_inferior > objetivo:
+            self.__superior.insertar(self.__inferior.eliminar())
+            self.__tamano_inferior -= 1
+            self.__tamano_superior += 1
+            self.__podar()
+        while self.__tamano_inferior < objetivo:
+            self.__inferior.insertar(self.__superior.eliminar())
+            self.__tamano_inferior += 1
+            self.__tamano_superior -= 1
+            self.__podar()
+        self.__definir_valor()
+
+    def __definir_valor(self):
+        '''Define el percentil a partir de las raíces de los monticulos.'''
+        if self.devolver_tamaño() == 0:
+            self.__valor = None
+            return
+        abajo = self.__inferior.listaMonticulo[1]
+        fraccion = self.__posicion()[1]
+        if fraccion == 0:
+            self.__valor = abajo
+        else:
+            arriba = self.__superior.listaMonticulo[1]
+            self.__valor = abajo + (arriba - abajo) * fraccion
+
+    def devolver_tamaño(self):
+        """Devuelve la cantidad de valores vigentes (sin contar los eliminados que todavía no se descartaron)."""
+        return self.__tamano_inferior + self.__tamano_superior
+
+    def __contains__(self, p_valor):
+        return self.__cantidades[p_valor] > 0
+
+
+class MonticuloMediana(MonticuloPercentil):
     """
     Clase que implementa un monticulo de mediana, el cual permite calcular la mediana de una lista de numeros.
-    Utiliza dos monticulos binarios, uno para los valores menores o iguales a la mediana y otro para los valores mayores a la mediana."""
+    Utiliza dos monticulos binarios, uno para los valores menores o iguales a la mediana y otro para los valores mayores a la mediana.
+    Es un MonticuloPercentil con percentil 50, por lo que también permite eliminar y actualizar valores."""
     def __init__(self):
         '''Inicializa el monticulo de mediana con dos monticulos binarios, uno para los valores menores o iguales a la mediana y otro para los valores mayores a la mediana.
         La mediana se inicializa como None.'''
-        self.__mediana = None
-        self.__monticulo_min = MonticuloBinario("min")
-        self.__monticulo_max = MonticuloBinario("max")
+        super().__init__(50)
 
     @property
     def mediana(self):
         """Devuelve la mediana actual del montículo."""
-        return self.__mediana
-    
+        return self.valor
+
     @property
     def monticulo_min(self):
         """Devuelve el montículo de valores mayores o iguales a la mediana."""
-        return self.__monticulo_min
-    
+        return self.monticulo_superior
+
     @property
     def monticulo_max(self):
         """Devuelve el montículo de valores menores o iguales a la mediana."""
-        return self.__monticulo_max
-    
-    def construir_monticulo(self,p_lista):
-        """Construye el monticulo de mediana a partir de una lista de numeros enteros positivos.
-        Si la lista está vacía, la mediana se establece como None."""
-        if len(p_lista) > 0:
-            for n in p_lista:
-                self.agregar_valor(n)
-                self.__definir_mediana()
-        else:
-            self.__mediana = None
-            
-    def agregar_valor(self,p_valor):
-        """Agrega un valor al monticulo de mediana y actualiza la mediana."""
-        if not isinstance(p_valor,(int,float)):
-            raise TypeError("El valor a agregar debe ser un número entero o decimal")
-        if self.__mediana == None:
-            self.__monticulo_min.insertar(p_valor)
-        elif p_valor >= self.__mediana:
-            if self.__monticulo_min.tamanoActual - self.__monticulo_max.tamanoActual <= 0:
-                self.__monticulo_min.insertar(p_valor)
-            else: #Reequilibrar el monticulo
-                temp = self.__monticulo_min.listaMonticulo[1]
-                self.__monticulo_min.eliminar()
-                self.__monticulo_max.insertar(temp)  
-                self.__monticulo_min.insertar(p_valor)
-        else:
-            if self.__monticulo_max.tamanoActual - self.__monticulo_min.tamanoActual <= 0:
-                self.__monticulo_max.insertar(p_valor)
-            else: #Reequilibrar el monticulo
-                temp = self.__monticulo_max.listaMonticulo[1]
-                self.__monticulo_max.eliminar()
-                self.__monticulo_min.insertar(temp)
-                self.__monticulo_max.insertar(p_valor)
-
-    def __definir_mediana(self):
-        """Define la mediana del monticulo de mediana en base a los monticulos maximo y minimo.""" 
-        if len(self.__monticulo_max.listaMonticulo) > len(self.__monticulo_min.listaMonticulo):
-            self.__mediana = self.__monticulo_max.listaMonticulo[1]
-        elif len(self.__monticulo_max.listaMonticulo) == len(self.__monticulo_min.listaMonticulo):
-            self.__mediana = (self.__monticulo_max.listaMonticulo[1] + self.__monticulo_min.listaMonticulo[1]) / 2
-        else:
-            self.__mediana = self.__monticulo_min.listaMonticulo[1] 
-   
+        return self.monticulo_inferior
+
+
+class PercentilesMoviles:
+    """
+    Mantiene varios percentiles (por ejemplo 50, 90 y 99) de la misma colección de numeros,
+    con un MonticuloPercentil por cada uno. Cada operación cuesta O(k log n) para k percentiles.
+    """
+    def __init__(self, percentiles=(50, 90, 99)):
+        '''Inicializa un MonticuloPercentil por cada percentil pedido.'''
+        self.__monticulos = {p: MonticuloPercentil(p) for p in percentiles}
+
+    def percentil(self, p):
+        """Devuelve el valor del percentil p, o None si no hay valores. Lanza KeyError si p no se está siguiendo."""
+        return self.__monticulos[p].valor
+
+    def agregar_valor(self, p_valor):
+        """Agrega un valor a todos los percentiles."""
+        for monticulo in self.__monticulos.values():
+            monticulo.agregar_valor(p_valor)
+
+    def eliminar_valor(self, p_valor):
+        """Elimina una aparición del valor de todos los percentiles. Lanza ValueError si no está."""
+        for monticulo in self.__monticulos.values():
+            monticulo.eliminar_valor(p_valor)
+
+    def actualizar_valor(self, p_anterior, p_nuevo):
+        """Reemplaza una aparición de p_anterior por p_nuevo en todos los percentiles."""
+        self.eliminar_valor(p_anterior)
+        self.agregar_valor(p_nuevo)
+
     def devolver_tamaño(self):
-        """Devuelve el tamaño total del monticulo de mediana, que es la suma de los tamaños de los monticulos maximo y minimo.""" 
-        return (self.__monticulo_min.tamanoActual + self.__monticulo_max.tamanoActual)
-    
+        """Devuelve la cantidad de valores vigentes."""
+        return next(iter(self.__monticulos.values())).devolver_tamaño() if self.__monticulos else 0
+
 
 class MonticuloBinario:
     """Clase que implementa un monticulo binario, el cual puede ser de tipo minimo o maximo.
     Permite insertar eliminar valores, y construir un monticulo a partir de una lista de numeros enteros positivos.
-    El monticulo se representa como una lista, donde el primer elemento es un 0 para facilitar el manejo de índices."""    
-    def __init__(self, p_tipo):
+    El monticulo se representa como una lista, donde el primer elemento es un 0 para facilitar el manejo de índices.
+    Opcionalmente recibe una función clave (como sorted o heapq.nsmallest) para ordenar valores que no son números;
+    el tipo elige si la raíz es el valor de clave mínima o máxima.
+    Los métodos push, pop, peek, pushpop, replace y heapify son alias de los métodos en castellano, con la misma
+    semántica que las funciones del módulo heapq."""
+    def __init__(self, p_tipo="min", clave=None):
         self.listaMonticulo = [0]
         self.tamanoActual = 0
-        self.esMin = True
-        if p_tipo != "min":
-           self.esMin = False
-    
-    
+        self.esMin = p_tipo == "min"
+        self.clave = clave
+        # __antes(a, b) indica si a debe quedar más cerca de la raíz que b; se elige una sola vez
+        # para no preguntar por el tipo del monticulo en cada comparación
+        operador = operator.lt if self.esMin else operator.gt
+        if clave is None:
+            self.__antes = operador
+        else:
+            self.__antes = lambda a, b: operador(clave(a), clave(b))
+
+    def __len__(self):
+        return self.tamanoActual
 
     def infiltArriba(self,i):
         """Infiltro un elemento hacia arriba en el monticulo, para mantener la propiedad del monticulo.
-        El elemento se infiltro desde la posición i hasta la raíz del monticulo."""
-        #Monticulo de minimo
-        if self.esMin == True:
-            while i // 2 > 0:
-                if self.listaMonticulo[i] < self.listaMonticulo[i // 2]:
-                    tmp = self.listaMonticulo[i // 2]
-                    self.listaMonticulo[i // 2] = self.listaMonticulo[i]
-                    self.listaMonticulo[i] = tmp
-                i = i // 2
-        #Monticulo de maximo
-        else:
-            while i // 2 > 0:
-                if self.listaMonticulo[i] > self.listaMonticulo[i // 2]:
-                    tmp = self.listaMonticulo[i // 2]
-                    self.listaMonticulo[i // 2] = self.listaMonticulo[i]
-                    self.listaMonticulo[i] = tmp
-                i = i // 2
-                
+        El elemento se infiltro desde la posición i hasta la raíz del monticulo.
+        En lugar de intercambiar en cada nivel, se bajan los ancestros y el elemento se escribe una sola vez."""
+        lista = self.listaMonticulo
+        antes = self.__antes
+        valor = lista[i]
+        while i > 1:
+            padre = i >> 1
+            if not antes(valor, lista[padre]):
+                break
+            lista[i] = lista[padre]
+            i = padre
+        lista[i] = valor
+
     def insertar(self,k):
         """Inserta un valor en el montiuclo y lo infiltro hacia arriba para mantener la propiedad del monticulo.
         El valor se agrega al final de la lista y luego se infiltro hacia arriba desde la última posición."""
@@ -113,70 +246,192 @@ class MonticuloBinario:
 
     def infiltAbajo(self,i):
         '''Infiltro un elemento hacia abajo en el monticulo, para mantener la propiedad del monticulo.
-        El elemento se infiltro desde la posición i hasta las hojas del monticulo.'''  
-        #Monticulo de minimo
-        if self.esMin == True:
-            while (i * 2) <= self.tamanoActual:
-                hm = self.hijo(i)
-                if self.listaMonticulo[i] > self.listaMonticulo[hm]:
-                    tmp = self.listaMonticulo[i]
-                    self.listaMonticulo[i] = self.listaMonticulo[hm]
-                    self.listaMonticulo[hm] = tmp
-                i = hm
-        #Monticulo de maximos
-            else:
-                while (i * 2) <= self.tamanoActual:
-                    hm = self.hijo(i)
-                    if self.listaMonticulo[i] < self.listaMonticulo[hm]:
-                        tmp = self.listaMonticulo[i]
-                        self.listaMonticulo[i] = self.listaMonticulo[hm]
-                        self.listaMonticulo[hm] = tmp
-                    i = hm
-                
+        El elemento se infiltro desde la posición i hasta las hojas del monticulo.'''
+        lista = self.listaMonticulo
+        antes = self.__antes
+        tamano = self.tamanoActual
+        valor = lista[i]
+        hm = i * 2
+        while hm <= tamano:
+            if hm < tamano and antes(lista[hm + 1], lista[hm]):
+                hm = hm + 1
+            if not antes(lista[hm], valor):
+                break
+            lista[i] = lista[hm]
+            i = hm
+            hm = i * 2
+        lista[i] = valor
+
     def hijo(self,i):
         """
         Define cual de los hijos va a ser intercambiado por el ancestro
         """
-        #Hijo minimo
-        if self.esMin == True:
-            if i * 2 + 1 > self.tamanoActual:
-                return i * 2
-            else:
-                if self.listaMonticulo[i*2] < self.listaMonticulo[i*2+1]:
-                    return i * 2
-                else:
-                    return i * 2 + 1
-        #Hijo maximo
-        else:
-            if i * 2 + 1 > self.tamanoActual:
-                return i * 2
-            else:
-                if self.listaMonticulo[i*2] > self.listaMonticulo[i*2+1]:
-                    return i * 2
-                else:
-                    return i * 2 + 1
+        if i * 2 + 1 > self.tamanoActual or self.__antes(self.listaMonticulo[i*2], self.listaMonticulo[i*2+1]):
+            return i * 2
+        return i * 2 + 1
+
+    def tope(self):
+        '''Devuelve el valor de la raíz sin sacarlo. Lanza IndexError si el monticulo está vacío.'''
+        if self.tamanoActual == 0:
+            raise IndexError("El montículo está vacío")
+        return self.listaMonticulo[1]
+
     def eliminar(self):
         '''Elimina el valor de la raíz del monticulo y lo infiltro hacia abajo para mantener la propiedad del monticulo.
         El valor eliminado es el primer elemento de la lista, que es la raíz del monticulo.
-        Se reemplaza la raíz por el último elemento del monticulo y se infiltro hacia abajo desde la raíz.'''
-        valorSacado = self.listaMonticulo[1]
-        self.listaMonticulo[1] = self.listaMonticulo[self.tamanoActual]
+        Se reemplaza la raíz por el último elemento del monticulo y se infiltro hacia abajo desde la raíz.
+        Lanza IndexError si el monticulo está vacío.'''
+        if self.tamanoActual == 0:
+            raise IndexError("El montículo está vacío")
+        ultimo = self.listaMonticulo.pop()
         self.tamanoActual = self.tamanoActual - 1
-        self.listaMonticulo.pop()
+        if self.tamanoActual == 0:
+            return ultimo
+        valorSacado = self.listaMonticulo[1]
+        self.listaMonticulo[1] = ultimo
+        self.infiltAbajo(1)
+        return valorSacado
+
+    def insertar_y_eliminar(self, k):
+        '''Inserta k y luego saca la raíz, en una sola infiltración (equivale a heapq.heappushpop).
+        Si k va antes que la raíz, se devuelve k directamente sin tocar el monticulo.'''
+        if self.tamanoActual == 0 or not self.__antes(self.listaMonticulo[1], k):
+            return k
+        valorSacado = self.listaMonticulo[1]
+        self.listaMonticulo[1] = k
+        self.infiltAbajo(1)
+        return valorSacado
+
+    def reemplazar(self, k):
+        '''Saca la raíz y luego inserta k, en una sola infiltración (equivale a heapq.heapreplace).
+        Lanza IndexError si el monticulo está vacío.'''
+        valorSacado = self.tope()
+        self.listaMonticulo[1] = k
         self.infiltAbajo(1)
         return valorSacado
 
     def construirMonticulo(self,unaLista):
         '''Construye el monticulo a partir de una lista de numeros enteros positivos.
         La lista se copia a la lista del monticulo, y luego se infiltro hacia abajo desde la mitad de la lista hasta la raíz.
-        Esto asegura que todos los elementos del monticulo cumplan con la propiedad del monticulo.'''
+        Esto asegura que todos los elementos del monticulo cumplan con la propiedad del monticulo, en O(n).'''
         i = len(unaLista) // 2
         self.tamanoActual = len(unaLista)
-        self.listaMonticulo = [0] + unaLista[:]
+        self.listaMonticulo = [0] + list(unaLista)
         while (i > 0):
             self.infiltAbajo(i)
             i = i - 1
 
+    push = insertar
+    pop = eliminar
+    peek = tope
+    pushpop = insertar_y_eliminar
+    replace = reemplazar
+    heapify = construirMonticulo
+
+
+class MonticuloIndexado:
+    """
+    Clase que implementa un monticulo binario de maximo en el que cada elemento se identifica por una clave
+    (por ejemplo, el id de un reclamo) y tiene una prioridad numérica.
+    Además de la lista del monticulo guarda la posición de cada clave, lo que permite cambiar la prioridad
+    de un elemento o quitarlo en O(log n) sin recorrer la lista.
+    Igual que MonticuloBinario, la lista tiene un 0 en la primera posición para facilitar el manejo de índices.
+    """
+    def __init__(self):
+        self.listaMonticulo = [0]       # tuplas (prioridad, clave)
+        self.tamanoActual = 0
+        self.__posiciones = {}          # clave -> posición en listaMonticulo
+
+    def __len__(self):
+        return self.tamanoActual
+
+    def __contains__(self, clave):
+        return clave in self.__posiciones
+
+    def prioridad(self, clave):
+        """Devuelve la prioridad de la clave. Lanza KeyError si no está en el monticulo."""
+        return self.listaMonticulo[self.__posiciones[clave]][0]
+
+    def __intercambiar(self, i, j):
+        self.listaMonticulo[i], self.listaMonticulo[j] = self.listaMonticulo[j], self.listaMonticulo[i]
+        self.__posiciones[self.listaMonticulo[i][1]] = i
+        self.__posiciones[self.listaMonticulo[j][1]] = j
+
+    def __infiltArriba(self, i):
+        while i // 2 > 0 and self.listaMonticulo[i] > self.listaMonticulo[i // 2]:
+            self.__intercambiar(i, i // 2)
+            i = i // 2
+
+    def __infiltAbajo(self, i):
+        while i * 2 <= self.tamanoActual:
+            hm = i * 2
+            if hm + 1 <= self.tamanoActual and self.listaMonticulo[hm + 1] > self.listaMonticulo[hm]:
+                hm = hm + 1
+            if self.listaMonticulo[i] >= self.listaMonticulo[hm]:
+                break
+            self.__intercambiar(i, hm)
+            i = hm
+
+    def insertar(self, clave, prioridad):
+        """Inserta una clave con su prioridad. Si la clave ya estaba, se actualiza su prioridad."""
+        if clave in self.__posiciones:
+            self.cambiar_prioridad(clave, prioridad)
+            return
+        self.listaMonticulo.append((prioridad, clave))
+        self.tamanoActual = self.tamanoActual + 1
+        self.__posiciones[clave] = self.tamanoActual
+        self.__infiltArriba(self.tamanoActual)
+
+    def cambiar_prioridad(self, clave, prioridad):
+        """
+        Cambia la prioridad de una clave que ya está en el monticulo y la reubica, hacia arriba o hacia abajo.
+        Lanza KeyError si la clave no está en el monticulo.
+        """
+        i = self.__posiciones[clave]
+        anterior = self.listaMonticulo[i]
+        self.listaMonticulo[i] = (prioridad, clave)
+        if self.listaMonticulo[i] > anterior:
+            self.__infiltArriba(i)
+        else:
+            self.__infiltAbajo(i)
+
+    def quitar(self, clave):
+        """Quita una clave del monticulo y devuelve su prioridad. Lanza KeyError si la clave no está."""
+        i = self.__posiciones[clave]
+        prioridad = self.listaMonticulo[i][0]
+        self.__intercambiar(i, self.tamanoActual)
+        self.listaMonticulo.pop()
+        self.tamanoActual = self.tamanoActual - 1
+        del self.__posiciones[clave]
+        if i <= self.tamanoActual:
+            self.__infiltArriba(i)
+            self.__infiltAbajo(i)
+        return prioridad
+
+    def eliminar(self):
+        """Quita y devuelve la tupla (prioridad, clave) de mayor prioridad."""
+        prioridad, clave = self.listaMonticulo[1]
+        self.quitar(clave)
+        return prioridad, clave
+
+    def primeros(self, k):
+        """
+        Devuelve las k tuplas (prioridad, clave) de mayor prioridad, ordenadas de mayor a menor, sin modificar el monticulo.
+        Recorre el monticulo desde la raíz con un monticulo auxiliar de candidatos, por lo que cuesta O(k log k).
+        """
+        resultado = []
+        if self.tamanoActual == 0 or k <= 0:
+            return resultado
+        candidatos = MonticuloBinario("max")
+        candidatos.insertar((self.listaMonticulo[1], 1))
+        while candidatos.tamanoActual > 0 and len(resultado) < k:
+            elemento, i = candidatos.eliminar()
+            resultado.append(elemento)
+            for hijo in (i * 2, i * 2 + 1):
+                if hijo <= self.tamanoActual:
+                    candidatos.insertar((self.listaMonticulo[hijo], hijo))
+        return resultado
+
 
 if __name__ == "__main__":
     # lista = [1,7,4,8,1,7,5,9]
@@ -0,0 +1,55 @@
+from abc import ABC
+
+
+class ObservadorReclamos(ABC):
+    """
+    Clase base para los componentes que necesitan enterarse de los cambios en los reclamos
+    (índices de búsqueda, agregados para analítica, etc.).
+    GestorDeReclamos notifica a sus observadores cada vez que agrega, modifica o elimina un reclamo,
+    y GestorDeUsuarios cada vez que un usuario se adhiere a un reclamo.
+    Los métodos no hacen nada por defecto, cada subclase redefine solo los que necesita.
+    """
+
+    def reclamo_agregado(self, reclamo):
+        """
+        Se llama luego de guardar un reclamo nuevo.
+        Parámetros
+        ----------
+        reclamo : Reclamo
+            Reclamo recién guardado, ya con su id_reclamo asignado.
+        """
+        pass
+
+    def reclamo_modificado(self, anterior, reclamo):
+        """
+        Se llama luego de modificar un reclamo existente.
+        Parámetros
+        ----------
+        anterior : Reclamo
+            Reclamo tal como estaba antes de la modificación.
+        reclamo : Reclamo
+            Reclamo con los valores nuevos.
+        """
+        pass
+
+    def reclamo_eliminado(self, reclamo):
+        """
+        Se llama luego de eliminar un reclamo.
+        Parámetros
+        ----------
+        reclamo : Reclamo
+            Reclamo tal como estaba antes de ser eliminado.
+        """
+        pass
+
+    def adherente_agregado(self, id_usuario, id_reclamo):
+        """
+        Se llama luego de que un usuario se adhiere a un reclamo (lo notifica GestorDeUsuarios).
+        Parámetros
+        ----------
+        id_usuario : int
+            Usuario que se adhirió.
+        id_reclamo : int
+            Reclamo al que se adhirió.
+        """
+        pass
@@ -0,0 +1,125 @@
+# Reclasifica todos los reclamos existentes con el modelo actual (por ejemplo, luego de reentrenar claims_clf.pkl).
+# Uso (desde la carpeta proyecto_1):
+#     python -m modules.reclasificar [--lote 1000] [--procesos 4] [--simulacion]
+# Los cambios se aplican con GestorDeReclamos.cambiar_departamentos. Un servidor que ya esté corriendo es otro
+# proceso: sus estadísticas e índices en memoria no se enteran y se recalculan recién al reiniciarlo.
+import argparse
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from modules.clasificador import Clasificador, RUTA_MODELO
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.utils import normalizar_nombre_departamento
+
+# Clasificador propio de cada proceso del pool (se carga una sola vez por proceso)
+_clasificador_proceso = None
+
+
+def _inicializar_proceso(ruta_modelo):
+    '''Carga el modelo en un proceso del pool.'''
+    global _clasificador_proceso
+    _clasificador_proceso = Clasificador(ruta_modelo)
+
+
+def _clasificar_en_proceso(textos):
+    '''Clasifica un lote de textos dentro de un proceso del pool.'''
+    return list(_clasificador_proceso.clasificar(textos))
+
+
+def _cambios_del_lote(lote, etiquetas):
+    """
+    Compara el departamento actual de cada reclamo del lote con el predicho.
+    :return: Tupla (cambios, no_reconocidos) donde cambios es {id_reclamo: nuevo_departamento}.
+    """
+    cambios = {}
+    no_reconocidos = 0
+    for (id_reclamo, _, departamento_actual), etiqueta in zip(lote, etiquetas):
+        departamento = normalizar_nombre_departamento(etiqueta)
+        if departamento is None:
+            no_reconocidos += 1
+        elif departamento != departamento_actual:
+            cambios[id_reclamo] = departamento
+    return cambios, no_reconocidos
+
+
+def reclasificar_reclamos(repo, clasificador=None, tamano_lote=1000, procesos=1, ruta_modelo=RUTA_MODELO,
+                          aplicar=True, informar=print, gestor=None):
+    """
+    Reclasifica todos los reclamos del repositorio y actualiza el departamento de los que cambiaron.
+    Los reclamos se leen por lotes (nunca se cargan todos en memoria) y cada lote se clasifica en una sola llamada.
+    Con procesos > 1 los lotes se clasifican en paralelo en un pool de procesos, manteniendo como máximo
+    dos lotes pendientes por proceso para que la memoria no crezca con el tamaño de la tabla.
+    Args:
+        repo (RepositorioReclamosSQLAlchemy): Repositorio de reclamos.
+        clasificador (Clasificador): Clasificador a usar cuando procesos == 1 (por defecto se carga ruta_modelo).
+        tamano_lote (int): Cantidad de reclamos por lote.
+        procesos (int): Cantidad de procesos para clasificar.
+        ruta_modelo (str): Ruta del modelo que cargan los procesos del pool.
+        aplicar (bool): Si es False solo se informa cuántos reclamos cambiarían (simulación).
+        informar (callable): Función que recibe los mensajes de progreso.
+        gestor (GestorDeReclamos): Gestor por el que se aplican los cambios, para que se enteren sus observadores
+            (por defecto, un gestor del mismo repositorio sin observadores).
+    Returns:
+        dict: Resumen con las claves "procesados", "cambiados", "no_reconocidos" y "segundos".
+    """
+    if not isinstance(tamano_lote, int) or tamano_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser un entero positivo")
+    if not isinstance(procesos, int) or procesos <= 0:
+        raise ValueError("La cantidad de procesos debe ser un entero positivo")
+
+    if gestor is None:
+        gestor = GestorDeReclamos(repo)
+
+    resumen = {"procesados": 0, "cambiados": 0, "no_reconocidos": 0, "segundos": 0.0}
+    inicio = time.perf_counter()
+
+    def registrar(lote, etiquetas):
+        cambios, no_reconocidos = _cambios_del_lote(lote, etiquetas)
+        if aplicar:
+            gestor.cambiar_departamentos(cambios)
+        resumen["procesados"] += len(lote)
+        resumen["cambiados"] += len(cambios)
+        resumen["no_reconocidos"] += no_reconocidos
+        segundos = time.perf_counter() - inicio
+        informar(f"{resumen['procesados']} reclamos procesados, {resumen['cambiados']} con cambio de departamento "
+                 f"({resumen['procesados'] / segundos:.0f} reclamos/s)")
+
+    lotes = repo.iterar_contenidos(tamano_lote)
+    if procesos == 1:
+        if clasificador is None:
+            clasificador = Clasificador(ruta_modelo)
+        for lote in lotes:
+            registrar(lote, clasificador.clasificar([contenido for _, contenido, _ in lote]))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso, initargs=(ruta_modelo,)) as pool:
+            pendientes = deque()
+            for lote in lotes:
+                pendientes.append((lote, pool.submit(_clasificar_en_proceso, [contenido for _, contenido, _ in lote])))
+                if len(pendientes) >= procesos * 2:
+                    lote_listo, futuro = pendientes.popleft()
+                    registrar(lote_listo, futuro.result())
+            while pendientes:
+                lote_listo, futuro = pendientes.popleft()
+                registrar(lote_listo, futuro.result())
+
+    resumen["segundos"] = time.perf_counter() - inicio
+    return resumen
+
+
+if __name__ == "__main__":
+    from modules.factoria import crear_repositorio
+    from modules.setup_nltk import prechequeo_nltk
+
+    parser = argparse.ArgumentParser(description="Reclasifica todos los reclamos con el modelo actual.")
+    parser.add_argument("--lote", type=int, default=1000, help="Cantidad de reclamos por lote (por defecto 1000)")
+    parser.add_argument("--procesos", type=int, default=1, help="Cantidad de procesos para clasificar (por defecto 1)")
+    parser.add_argument("--modelo", default=RUTA_MODELO, help="Ruta del modelo entrenado")
+    parser.add_argument("--simulacion", action="store_true", help="No guarda cambios, solo informa cuántos habría")
+    args = parser.parse_args()
+
+    prechequeo_nltk.asegurar_recursos_nltk()
+    repo_reclamo, _ = crear_repositorio()
+    resumen = reclasificar_reclamos(repo_reclamo, tamano_lote=args.lote, procesos=args.procesos,
+                                    ruta_modelo=args.modelo, aplicar=not args.simulacion)
+    print(f"Listo: {resumen['procesados']} reclamos en {resumen['segundos']:.1f} s, "
+          f"{resumen['cambiados']} cambios de departamento, {resumen['no_reconocidos']} etiquetas no reconocidas.")
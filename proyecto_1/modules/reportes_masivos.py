@@ -0,0 +1,142 @@
+# Genera los reportes de todos los departamentos y uno global, empaquetados en un zip (por ejemplo, para el reporte nocturno).
+# Uso (desde la carpeta proyecto_1):
+#     python -m modules.reportes_masivos [--formatos pdf,html] [--procesos 4] [--salida reportes.zip]
+import argparse
+import time
+import zipfile
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from modules.agregados import ESTADOS_CON_TIEMPO, PERCENTILES_TIEMPO, calcular_porcentajes, percentil_histograma
+from modules.cache_tokens import tokenizar_nube
+from modules.fabrica_exportadores import obtener_exportador
+from modules.graficador import Graficador
+from modules.cache_graficos import PALABRAS_NUBE
+from modules.series_temporales import PERIODO_SERIE, armar_serie
+
+# Nombre del reporte que resume a todos los departamentos juntos
+GLOBAL = "Global"
+
+
+def _estadisticas(tiempos_por_estado, palabras, conteos_por_periodo):
+    '''Arma el diccionario de estadísticas que esperan los exportadores a partir de los histogramas y los conteos por período de un departamento.'''
+    conteo = Counter({estado: sum(histograma.values()) for estado, histograma in tiempos_por_estado.items()})
+    stats = {
+        "total": sum(conteo.values()),
+        "porcentajes": calcular_porcentajes(conteo),
+        "palabras": Counter(dict(palabras.most_common(PALABRAS_NUBE))),
+        "ruta_torta": None,
+        "ruta_nube": None,
+        "periodo": PERIODO_SERIE,
+        "serie": armar_serie(conteos_por_periodo, PERIODO_SERIE),
+    }
+    for estado, sufijo in zip(ESTADOS_CON_TIEMPO, ("proceso", "resueltos")):
+        histograma = {t: c for t, c in tiempos_por_estado.get(estado, {}).items() if t is not None}
+        stats[f"mediana_{sufijo}"] = percentil_histograma(histograma, 50)
+        for p in PERCENTILES_TIEMPO:
+            if p != 50:
+                stats[f"p{p}_{sufijo}"] = percentil_histograma(histograma, p)
+    return stats
+
+
+def calcular_estadisticas_masivas(repo, tamano_lote=5000):
+    """
+    Calcula las estadísticas de todos los departamentos y las globales.
+    Los conteos y los tiempos salen de una sola consulta agrupada (obtener_conteos_agrupados), las series
+    temporales de otra agrupada por período (obtener_conteos_por_periodo) y las palabras de la nube de un
+    único recorrido por lotes de los contenidos, en lugar de consultas por departamento.
+    Args:
+        repo (RepositorioReclamosSQLAlchemy): Repositorio de reclamos.
+        tamano_lote (int): Cantidad de reclamos por lote al recorrer los contenidos.
+    Returns:
+        dict: {departamento: stats}, incluyendo GLOBAL. Los reclamos sin departamento solo cuentan en GLOBAL.
+    """
+    tiempos = defaultdict(lambda: defaultdict(Counter))     # departamento -> estado -> tiempo -> cantidad
+    for departamento, estado, tiempo, cantidad in repo.obtener_conteos_agrupados():
+        tiempos[departamento][estado][tiempo] += cantidad
+        tiempos[GLOBAL][estado][tiempo] += cantidad
+    periodos = defaultdict(list)     # departamento -> [(inicio del período, estado, tiempo, cantidad)]
+    for departamento, inicio, estado, tiempo, cantidad in repo.obtener_conteos_por_periodo(PERIODO_SERIE):
+        periodos[departamento].append((inicio, estado, tiempo, cantidad))
+        periodos[GLOBAL].append((inicio, estado, tiempo, cantidad))
+    palabras = defaultdict(Counter)
+    for lote in repo.iterar_contenidos(tamano_lote):
+        for _, contenido, departamento in lote:
+            tokens = tokenizar_nube(contenido)
+            palabras[departamento].update(tokens)
+            palabras[GLOBAL].update(tokens)
+    return {departamento: _estadisticas(tiempos[departamento], palabras[departamento], periodos[departamento])
+            for departamento in tiempos if departamento is not None}
+
+
+def _generar_reportes(departamento, stats, formatos):
+    '''Dibuja los gráficos y genera los reportes de un departamento (se ejecuta en un proceso del pool).'''
+    stats = dict(stats)
+    stats["imagen_torta"] = Graficador.generar_torta(stats["porcentajes"]) if stats["total"] else None
+    stats["imagen_nube"] = Graficador.generar_nube_frecuencias(stats["palabras"]) if stats["palabras"] else None
+    archivos = []
+    for formato in formatos:
+        exportador = obtener_exportador(formato)
+        archivos.append((exportador.nombre_archivo(departamento), b"".join(exportador.generar_partes(stats, departamento))))
+    return archivos
+
+
+def generar_reportes_masivos(repo, formatos=("pdf", "html"), procesos=None, salida=None, informar=print):
+    """
+    Genera los reportes de todos los departamentos y el global, y los guarda en un zip.
+    Los gráficos y los reportes de cada departamento se generan en paralelo en un pool de procesos.
+    Args:
+        repo (RepositorioReclamosSQLAlchemy): Repositorio de reclamos.
+        formatos (tuple): Formatos de reporte a generar.
+        procesos (int): Cantidad de procesos (por defecto, uno por CPU). Con 1 se genera todo en el proceso actual.
+        salida (str or file): Ruta o archivo donde escribir el zip (por defecto, un BytesIO nuevo).
+        informar (callable): Función que recibe los mensajes de progreso.
+    Returns:
+        La salida con el zip escrito (el BytesIO queda posicionado al inicio).
+    Raises:
+        ValueError: Si algún formato no está soportado o procesos no es un entero positivo.
+    """
+    for formato in formatos:
+        obtener_exportador(formato)
+    if procesos is not None and (not isinstance(procesos, int) or procesos <= 0):
+        raise ValueError("La cantidad de procesos debe ser un entero positivo")
+
+    inicio = time.perf_counter()
+    estadisticas = calcular_estadisticas_masivas(repo)
+    informar(f"Estadísticas de {len(estadisticas)} reportes calculadas en {time.perf_counter() - inicio:.2f} s")
+
+    salida = salida if salida is not None else BytesIO()
+    departamentos = sorted(estadisticas)
+    with zipfile.ZipFile(salida, "w", zipfile.ZIP_DEFLATED) as archivo_zip:
+        def guardar(archivos):
+            for nombre, contenido in archivos:
+                archivo_zip.writestr(nombre, contenido)
+                informar(f"{nombre} generado")
+
+        argumentos = (departamentos, [estadisticas[d] for d in departamentos], repeat(formatos))
+        if procesos == 1:
+            for archivos in map(_generar_reportes, *argumentos):
+                guardar(archivos)
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                for archivos in pool.map(_generar_reportes, *argumentos):
+                    guardar(archivos)
+
+    informar(f"Listo en {time.perf_counter() - inicio:.2f} s")
+    if isinstance(salida, BytesIO):
+        salida.seek(0)
+    return salida
+
+
+if __name__ == "__main__":
+    from modules.factoria import crear_repositorio
+
+    parser = argparse.ArgumentParser(description="Genera los reportes de todos los departamentos en un zip.")
+    parser.add_argument("--formatos", default="pdf,html", help="Formatos separados por coma (por defecto pdf,html)")
+    parser.add_argument("--procesos", type=int, default=None, help="Cantidad de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--salida", default="reportes.zip", help="Ruta del zip a generar (por defecto reportes.zip)")
+    args = parser.parse_args()
+
+    repo_reclamo, _ = crear_repositorio()
+    generar_reportes_masivos(repo_reclamo, tuple(args.formatos.split(",")), args.procesos, args.salida)
@@ -5,6 +5,10 @@ class RepositorioAbstracto(ABC):
     def guardar_registro(self, entidad):
         raise NotImplementedError
 
+    @abstractmethod
+    def guardar_registros(self, entidades):
+        raise NotImplementedError
+
     @abstractmethod
     def obtener_todos_los_registros(self) -> list:
         raise NotImplementedError
@@ -13,6 +17,10 @@ class RepositorioAbstracto(ABC):
     def modificar_registro(self, entidad_modificada):
         raise NotImplementedError   
     
+    @abstractmethod
+    def modificar_registros(self, entidades_modificadas):
+        raise NotImplementedError
+
     @abstractmethod
     def obtener_registro_por_filtro(self, filtro, valor):
         raise NotImplementedError
@@ -1,7 +1,73 @@
-from modules.dominio import Reclamo, Usuario
+from modules.dominio import Reclamo, Usuario, VistaReclamo
 from modules.modelos import ModeloReclamo, ModeloUsuario, asociacion_usuarios_reclamos
 from modules.repositorio_abstracto import RepositorioAbstracto
-from sqlalchemy import func
+import io
+from datetime import date, datetime
+from itertools import islice
+from sqlalchemy import func, insert, select, text, update
+import time
+
+# Segundos durante los que se reutiliza el total de reclamos ya contado (los cambios hechos
+# a través del repositorio lo invalidan antes; el plazo acota lo desactualizado si escriben otros procesos)
+VIGENCIA_CONTEOS = 30
+
+# Cantidad de registros por sentencia (executemany) y por commit en las altas y modificaciones masivas
+TAMANO_LOTE_ESCRITURA = 1000
+
+# Períodos en los que se pueden agrupar los reclamos por fecha (las semanas empiezan el lunes)
+PERIODOS = ("dia", "semana", "mes")
+
+
+def _en_lotes(entidades, tamano_lote):
+    '''Divide un iterable en listas de a lo sumo tamano_lote elementos.'''
+    if not isinstance(tamano_lote, int) or tamano_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser un entero positivo")
+    entidades = iter(entidades)
+    while lote := list(islice(entidades, tamano_lote)):
+        yield lote
+
+
+def _inicio_periodo(columna, periodo, dialecto):
+    '''Devuelve la expresión SQL con el inicio del período (día, semana o mes) al que pertenece la fecha de la columna.'''
+    if periodo not in PERIODOS:
+        raise ValueError(f"Período inválido. Debe ser uno de: {', '.join(PERIODOS)}.")
+    if dialecto == "sqlite":
+        modificadores = {"dia": (), "semana": ("weekday 0", "-6 days"), "mes": ("start of month",)}[periodo]
+        return func.date(columna, *modificadores)
+    return func.date_trunc({"dia": "day", "semana": "week", "mes": "month"}[periodo], columna)
+
+
+def _a_fecha(valor):
+    '''Convierte el inicio de un período, como lo devuelve la base (texto en SQLite, timestamp en PostgreSQL), en date.'''
+    if isinstance(valor, str):
+        return date.fromisoformat(valor)
+    if isinstance(valor, datetime):
+        return valor.date()
+    return valor
+
+
+def _valor_copy(valor):
+    '''Escribe un valor en el formato de texto de COPY de PostgreSQL (\\N es NULL).'''
+    if valor is None:
+        return "\\N"
+    return str(valor).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _copiar_postgres(conexion, tabla, columnas, filas):
+    '''Carga las filas en la tabla con COPY ... FROM STDIN, con el driver psycopg (3) o psycopg2.'''
+    sentencia = f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN"
+    cursor = conexion.connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):
+            with cursor.copy(sentencia) as copia:
+                for fila in filas:
+                    copia.write_row(fila)
+        else:
+            datos = io.StringIO("".join("\t".join(map(_valor_copy, fila)) + "\n" for fila in filas))
+            cursor.copy_expert(sentencia, datos)
+    finally:
+        cursor.close()
+
 
 class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
     """
@@ -12,16 +78,16 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
     def __init__(self, session):
         """
         Inicializa el repositorio con una sesión de base de datos SQLAlchemy.
+        Las tablas no se crean aquí: el esquema lo crean las migraciones (ver modules/migraciones.py).
 
         :param session: Objeto de sesión de SQLAlchemy.
         """
         self.__session = session
-        tabla_usuario = ModeloUsuario()
-        tabla_usuario.metadata.create_all(self.__session.bind)
 
     def guardar_registro(self, entidad):
         """
-        Guarda un nuevo usuario en la base de datos.
+        Guarda un nuevo usuario en la base de datos y le asigna a la entidad el id generado
+        (en PostgreSQL vuelve en el INSERT ... RETURNING).
 
         :param entidad: Instancia de Usuario.
         :raises ValueError: Si el objeto no es instancia de Usuario.
@@ -30,8 +96,30 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
             raise ValueError("El parámetro no es una instancia de la clase Usuario")
         modelo_usuario = self.__map_entidad_a_modelo(entidad)
         self.__session.add(modelo_usuario)
+        self.__session.flush()
+        entidad.id = modelo_usuario.id
         self.__session.commit()
 
+    def guardar_registros(self, entidades, tamano_lote=TAMANO_LOTE_ESCRITURA):
+        """
+        Guarda muchos usuarios nuevos con un INSERT por lote (executemany) y un commit por lote,
+        y le asigna a cada entidad el id generado.
+
+        :param entidades: Iterable de instancias de Usuario.
+        :param tamano_lote: Cantidad de usuarios por sentencia y por commit.
+        :raises ValueError: Si algún objeto no es instancia de Usuario (se controla cada lote antes de escribirlo;
+            los lotes anteriores ya quedan guardados).
+        """
+        for lote in _en_lotes(entidades, tamano_lote):
+            if not all(isinstance(entidad, Usuario) for entidad in lote):
+                raise ValueError("El parámetro no es una instancia de la clase Usuario")
+            ids = self.__session.scalars(
+                insert(ModeloUsuario).returning(ModeloUsuario.id, sort_by_parameter_order=True),
+                [self.__map_entidad_a_fila(entidad) for entidad in lote]).all()
+            self.__session.commit()
+            for entidad, id_usuario in zip(lote, ids):
+                entidad.id = id_usuario
+
     def obtener_todos_los_registros(self):
         """
         Obtiene todos los usuarios de la base de datos.
@@ -57,6 +145,28 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
         register.password = entidad_modificada.password
         self.__session.commit()
 
+    def modificar_registros(self, entidades_modificadas, tamano_lote=TAMANO_LOTE_ESCRITURA):
+        """
+        Modifica muchos usuarios existentes con un UPDATE por lote (executemany) y un commit por lote.
+        Se actualizan los mismos campos que en modificar_registro.
+
+        :param entidades_modificadas: Iterable de instancias de Usuario con datos nuevos.
+        :param tamano_lote: Cantidad de usuarios por sentencia y por commit.
+        :raises ValueError: Si algún objeto no es instancia de Usuario o algún usuario no existe (se controla
+            cada lote antes de escribirlo; los lotes anteriores ya quedan guardados).
+        """
+        for lote in _en_lotes(entidades_modificadas, tamano_lote):
+            if not all(isinstance(entidad, Usuario) for entidad in lote):
+                raise ValueError("El parámetro no es una instancia de la clase Usuario")
+            ids = {entidad.id for entidad in lote}
+            if self.__session.scalar(select(func.count(ModeloUsuario.id)).where(ModeloUsuario.id.in_(ids))) != len(ids):
+                raise ValueError("No se encontró el usuario con ese id")
+            self.__session.execute(update(ModeloUsuario), [
+                {"id": e.id, "nombre": e.nombre, "apellido": e.apellido, "email": e.email, "password": e.password}
+                for e in lote
+            ])
+            self.__session.commit()
+
     def obtener_registro_por_filtro(self, filtro, valor):
         """
         Obtiene un usuario según un filtro.
@@ -78,6 +188,8 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
         register = self.__session.query(ModeloUsuario).filter_by(id=id).first()
         modelo_reclamo = self.__session.query(ModeloReclamo).filter_by(id_reclamo=id_asociado).first()
         register.reclamos_adheridos.append(modelo_reclamo)
+        # La adhesión cambia la urgencia del reclamo: así la ven también los otros procesos (ver MarcaDeAgua)
+        modelo_reclamo.actualizado = datetime.now()
         self.__session.commit()
 
     def obtener_adherentes_de_registro_asociado(self, id_asociado):
@@ -115,15 +227,24 @@ class RepositorioUsuariosSQLAlchemy(RepositorioAbstracto):
         :param entidad: Usuario.
         :return: ModeloUsuario.
         """
-        return ModeloUsuario(
-            nombre=entidad.nombre,
-            email=entidad.email,
-            password=entidad.password,
-            apellido=entidad.apellido,
-            nombre_usuario=entidad.nombre_usuario,
-            claustro=entidad.claustro,
-            rol=entidad.rol
-        )
+        return ModeloUsuario(**self.__map_entidad_a_fila(entidad))
+
+    def __map_entidad_a_fila(self, entidad):
+        """
+        Convierte una entidad Usuario en un diccionario de columnas, para las escrituras masivas.
+
+        :param entidad: Usuario.
+        :return: dict.
+        """
+        return {
+            "nombre": entidad.nombre,
+            "email": entidad.email,
+            "password": entidad.password,
+            "apellido": entidad.apellido,
+            "nombre_usuario": entidad.nombre_usuario,
+            "claustro": entidad.claustro,
+            "rol": entidad.rol
+        }
 
 
 class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
@@ -132,28 +253,51 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
     Gestiona operaciones CRUD y asociaciones con usuarios.
     """
 
-    def __init__(self, session):
+    def __init__(self, session, escritor=None):
         """
         Inicializa el repositorio con una sesión de base de datos SQLAlchemy.
+        Las tablas no se crean aquí: el esquema lo crean las migraciones (ver modules/migraciones.py).
 
         :param session: Objeto de sesión SQLAlchemy.
+        :param escritor: EscritorAgrupado opcional. Si se indica, las altas y modificaciones de reclamos
+            se confirman a través de él, agrupadas con las de otros pedidos concurrentes.
         """
         self.__session = session
-        tabla_reclamo = ModeloReclamo()
-        tabla_reclamo.metadata.create_all(self.__session.bind)
+        self.__escritor = escritor
+        self.__conteos = {}     # departamento (None para todos) -> (total, momento del conteo)
 
     def guardar_registro(self, entidad):
         """
-        Guarda un nuevo reclamo en la base de datos.
+        Guarda un nuevo reclamo en la base de datos y le asigna a la entidad el id generado.
 
         :param entidad: Instancia de Reclamo.
         :raises ValueError: Si el objeto no es instancia de Reclamo.
         """
         if not isinstance(entidad, Reclamo):
             raise ValueError("El parámetro no es una instancia de la clase Reclamo")
-        modelo_reclamo = self.__map_entidad_a_modelo(entidad)
-        self.__session.add(modelo_reclamo)
-        self.__session.commit()
+        entidad.id_reclamo = self.__escribir(lambda sesion: self.__insertar(sesion, entidad))
+
+    def guardar_registros(self, entidades, tamano_lote=TAMANO_LOTE_ESCRITURA):
+        """
+        Guarda muchos reclamos nuevos con un INSERT por lote (executemany) y un commit por lote,
+        y le asigna a cada entidad el id generado (devuelto por el mismo INSERT con RETURNING).
+        A diferencia de guardar_registro, no pasa por el escritor agrupado: cada lote ya es una sola transacción.
+
+        :param entidades: Iterable de instancias de Reclamo.
+        :param tamano_lote: Cantidad de reclamos por sentencia y por commit.
+        :raises ValueError: Si algún objeto no es instancia de Reclamo (se controla cada lote antes de escribirlo;
+            los lotes anteriores ya quedan guardados).
+        """
+        for lote in _en_lotes(entidades, tamano_lote):
+            if not all(isinstance(entidad, Reclamo) for entidad in lote):
+                raise ValueError("El parámetro no es una instancia de la clase Reclamo")
+            ids = self.__session.scalars(
+                insert(ModeloReclamo).returning(ModeloReclamo.id_reclamo, sort_by_parameter_order=True),
+                [self.__map_entidad_a_fila(entidad) for entidad in lote]).all()
+            self.__session.commit()
+            self.__conteos.clear()
+            for entidad, id_reclamo in zip(lote, ids):
+                entidad.id_reclamo = id_reclamo
 
     def obtener_todos_los_registros(self):
         """
@@ -174,7 +318,54 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         """
         if not isinstance(entidad_modificada, Reclamo):
             raise ValueError("El parámetro no es una instancia de la clase Reclamo")
-        register = self.__session.query(ModeloReclamo).filter_by(id_reclamo=entidad_modificada.id_reclamo).first()
+        self.__escribir(lambda sesion: self.__actualizar(sesion, entidad_modificada))
+
+    def modificar_registros(self, entidades_modificadas, tamano_lote=TAMANO_LOTE_ESCRITURA):
+        """
+        Modifica muchos reclamos existentes con un UPDATE por lote (executemany) y un commit por lote,
+        por ejemplo para cambiar el estado de cientos de reclamos. Se actualizan los mismos campos
+        que en modificar_registro.
+
+        :param entidades_modificadas: Iterable de instancias modificadas de Reclamo.
+        :param tamano_lote: Cantidad de reclamos por sentencia y por commit.
+        :raises ValueError: Si algún objeto no es instancia de Reclamo o algún reclamo no existe (se controla
+            cada lote antes de escribirlo; los lotes anteriores ya quedan guardados).
+        """
+        def filas():
+            for entidad in entidades_modificadas:
+                if not isinstance(entidad, Reclamo):
+                    raise ValueError("El parámetro no es una instancia de la clase Reclamo")
+                yield {"id_reclamo": entidad.id_reclamo, "estado": entidad.estado,
+                       "tiempo_en_proceso": entidad.tiempo_en_proceso, "departamento": entidad.departamento,
+                       "contenido": entidad.contenido, "r_imagen": entidad.r_imagen}
+
+        self.__actualizar_en_lotes(filas(), tamano_lote)
+
+    def __escribir(self, escritura):
+        '''
+        Ejecuta escritura(sesion) y confirma: en la sesión del repositorio o, si hay escritor agrupado,
+        en la del escritor (y después termina la transacción de lectura de la sesión propia, para que
+        las lecturas siguientes vean lo escrito).
+        '''
+        if self.__escritor is None:
+            resultado = escritura(self.__session)
+        else:
+            resultado = self.__escritor.ejecutar(escritura)
+        self.__session.commit()
+        self.__conteos.clear()
+        return resultado
+
+    def __insertar(self, sesion, entidad):
+        '''Agrega el reclamo en la sesión y devuelve el id generado (en PostgreSQL vuelve en el INSERT ... RETURNING).'''
+        modelo_reclamo = self.__map_entidad_a_modelo(entidad)
+        sesion.add(modelo_reclamo)
+        sesion.flush()
+        return modelo_reclamo.id_reclamo
+
+    @staticmethod
+    def __actualizar(sesion, entidad_modificada):
+        '''Copia los atributos modificables de la entidad al registro guardado.'''
+        register = sesion.query(ModeloReclamo).filter_by(id_reclamo=entidad_modificada.id_reclamo).first()
         if not register:
             raise ValueError("No se encontró el reclamo con ese id")
         register.estado = entidad_modificada.estado
@@ -182,8 +373,7 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         register.departamento = entidad_modificada.departamento
         register.contenido = entidad_modificada.contenido
         register.r_imagen = entidad_modificada.r_imagen
-        self.__session.flush()
-        self.__session.commit()
+        sesion.flush()
 
     def obtener_registro_por_filtro(self, filtro, valor):
         """
@@ -201,14 +391,264 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
 
     def obtener_registros_por_filtro(self, filtro, valor):
         """
-        Obtiene múltiples reclamos según un filtro.
+        Obtiene múltiples reclamos según un filtro, para mostrarlos (solo lectura).
 
         :param filtro: Campo de filtro.
         :param valor: Valor a buscar.
-        :return: Lista de Reclamo.
+        :return: Lista de VistaReclamo.
+        """
+        return self.__leer_vistas(self.__consulta_vistas().filter_by(**{filtro: valor}))
+
+    def obtener_registros_por_ids(self, lista_ids):
+        """
+        Obtiene los reclamos cuyos ids están en la lista dada, para mostrarlos (solo lectura).
+
+        :param lista_ids: Lista de ids de reclamos.
+        :return: Lista de VistaReclamo (sin orden garantizado).
+        """
+        if not lista_ids:
+            return []
+        return self.__leer_vistas(self.__consulta_vistas().filter(ModeloReclamo.id_reclamo.in_(lista_ids)))
+
+    def __consulta_vistas(self):
+        '''Consulta solo las columnas de VistaReclamo, sin construir objetos del ORM.'''
+        return self.__session.query(*(getattr(ModeloReclamo, campo) for campo in VistaReclamo._fields))
+
+    @staticmethod
+    def __leer_vistas(consulta):
+        '''Ejecuta la consulta de __consulta_vistas y arma una VistaReclamo por fila (sin las validaciones de Reclamo).'''
+        return [VistaReclamo._make(fila) for fila in consulta]
+
+    def obtener_contenidos_activos(self, departamento, estados):
+        """
+        Obtiene solo el id y el contenido de los reclamos de un departamento que están en alguno de los estados dados.
+        No construye entidades Reclamo, por lo que sirve para indexar muchos reclamos a bajo costo.
+
+        :param departamento: Departamento a filtrar.
+        :param estados: Estados a incluir.
+        :return: Lista de tuplas (id_reclamo, contenido).
+        """
+        return (
+            self.__session.query(ModeloReclamo.id_reclamo, ModeloReclamo.contenido)
+            .filter(ModeloReclamo.departamento == departamento, ModeloReclamo.estado.in_(estados))
+            .all()
+        )
+
+    def obtener_datos_analitica(self, departamento):
         """
-        modelos_reclamo = self.__session.query(ModeloReclamo).filter_by(**{filtro: valor}).all()
-        return [self.__map_modelo_a_entidad(m) for m in modelos_reclamo]
+        Obtiene solo las columnas que usa la analítica de los reclamos de un departamento, sin construir entidades.
+
+        :param departamento: Departamento a filtrar.
+        :return: Lista de tuplas (id_reclamo, estado, contenido, tiempo_en_proceso).
+        """
+        return (
+            self.__session.query(ModeloReclamo.id_reclamo, ModeloReclamo.estado,
+                                 ModeloReclamo.contenido, ModeloReclamo.tiempo_en_proceso)
+            .filter(ModeloReclamo.departamento == departamento)
+            .all()
+        )
+
+    def obtener_datos_urgencia(self, departamento, estados):
+        """
+        Obtiene, en una sola consulta, los datos que definen la urgencia de los reclamos de un departamento
+        que están en alguno de los estados dados: estado, fecha de creación y cantidad de adherentes.
+
+        :param departamento: Departamento a filtrar.
+        :param estados: Estados a incluir.
+        :return: Lista de tuplas (id_reclamo, estado, fecha_y_hora, n_adherentes).
+        """
+        return (
+            self.__session.query(ModeloReclamo.id_reclamo, ModeloReclamo.estado, ModeloReclamo.fecha_y_hora,
+                                 func.count(asociacion_usuarios_reclamos.c.id_usuario))
+            .outerjoin(asociacion_usuarios_reclamos,
+                       asociacion_usuarios_reclamos.c.id_reclamo == ModeloReclamo.id_reclamo)
+            .filter(ModeloReclamo.departamento == departamento, ModeloReclamo.estado.in_(estados))
+            .group_by(ModeloReclamo.id_reclamo)
+            .all()
+        )
+
+    def obtener_conteos_agrupados(self):
+        """
+        Cuenta los reclamos agrupados por departamento, estado y tiempo en proceso, en una sola consulta.
+        Alcanza para calcular la cantidad por estado y las medianas/percentiles de tiempo de todos los
+        departamentos a la vez (el tiempo en proceso toma pocos valores distintos, así que hay pocas filas).
+
+        :return: Lista de tuplas (departamento, estado, tiempo_en_proceso, cantidad).
+        """
+        return (
+            self.__session.query(ModeloReclamo.departamento, ModeloReclamo.estado, ModeloReclamo.tiempo_en_proceso,
+                                 func.count(ModeloReclamo.id_reclamo))
+            .group_by(ModeloReclamo.departamento, ModeloReclamo.estado, ModeloReclamo.tiempo_en_proceso)
+            .all()
+        )
+
+    def obtener_conteos_por_periodo(self, periodo, departamento=None):
+        """
+        Cuenta los reclamos agrupados por departamento, período de creación (según fecha_y_hora), estado y
+        tiempo en proceso, en una sola consulta (GROUP BY sobre el inicio del período). Como en
+        obtener_conteos_agrupados, alcanza para calcular cantidades y medianas/percentiles de cada período.
+
+        :param periodo: "dia", "semana" o "mes".
+        :param departamento: Departamento a filtrar, o None para todos.
+        :return: Lista de tuplas (departamento, inicio del período (date), estado, tiempo_en_proceso, cantidad),
+            ordenada por período.
+        :raises ValueError: Si el período no es válido.
+        """
+        inicio = _inicio_periodo(ModeloReclamo.fecha_y_hora, periodo, self.__session.get_bind().dialect.name)
+        consulta = (
+            select(ModeloReclamo.departamento, inicio, ModeloReclamo.estado, ModeloReclamo.tiempo_en_proceso,
+                   func.count(ModeloReclamo.id_reclamo))
+            .group_by(ModeloReclamo.departamento, inicio, ModeloReclamo.estado, ModeloReclamo.tiempo_en_proceso)
+            .order_by(inicio)
+        )
+        if departamento is not None:
+            consulta = consulta.where(ModeloReclamo.departamento == departamento)
+        return [(d, _a_fecha(p), estado, tiempo, cantidad)
+                for d, p, estado, tiempo, cantidad in self.__session.execute(consulta)]
+
+    def iterar_contenidos(self, tamano_lote=1000):
+        """
+        Recorre todos los reclamos por lotes, ordenados por id, devolviendo solo id, contenido y departamento.
+        Cada lote se pide con una consulta por rango de id (id_reclamo > último id leído), por lo que
+        nunca hay más de tamano_lote filas en memoria y no se construyen entidades Reclamo.
+
+        :param tamano_lote: Cantidad de filas por lote.
+        :return: Generador de listas de tuplas (id_reclamo, contenido, departamento).
+        """
+        ultimo_id = 0
+        while True:
+            lote = (
+                self.__session.query(ModeloReclamo.id_reclamo, ModeloReclamo.contenido, ModeloReclamo.departamento)
+                .filter(ModeloReclamo.id_reclamo > ultimo_id)
+                .order_by(ModeloReclamo.id_reclamo)
+                .limit(tamano_lote)
+                .all()
+            )
+            if not lote:
+                return
+            yield lote
+            ultimo_id = lote[-1][0]
+
+    def iterar_filas(self, columnas, departamento=None, tamano_lote=1000, actualizados_desde=None):
+        """
+        Recorre los reclamos (de un departamento o todos) con un cursor del lado del servidor,
+        trayendo de la base tamano_lote filas por vez (yield_per) y sin construir entidades Reclamo.
+        A diferencia de iterar_contenidos, es una única consulta: pensado para exportar todo de una pasada.
+
+        :param columnas: Nombres de las columnas de la tabla reclamos a devolver, en orden.
+        :param departamento: Departamento a filtrar, o None para recorrer todos los reclamos.
+        :param tamano_lote: Cantidad de filas por lote.
+        :param actualizados_desde: Si se indica (datetime), solo se recorren los reclamos agregados o modificados
+            desde ese momento (columna actualizado, con índice).
+        :return: Generador de listas de tuplas con los valores de las columnas.
+        """
+        consulta = select(*(getattr(ModeloReclamo, columna) for columna in columnas)).order_by(ModeloReclamo.id_reclamo)
+        if departamento is not None:
+            consulta = consulta.where(ModeloReclamo.departamento == departamento)
+        if actualizados_desde is not None:
+            consulta = consulta.where(ModeloReclamo.actualizado >= actualizados_desde)
+        resultado = self.__session.execute(consulta.execution_options(stream_results=True, yield_per=tamano_lote))
+        try:
+            for lote in resultado.partitions():
+                yield [tuple(fila) for fila in lote]
+        finally:
+            resultado.close()
+
+    def obtener_huella(self, departamento=None):
+        """
+        Devuelve una huella de los reclamos (de un departamento o todos) que cambia con cualquier alta, modificación
+        o baja, la haga este proceso u otro: la cantidad de reclamos y el último momento de modificación.
+        Se calcula siempre en la base (sin la caché de contar_reclamos).
+
+        :param departamento: Departamento a filtrar, o None para todos.
+        :return: Tupla (cantidad, ultima_modificacion); ultima_modificacion es None si no hay reclamos.
+        """
+        consulta = select(func.count(ModeloReclamo.id_reclamo), func.max(ModeloReclamo.actualizado))
+        if departamento is not None:
+            consulta = consulta.where(ModeloReclamo.departamento == departamento)
+        cantidad, ultima = self.__session.execute(consulta).one()
+        return cantidad, ultima
+
+    def contar_por_departamento(self, estados=None):
+        """
+        Cuenta los reclamos de cada departamento en una sola consulta (sin la caché de contar_reclamos).
+        Sirve para comparar los totales de los datos derivados en memoria con los de la base.
+
+        :param estados: Si se indica, solo se cuentan los reclamos en alguno de esos estados.
+        :return: Diccionario departamento -> cantidad (los departamentos sin reclamos no aparecen).
+        """
+        consulta = select(ModeloReclamo.departamento, func.count(ModeloReclamo.id_reclamo)).group_by(
+            ModeloReclamo.departamento)
+        if estados is not None:
+            consulta = consulta.where(ModeloReclamo.estado.in_(estados))
+        return dict(self.__session.execute(consulta).all())
+
+    def actualizar_departamentos(self, cambios, tamano_lote=TAMANO_LOTE_ESCRITURA):
+        """
+        Cambia el departamento de varios reclamos con un UPDATE por lote (executemany) y un commit por lote.
+
+        :param cambios: Diccionario {id_reclamo: nuevo_departamento}.
+        :param tamano_lote: Cantidad de reclamos por sentencia y por commit.
+        :raises ValueError: Si algún reclamo no existe (los lotes anteriores ya quedan guardados).
+        """
+        self.__actualizar_en_lotes(
+            ({"id_reclamo": id_reclamo, "departamento": departamento} for id_reclamo, departamento in cambios.items()),
+            tamano_lote)
+
+    def __actualizar_en_lotes(self, filas, tamano_lote):
+        '''
+        Actualiza por id_reclamo las columnas de cada fila (diccionario), con un UPDATE por lote y un commit por lote.
+        Antes de escribir cada lote controla con una consulta que existan todos sus reclamos.
+        '''
+        for lote in _en_lotes(filas, tamano_lote):
+            ids = {fila["id_reclamo"] for fila in lote}
+            existentes = self.__session.scalar(
+                select(func.count(ModeloReclamo.id_reclamo)).where(ModeloReclamo.id_reclamo.in_(ids)))
+            if existentes != len(ids):
+                raise ValueError("No se encontró el reclamo con ese id")
+            self.__session.execute(update(ModeloReclamo), lote)
+            self.__session.commit()
+            self.__conteos.clear()
+
+    def importar_filas(self, columnas, lotes):
+        """
+        Inserta muchos reclamos de una vez (importaciones), por lotes y sin construir entidades ni objetos del ORM.
+        En PostgreSQL cada lote se carga con COPY ... FROM STDIN; en las demás bases, con un INSERT
+        por lote (executemany). Todo se confirma en un único commit: si algo falla no se importa nada.
+
+        :param columnas: Nombres de las columnas de la tabla reclamos que trae cada fila, en orden. Tienen que
+            estar las obligatorias (id_creador, estado, contenido y fecha_y_hora). Si incluye id_reclamo se conservan esos ids (por ejemplo, al pasar los datos de otra base).
+        :param lotes: Iterable de listas de tuplas con los valores de las columnas (como las de iterar_filas).
+            Si no traen la columna actualizado, se le pone el momento de la importación.
+        :return: Cantidad de reclamos importados.
+        """
+        if "actualizado" not in columnas:
+            # COPY no aplica el valor por defecto del modelo: se agrega explícitamente en las dos bases
+            ahora = datetime.now()
+            columnas = (*columnas, "actualizado")
+            lotes = ([(*fila, ahora) for fila in lote] for lote in lotes)
+        conexion = self.__session.connection()
+        postgres = conexion.dialect.name == "postgresql"
+        total = 0
+        try:
+            for lote in lotes:
+                if not lote:
+                    continue
+                if postgres:
+                    _copiar_postgres(conexion, ModeloReclamo.__tablename__, columnas, lote)
+                else:
+                    conexion.execute(insert(ModeloReclamo), [dict(zip(columnas, fila)) for fila in lote])
+                total += len(lote)
+            if postgres and "id_reclamo" in columnas:
+                # Los ids importados no avanzan la secuencia de la clave: se la lleva al último id
+                conexion.execute(text("SELECT setval(pg_get_serial_sequence('reclamos', 'id_reclamo'), "
+                                      "max(id_reclamo)) FROM reclamos"))
+            self.__session.commit()
+        except Exception:
+            self.__session.rollback()
+            raise
+        self.__conteos.clear()
+        return total
 
     def obtener_registros_adheridos_por_usuario(self, id_usuario):
         """
@@ -222,20 +662,68 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
     
     def obtener_reclamos_paginados(self, page, per_page, departamento=None):
         offset = (page - 1) * per_page
-        query = self.__session.query(ModeloReclamo)
+        query = self.__consulta_vistas()
 
         if departamento:
             query = query.filter_by(departamento=departamento)
 
         query = query.order_by(ModeloReclamo.id_reclamo.desc())
 
-        total = query.count()
+        total = self.contar_reclamos(departamento)
         resultados = query.limit(per_page).offset(offset).all()
-        
 
-        reclamos = [self.__map_modelo_a_entidad(m).to_dict() for m in resultados]
+        reclamos = [VistaReclamo._make(fila).to_dict() for fila in resultados]
         return reclamos, total
 
+    def obtener_reclamos_por_cursor(self, per_page, departamento=None, antes_de=None, despues_de=None):
+        """
+        Devuelve una página de reclamos, del más nuevo al más viejo, paginando por cursor (keyset) sobre id_reclamo.
+        En lugar de saltear filas con OFFSET, cada página se pide a partir del id del último (o primer) reclamo
+        de la página anterior, así que cualquier página cuesta lo mismo que la primera.
+
+        :param per_page: Cantidad de reclamos por página.
+        :param departamento: Departamento a filtrar, o None para todos.
+        :param antes_de: Id de cursor: devuelve los reclamos con id menor (la página siguiente).
+        :param despues_de: Id de cursor: devuelve los reclamos con id mayor (la página anterior).
+        :return: Tupla (reclamos, hay_mas), con los reclamos como diccionarios y hay_mas indicando si quedan
+            más reclamos en la dirección pedida.
+        """
+        query = self.__consulta_vistas()
+        if departamento:
+            query = query.filter_by(departamento=departamento)
+        if despues_de is not None:
+            query = query.filter(ModeloReclamo.id_reclamo > despues_de).order_by(ModeloReclamo.id_reclamo.asc())
+        else:
+            if antes_de is not None:
+                query = query.filter(ModeloReclamo.id_reclamo < antes_de)
+            query = query.order_by(ModeloReclamo.id_reclamo.desc())
+
+        # Se pide uno más de los necesarios para saber si hay otra página sin contar
+        resultados = query.limit(per_page + 1).all()
+        hay_mas = len(resultados) > per_page
+        resultados = resultados[:per_page]
+        if despues_de is not None:
+            resultados.reverse()
+        return [VistaReclamo._make(fila).to_dict() for fila in resultados], hay_mas
+
+    def contar_reclamos(self, departamento=None):
+        """
+        Cuenta los reclamos de un departamento (o todos). El total se reutiliza durante VIGENCIA_CONTEOS
+        segundos, o hasta que se guarde o modifique un reclamo a través de este repositorio.
+
+        :param departamento: Departamento a contar, o None para todos.
+        :return: Cantidad de reclamos.
+        """
+        guardado = self.__conteos.get(departamento)
+        if guardado is not None and time.monotonic() - guardado[1] < VIGENCIA_CONTEOS:
+            return guardado[0]
+        query = self.__session.query(func.count(ModeloReclamo.id_reclamo))
+        if departamento:
+            query = query.filter(ModeloReclamo.departamento == departamento)
+        total = query.scalar()
+        self.__conteos[departamento] = (total, time.monotonic())
+        return total
+
     def contar_adherentes_por_varios_reclamos(self, lista_ids):
         
         resultados = (
@@ -250,6 +738,11 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         return {id_reclamo: total for id_reclamo, total in resultados}
 
     def contar_total_reclamos(self):
+        """
+        Cuenta todos los reclamos con una consulta COUNT, sin cargarlos.
+
+        :return: Cantidad de reclamos.
+        """
         return self.__session.query(func.count(ModeloReclamo.id_reclamo)).scalar()
 
     def __map_modelo_a_entidad(self, modelo: ModeloReclamo):
@@ -277,13 +770,21 @@ class RepositorioReclamosSQLAlchemy(RepositorioAbstracto):
         :param entidad: Reclamo.
         :return: ModeloReclamo.
         """
-        return ModeloReclamo(
-            id_reclamo=entidad.id_reclamo,
-            id_creador=entidad.id_creador,
-            estado=entidad.estado,
-            fecha_y_hora=entidad.fecha_y_hora,
-            contenido=entidad.contenido,
-            departamento=entidad.departamento,
-            r_imagen=entidad.r_imagen,
-            tiempo_en_proceso=entidad.tiempo_en_proceso
-        )
+        return ModeloReclamo(id_reclamo=entidad.id_reclamo, **self.__map_entidad_a_fila(entidad))
+
+    def __map_entidad_a_fila(self, entidad: Reclamo):
+        """
+        Convierte una entidad Reclamo en un diccionario de columnas (sin el id), para las escrituras masivas.
+
+        :param entidad: Reclamo.
+        :return: dict.
+        """
+        return {
+            "id_creador": entidad.id_creador,
+            "estado": entidad.estado,
+            "fecha_y_hora": entidad.fecha_y_hora,
+            "contenido": entidad.contenido,
+            "departamento": entidad.departamento,
+            "r_imagen": entidad.r_imagen,
+            "tiempo_en_proceso": entidad.tiempo_en_proceso
+        }
@@ -0,0 +1,84 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from modules.agregados import percentil_histograma
+from modules.dominio import ESTADOS_ACTIVOS, Estado
+
+# Período por defecto de las series de la analítica y de los reportes ("dia", "semana" o "mes")
+PERIODO_SERIE = "semana"
+# Nombre de cada período para mostrar en la página de analítica y en los reportes
+NOMBRES_PERIODOS = {"dia": "día", "semana": "semana", "mes": "mes"}
+# Columnas de la serie que se muestran en las tablas, con su título
+# (todas se refieren a los reclamos creados en el período, en su estado actual: no es un historial de estados)
+COLUMNAS_SERIE = (("creados", "Creados"), ("resueltos", "Creados y ya resueltos"),
+                  ("abiertos", "Creados y aún abiertos"),
+                  ("abiertos_acumulados", "Abiertos acumulados (por fecha de creación)"),
+                  ("mediana_resolucion", "Mediana resolución"), ("p90_resolucion", "P90 resolución"))
+
+
+def siguiente_periodo(inicio, periodo):
+    """
+    Devuelve el inicio del período que sigue al que empieza en inicio.
+    Args:
+        inicio (date): Inicio de un período (el lunes de la semana o el día 1 del mes, según el período).
+        periodo (str): "dia", "semana" o "mes".
+    Raises:
+        ValueError: Si el período no es válido.
+    """
+    if periodo == "dia":
+        return inicio + timedelta(days=1)
+    if periodo == "semana":
+        return inicio + timedelta(weeks=1)
+    if periodo == "mes":
+        return inicio.replace(year=inicio.year + 1, month=1) if inicio.month == 12 else inicio.replace(month=inicio.month + 1)
+    raise ValueError(f"Período inválido: {periodo}")
+
+
+def armar_serie(conteos, periodo=PERIODO_SERIE):
+    """
+    Arma la serie temporal de un departamento a partir de sus conteos por período, estado y tiempo en proceso
+    (las filas de RepositorioReclamosSQLAlchemy.obtener_conteos_por_periodo, sin la columna del departamento).
+    Los reclamos se ubican en el período en que se crearon. Los períodos sin reclamos entre el primero y el
+    último también aparecen, con cero reclamos, para que la serie no salte fechas.
+    Args:
+        conteos (iterable): Tuplas (inicio del período, estado, tiempo_en_proceso, cantidad).
+        periodo (str): Período de los conteos ("dia", "semana" o "mes").
+    Returns:
+        list: Un diccionario por período, ordenados por fecha, con las claves:
+            - "periodo" (date): Inicio del período.
+            - "creados" (int): Reclamos creados en el período.
+            - "resueltos" (int): Reclamos creados en el período que ya están resueltos.
+            - "abiertos" (int): Reclamos creados en el período que siguen pendientes o en proceso.
+            - "abiertos_acumulados" (int): Reclamos que hoy siguen abiertos y se crearon hasta el fin del
+              período (acumulado de "abiertos"). No es el backlog que había al cerrar el período: los reclamos
+              que se resolvieron después no cuentan.
+            - "mediana_resolucion" / "p90_resolucion" (float or None): Mediana y percentil 90 del
+              tiempo_en_proceso de los reclamos resueltos creados en el período.
+    """
+    creados, resueltos, abiertos = Counter(), Counter(), Counter()
+    tiempos = defaultdict(Counter)
+    for inicio, estado, tiempo, cantidad in conteos:
+        creados[inicio] += cantidad
+        if estado == Estado.RESUELTO.value:
+            resueltos[inicio] += cantidad
+            if tiempo is not None:
+                tiempos[inicio][tiempo] += cantidad
+        elif estado in ESTADOS_ACTIVOS:
+            abiertos[inicio] += cantidad
+    serie = []
+    if not creados:
+        return serie
+    abiertos_acumulados = 0
+    inicio, ultimo = min(creados), max(creados)
+    while inicio <= ultimo:
+        abiertos_acumulados += abiertos[inicio]
+        serie.append({
+            "periodo": inicio,
+            "creados": creados[inicio],
+            "resueltos": resueltos[inicio],
+            "abiertos": abiertos[inicio],
+            "abiertos_acumulados": abiertos_acumulados,
+            "mediana_resolucion": percentil_histograma(tiempos[inicio], 50),
+            "p90_resolucion": percentil_histograma(tiempos[inicio], 90),
+        })
+        inicio = siguiente_periodo(inicio, periodo)
+    return serie
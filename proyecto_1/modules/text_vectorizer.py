@@ -5,53 +5,66 @@ from nltk.corpus import stopwords
 from nltk.stem import SnowballStemmer
 import string
 from collections import Counter
+from scipy.sparse import csr_matrix
 from sklearn.base import BaseEstimator, TransformerMixin
+from modules.cache_tokens import cache_raices
 
 class TextVectorizer(BaseEstimator, TransformerMixin):
-    def __init__(self):
+    def __init__(self, sparse=False):
+        """
+        Args:
+            sparse (bool): Si es True, transform devuelve una matriz dispersa CSR en lugar de un arreglo denso.
+                La memoria pasa a depender de la cantidad de tokens y no de reclamos x vocabulario.
+        """
+        self.sparse = sparse
         self.__word2idx = {}
         self.stop_words = set(stopwords.words('spanish'))
         self.spanish_stemmer = SnowballStemmer('spanish')
 
-    def __get_tokens(self, texto):        
+    def obtener_tokens(self, texto):
+        """Devuelve la lista de raíces (stems) del texto, sin stopwords ni signos de puntuación.
+        Es el mismo preprocesamiento que usa el vectorizador, expuesto para el buscador de reclamos similares.
+        Las raíces se memorizan en la caché compartida cache_raices, ya que el vocabulario de los reclamos es chico."""
         texto = texto.lower()
-        tokens = word_tokenize(texto)    
-        word_tokens = [self.spanish_stemmer.stem(token) for token in tokens\
-                            if token not in self.stop_words and token not in string.punctuation]
-        return ' '.join(word_tokens)
-
-    # Text to Vector
-    def __text_to_vector(self, texto):
-        word_vector = np.zeros(len(self.vocabulario_))
-        texto = self.__get_tokens(texto) #agrego esta linea
-        for word in texto.split(" "):
-            if self.__word2idx.get(word) is None:
-                continue
-            else:
-                word_vector[self.__word2idx.get(word)] += 1
-        return np.array(word_vector)
+        tokens = word_tokenize(texto)
+        return [cache_raices.obtener(token, self.spanish_stemmer.stem) for token in tokens\
+                    if token not in self.stop_words and token not in string.punctuation]
 
     def fit(self, X, y=None):
-        X_procesado = []
-        for reclamo in X:
-            X_procesado.append(self.__get_tokens(reclamo))
-
         total_counts = Counter()
-        for reclamo in X_procesado:
-            for word in reclamo.split(" "):
-                total_counts[word] += 1
+        for reclamo in X:
+            total_counts.update(self.obtener_tokens(reclamo))
         self.vocabulario_ = [elem[0] for elem in total_counts.most_common()]
         for i, word in enumerate(self.vocabulario_):
             self.__word2idx[word] = i 
 
         return self
 
-    def transform(self, X, y=None):        
-        word_vectors = np.zeros((len(X), len(self.vocabulario_)), dtype=np.int_)
-        for i, texto in enumerate(X):
-            word_vectors[i] = self.__text_to_vector(texto)
+    def transform(self, X, y=None):
+        """
+        Convierte los textos en vectores de frecuencia de palabras.
+        La matriz se arma en una sola pasada en formato CSR: por cada texto solo se guardan
+        los índices y frecuencias de las palabras del vocabulario que aparecen en él.
+        Returns:
+            scipy.sparse.csr_matrix si sparse es True, o np.ndarray denso en caso contrario.
+        """
+        indices = []
+        frecuencias = []
+        punteros = [0]
+        for texto in X:
+            conteo = Counter(self.__word2idx[token] for token in self.obtener_tokens(texto) if token in self.__word2idx)
+            indices.extend(conteo.keys())
+            frecuencias.extend(conteo.values())
+            punteros.append(len(indices))
 
-        return word_vectors
+        word_vectors = csr_matrix(
+            (np.array(frecuencias, dtype=np.int_), np.array(indices, dtype=np.int32), np.array(punteros, dtype=np.int64)),
+            shape=(len(punteros) - 1, len(self.vocabulario_))
+        )
+        # Los modelos guardados con versiones anteriores no tienen el atributo sparse
+        if getattr(self, "sparse", False):
+            return word_vectors
+        return word_vectors.toarray()
     
 if __name__ == "__main__":
 
@@ -0,0 +1,248 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import or_
+from modules.modelos import ModeloTrabajo
+
+# Estados de un trabajo
+PENDIENTE = "Pendiente"
+EN_CURSO = "En curso"
+TERMINADO = "Terminado"
+ERROR = "Error"
+
+# Los resultados se conservan solo un rato (ver ColaTrabajos), así que por defecto van a un directorio temporal
+# del sistema y no a la carpeta del proyecto. Se puede cambiar con la variable de entorno DIRECTORIO_TRABAJOS
+# (todos los procesos que comparten la tabla de trabajos tienen que usar el mismo directorio).
+DIRECTORIO_TRABAJOS = os.environ.get("DIRECTORIO_TRABAJOS", os.path.join(tempfile.gettempdir(), "reclamos_trabajos"))
+
+
+class ColaTrabajos:
+    """
+    Cola de trabajos en segundo plano, para sacar de los pedidos HTTP las tareas pesadas (reportes, exportaciones).
+    Los trabajos se ejecutan en un pool de hilos propio y su estado se guarda en la tabla trabajos de la base
+    (creada por las migraciones), así que no hace falta ningún servicio externo. El resultado de cada trabajo se escribe en un archivo
+    del directorio de trabajos y se conserva durante un tiempo después de terminar.
+
+    Varios procesos del servidor pueden compartir la tabla: cada trabajo guarda el proceso que lo ejecuta
+    (host:pid), y ese proceso renueva periódicamente su latido mientras el trabajo no termina. Un trabajo
+    sin terminar se da por interrumpido si su latido es viejo (el proceso se cayó) o si es de un proceso
+    anterior con el mismo host:pid; los trabajos de los demás procesos vivos no se tocan.
+
+    Cada tipo de trabajo se registra con registrar_tarea. La tarea recibe una sesión de base de datos propia
+    (que se cierra al terminar) y los parámetros del trabajo, y devuelve:
+        - una tupla (partes, mime, nombre_archivo), con partes un iterador de bytes (o bytes), o
+        - un valor serializable a JSON, que se guarda como resultado application/json.
+    """
+    def __init__(self, fabrica_sesiones, directorio=DIRECTORIO_TRABAJOS, hilos=2, conservar=timedelta(hours=1),
+                 al_terminar=None, latido=timedelta(seconds=30), proceso=None):
+        """
+        Inicializa la cola.
+        Args:
+            fabrica_sesiones (sessionmaker): Crea las sesiones para la tabla de trabajos y para las tareas.
+            directorio (str): Directorio donde se guardan los resultados.
+            hilos (int): Cantidad de trabajos que se ejecutan a la vez.
+            conservar (timedelta): Tiempo que se conservan los trabajos terminados y sus resultados.
+            al_terminar (callable): Se llama sin argumentos en el hilo del trabajo al terminar cada uno (por
+                ejemplo, para liberar la sesión por hilo que hayan usado los repositorios compartidos).
+            latido (timedelta): Cada cuánto se renueva el latido de los trabajos de este proceso. Los trabajos
+                sin terminar cuyo latido tiene más de tres intervalos se marcan como interrumpidos.
+            proceso (str): Identificador de este proceso en la tabla (por defecto, host:pid).
+        """
+        if not isinstance(hilos, int) or hilos <= 0:
+            raise ValueError("La cantidad de hilos debe ser un entero positivo")
+        self.__fabrica_sesiones = fabrica_sesiones
+        self.__directorio = directorio
+        self.__conservar = conservar
+        self.__al_terminar = al_terminar
+        self.__latido = latido
+        self.__proceso = proceso or f"{socket.gethostname()}:{os.getpid()}"
+        self.__tareas = {}
+        self.__futuros = {}
+        self.__lock = threading.Lock()
+        self.__pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="trabajos")
+        os.makedirs(directorio, exist_ok=True)
+        # Los trabajos que quedaron sin terminar en un proceso anterior con el mismo host:pid no se pueden retomar
+        self.__marcar_interrumpidos(ModeloTrabajo.proceso == self.__proceso)
+        self.__detenido = threading.Event()
+        self.__hilo_latido = threading.Thread(target=self.__latir, name="trabajos-latido", daemon=True)
+        self.__hilo_latido.start()
+
+    def registrar_tarea(self, tipo, funcion, validar=None):
+        """
+        Registra un tipo de trabajo.
+        Args:
+            tipo (str): Nombre del tipo de trabajo.
+            funcion (callable): funcion(sesion, **parametros), ver la documentación de la clase.
+            validar (callable): validar(**parametros), se llama al enviar el trabajo y debe lanzar ValueError
+                si los parámetros no son válidos, para informarlo antes de encolar el trabajo.
+        """
+        self.__tareas[tipo] = (funcion, validar)
+
+    def enviar(self, tipo, id_usuario=None, **parametros):
+        """
+        Encola un trabajo y devuelve su id sin esperar a que se ejecute.
+        Args:
+            tipo (str): Tipo de trabajo registrado.
+            id_usuario (int): Usuario que pidió el trabajo (solo él puede consultarlo).
+            **parametros: Parámetros de la tarea (deben ser serializables a JSON).
+        Returns:
+            str: Id del trabajo.
+        Raises:
+            ValueError: Si el tipo no está registrado o los parámetros no son válidos.
+        """
+        if tipo not in self.__tareas:
+            raise ValueError(f"Tipo de trabajo desconocido: {tipo}")
+        funcion, validar = self.__tareas[tipo]
+        if validar is not None:
+            validar(**parametros)
+        self.limpiar()
+
+        id_trabajo = uuid.uuid4().hex
+        with self.__fabrica_sesiones.begin() as sesion:
+            ahora = datetime.now()
+            sesion.add(ModeloTrabajo(id_trabajo=id_trabajo, tipo=tipo, parametros=json.dumps(parametros),
+                                     estado=PENDIENTE, id_usuario=id_usuario, creado=ahora,
+                                     proceso=self.__proceso, latido=ahora))
+        futuro = self.__pool.submit(self.__ejecutar, id_trabajo, funcion, parametros)
+        with self.__lock:
+            self.__futuros[id_trabajo] = futuro
+        futuro.add_done_callback(lambda _: self.__olvidar(id_trabajo))
+        return id_trabajo
+
+    def __latir(self):
+        '''Renueva el latido de los trabajos sin terminar de este proceso y marca los abandonados por otros.'''
+        while not self.__detenido.wait(self.__latido.total_seconds()):
+            with self.__fabrica_sesiones.begin() as sesion:
+                sesion.query(ModeloTrabajo).filter(ModeloTrabajo.proceso == self.__proceso,
+                                                   ModeloTrabajo.estado.in_((PENDIENTE, EN_CURSO))).update(
+                    {"latido": datetime.now()}, synchronize_session=False)
+            self.__marcar_interrumpidos()
+
+    def __marcar_interrumpidos(self, *condiciones):
+        '''Marca como error los trabajos sin terminar con el latido vencido (o que cumplen alguna condición).'''
+        vencido = datetime.now() - 3 * self.__latido
+        with self.__fabrica_sesiones.begin() as sesion:
+            sesion.query(ModeloTrabajo).filter(
+                ModeloTrabajo.estado.in_((PENDIENTE, EN_CURSO)),
+                or_(ModeloTrabajo.latido.is_(None), ModeloTrabajo.latido < vencido, *condiciones)).update(
+                {"estado": ERROR, "error": "Interrumpido: el proceso que lo ejecutaba terminó",
+                 "terminado": datetime.now()}, synchronize_session=False)
+
+    def __olvidar(self, id_trabajo):
+        with self.__lock:
+            self.__futuros.pop(id_trabajo, None)
+
+    def __ejecutar(self, id_trabajo, funcion, parametros):
+        '''Ejecuta un trabajo en un hilo del pool y guarda su resultado y su estado.'''
+        self.__actualizar(id_trabajo, estado=EN_CURSO)
+        try:
+            sesion = self.__fabrica_sesiones()
+            try:
+                resultado = funcion(sesion, **parametros)
+                if isinstance(resultado, tuple):
+                    partes, mime, nombre = resultado
+                else:
+                    partes, mime, nombre = json.dumps(resultado, default=str).encode("utf-8"), "application/json", None
+                ruta = self.__guardar_resultado(id_trabajo, partes)
+            finally:
+                sesion.close()
+        except Exception as e:
+            self.__actualizar(id_trabajo, estado=ERROR, error=str(e)[:500], terminado=datetime.now())
+        else:
+            self.__actualizar(id_trabajo, estado=TERMINADO, ruta_resultado=ruta, mime=mime, nombre_archivo=nombre,
+                              terminado=datetime.now())
+        finally:
+            if self.__al_terminar is not None:
+                self.__al_terminar()
+
+    def __guardar_resultado(self, id_trabajo, partes):
+        '''Escribe el resultado de a partes en un archivo temporal y lo renombra al terminar.'''
+        ruta = os.path.join(self.__directorio, id_trabajo)
+        if isinstance(partes, bytes):
+            partes = (partes,)
+        descriptor, temporal = tempfile.mkstemp(dir=self.__directorio, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as archivo:
+                for parte in partes:
+                    archivo.write(parte)
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.remove(temporal)
+            raise
+        return ruta
+
+    def __actualizar(self, id_trabajo, **valores):
+        with self.__fabrica_sesiones.begin() as sesion:
+            sesion.query(ModeloTrabajo).filter(ModeloTrabajo.id_trabajo == id_trabajo).update(valores)
+
+    def estado(self, id_trabajo, id_usuario=None):
+        """
+        Devuelve el estado de un trabajo.
+        Args:
+            id_trabajo (str): Id del trabajo.
+            id_usuario (int): Si se indica, el trabajo solo se devuelve si lo pidió ese usuario.
+        Returns:
+            dict or None: Claves "id_trabajo", "tipo", "estado", "creado", "terminado" y "error",
+                o None si el trabajo no existe (o es de otro usuario).
+        """
+        with self.__fabrica_sesiones() as sesion:
+            trabajo = self.__buscar(sesion, id_trabajo, id_usuario)
+            if trabajo is None:
+                return None
+            return {
+                "id_trabajo": trabajo.id_trabajo,
+                "tipo": trabajo.tipo,
+                "estado": trabajo.estado,
+                "creado": trabajo.creado.isoformat(),
+                "terminado": trabajo.terminado.isoformat() if trabajo.terminado else None,
+                "error": trabajo.error
+            }
+
+    def resultado(self, id_trabajo, id_usuario=None):
+        """
+        Devuelve el resultado de un trabajo terminado.
+        Returns:
+            tuple or None: (ruta, mime, nombre_archivo), o None si el trabajo no existe o no terminó bien.
+        """
+        with self.__fabrica_sesiones() as sesion:
+            trabajo = self.__buscar(sesion, id_trabajo, id_usuario)
+            if trabajo is None or trabajo.estado != TERMINADO or not os.path.exists(trabajo.ruta_resultado):
+                return None
+            return trabajo.ruta_resultado, trabajo.mime, trabajo.nombre_archivo
+
+    @staticmethod
+    def __buscar(sesion, id_trabajo, id_usuario):
+        trabajo = sesion.get(ModeloTrabajo, id_trabajo)
+        if trabajo is None or (id_usuario is not None and trabajo.id_usuario != id_usuario):
+            return None
+        return trabajo
+
+    def esperar(self, id_trabajo, timeout=None):
+        """Espera a que termine el trabajo (si sigue en ejecución en este proceso) y devuelve su estado."""
+        with self.__lock:
+            futuro = self.__futuros.get(id_trabajo)
+        if futuro is not None:
+            futuro.result(timeout)
+        return self.estado(id_trabajo)
+
+    def limpiar(self):
+        """Borra los trabajos terminados hace más del tiempo a conservar, junto con sus resultados."""
+        self.__marcar_interrumpidos()
+        limite = datetime.now() - self.__conservar
+        with self.__fabrica_sesiones.begin() as sesion:
+            viejos = sesion.query(ModeloTrabajo).filter(ModeloTrabajo.terminado < limite).all()
+            for trabajo in viejos:
+                if trabajo.ruta_resultado and os.path.exists(trabajo.ruta_resultado):
+                    os.remove(trabajo.ruta_resultado)
+                sesion.delete(trabajo)
+
+    def cerrar(self):
+        """Espera a que terminen los trabajos en ejecución y libera el pool de hilos."""
+        self.__pool.shutdown(wait=True)
+        self.__detenido.set()
+        self.__hilo_latido.join()
@@ -1,6 +1,23 @@
 # modules/utils.py
 from flask import flash, redirect, url_for
 
+# Nombres que devuelve el clasificador -> nombres de departamento que usa el resto del código
+NORMALIZACIONES_DEPARTAMENTO = {
+    "maestranza": "Maestranza",
+    "soporte informático": "Soporte_Informatico",
+    "secretaría técnica": "Secretaria_Tecnica"
+}
+
+def normalizar_nombre_departamento(departamento):
+    """
+    Normaliza el nombre de un departamento sin depender de Flask (para usar fuera de una petición).
+    Parámetros:
+        departamento (str): Nombre del departamento a normalizar.
+    Retorna:
+        str: Nombre normalizado, o None si el departamento no es reconocido.
+    """
+    return NORMALIZACIONES_DEPARTAMENTO.get(departamento.lower())
+
 def normalizar_departamento(departamento):
     """
     Normaliza el nombre de un departamento a un formato estándar.
@@ -13,15 +30,9 @@ def normalizar_departamento(departamento):
     Nota:
         Esta función depende de los métodos 'flash' y 'redirect' de Flask, así como de 'url_for'.
     """
-    normalizaciones = {
-        "maestranza": "Maestranza",
-        "soporte informático": "Soporte_Informatico",
-        "secretaría técnica": "Secretaria_Tecnica"
-    }
-
-    clave = departamento.lower()
-    if clave not in normalizaciones:
+    normalizado = normalizar_nombre_departamento(departamento)
+    if normalizado is None:
         flash(f"Departamento no reconocido: '{departamento}'", 'danger')
         return redirect(url_for('inicio'))
 
-    return normalizaciones[clave]
\ No newline at end of file
+    return normalizado
\ No newline at end of file
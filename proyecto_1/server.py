@@ -1,21 +1,78 @@
-from flask import render_template, request, redirect, url_for, flash, session
+from flask import render_template, request, redirect, url_for, flash, session, jsonify, send_file, stream_with_context
 from modules.config import app
 from modules.gestor_reclamos import GestorDeReclamos
 from modules.gestor_usuarios import GestorDeUsuarios
 from modules.factoria import crear_repositorio
+from modules.base_datos import crear_engine, liberar_sesion_por_hilo, metricas_pool
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
 from modules.analitica import Analitica
 from werkzeug.utils import secure_filename
 from modules.clasificador import Clasificador
 from modules.setup_nltk import prechequeo_nltk
 from modules.utils import normalizar_departamento
-from flask import send_file
+from modules.buscador_similares import BuscadorReclamosSimilares
+from modules.agregados import AgregadosReclamos
+from modules.cola_urgencia import ColaUrgenciaReclamos
+from modules.cache_graficos import CacheGraficos
+from modules.instantanea_reclamos import InstantaneaReclamos
+from flask import Response
+from modules.cache_tokens import CacheLRU
+from modules.reportes_masivos import generar_reportes_masivos
+from modules.fabrica_exportadores import obtener_exportador, obtener_exportador_datos
+from modules.trabajos import ColaTrabajos, ERROR, TERMINADO
+from modules.series_temporales import COLUMNAS_SERIE, NOMBRES_PERIODOS, PERIODO_SERIE
+import json
 import os
 
 repo_reclamo, repo_usuario = crear_repositorio()
-gestor_reclamos = GestorDeReclamos(repo_reclamo)
-gestor_usuarios = GestorDeUsuarios(repo_usuario)
+buscador_similares = BuscadorReclamosSimilares(repo_reclamo)
+agregados_reclamos = AgregadosReclamos(repo_reclamo)
+cola_urgencia = ColaUrgenciaReclamos(repo_reclamo)
+instantanea_reclamos = InstantaneaReclamos(repo_reclamo)
+# Va después de agregados_reclamos en la lista de observadores para dibujar con los agregados ya actualizados
+graficos_reclamos = CacheGraficos(agregados_reclamos, pre_renderizar=True)
+gestor_reclamos = GestorDeReclamos(repo_reclamo, observadores=[buscador_similares, agregados_reclamos, cola_urgencia,
+                                                               instantanea_reclamos, graficos_reclamos])
+gestor_usuarios = GestorDeUsuarios(repo_usuario, observadores=[cola_urgencia])
+# Reportes ya generados, por departamento, formato y huella de los reclamos en la base (ver Analitica)
+reportes_generados = CacheLRU(tamano_maximo=16)
 prechequeo_nltk.asegurar_recursos_nltk()
 clasificador = Clasificador()
+# Trabajos en segundo plano (reportes y exportaciones); cada uno usa su propia sesión de base de datos
+cola_trabajos = ColaTrabajos(crear_engine(), al_terminar=liberar_sesion_por_hilo)
+
+
+def _analitica_de_trabajo(sesion):
+    return Analitica(RepositorioReclamosSQLAlchemy(sesion), agregados_reclamos, graficos_reclamos, reportes_generados,
+                     instantanea_reclamos)
+
+def _trabajo_analiticas(sesion, departamento, periodo=PERIODO_SERIE):
+    stats = _analitica_de_trabajo(sesion).generar_estadisticas(departamento, periodo)
+    return {clave: valor for clave, valor in stats.items() if not clave.startswith("imagen_")}
+
+def _trabajo_reporte(sesion, departamento, formato):
+    return _analitica_de_trabajo(sesion).exportar_por_partes(departamento, formato)
+
+def _trabajo_datos(sesion, departamento, formato):
+    return _analitica_de_trabajo(sesion).exportar_datos_por_partes(departamento, formato)
+
+def _trabajo_reportes_masivos(sesion, formatos="pdf,html"):
+    salida = generar_reportes_masivos(RepositorioReclamosSQLAlchemy(sesion), tuple(formatos.split(",")),
+                                      informar=app.logger.info)
+    return salida.getvalue(), "application/zip", "reportes.zip"
+
+def _validar_formatos(formatos="pdf,html"):
+    for formato in formatos.split(","):
+        obtener_exportador(formato)
+
+def _validar_periodo(departamento, periodo=PERIODO_SERIE):
+    if periodo not in NOMBRES_PERIODOS:
+        raise ValueError(f"Período inválido: {periodo}")
+
+cola_trabajos.registrar_tarea("analiticas", _trabajo_analiticas, _validar_periodo)
+cola_trabajos.registrar_tarea("reporte", _trabajo_reporte, lambda departamento, formato: obtener_exportador(formato))
+cola_trabajos.registrar_tarea("datos", _trabajo_datos, lambda departamento, formato: obtener_exportador_datos(formato))
+cola_trabajos.registrar_tarea("reportes_masivos", _trabajo_reportes_masivos, _validar_formatos)
 
 
 #cargar jefes por sistema
@@ -25,6 +82,13 @@ clasificador = Clasificador()
 '''
 
 
+@app.teardown_appcontext
+def liberar_sesion_bd(excepcion=None):
+    # Cada pedido usa su propia sesión de base de datos (ver modules/base_datos.py); al terminar se cierra
+    # y su conexión vuelve al pool
+    liberar_sesion_por_hilo()
+
+
 RUTAS_POR_ROL = {
     'Jefe_Secretaria_Tecnica': 'jefe_dashboard',
     'Jefe_Maestranza': 'jefe_dashboard',
@@ -140,8 +204,8 @@ def crear_reclamo():
             ruta_completa = os.path.join(ruta_directorio, filename)
             imagen.save(ruta_completa)
             r_imagen = f"images/reclamos/{filename}"
-    # 5 Busqueda de reclamos similares
-        reclamos_similares = gestor_reclamos.obtener_reclamos_departamento(departamento)
+    # 5 Busqueda de reclamos similares (solo los mas parecidos entre los no resueltos)
+        reclamos_similares = buscador_similares.buscar_reclamos(contenido, departamento)
         if reclamos_similares:
             # Guardar temporalmente los datos del nuevo reclamo en la sesión
             session['nuevo_reclamo'] = {
@@ -194,15 +258,18 @@ def listar_reclamos():
     if 'id' not in session:
         flash('Debes iniciar sesión primero', 'warning')
         return redirect(url_for('inicio'))
-    page = request.args.get('page', 1, type=int)
     per_page = 20
     departamento = request.args.get('departamento')
+    # Paginación por cursor: "antes" y "despues" son ids de reclamo (ver listar_reclamos_por_cursor)
+    antes = request.args.get('antes', type=int)
+    despues = request.args.get('despues', type=int)
     try:
-        reclamos, total = gestor_reclamos.listar_reclamos_paginados(page=page, per_page=per_page,departamento=departamento)
-        return render_template("listar_reclamos.html", reclamos=reclamos, page=page, per_page=per_page, total=total)
+        reclamos, pagina = gestor_reclamos.listar_reclamos_por_cursor(per_page=per_page, departamento=departamento,
+                                                                      antes_de=antes, despues_de=despues)
+        return render_template("listar_reclamos.html", reclamos=reclamos, pagina=pagina, departamento=departamento)
     except Exception as e:
         flash(str(e), 'danger')
-        return render_template("listar_reclamos.html", reclamos=[], page=1, per_page=per_page, total=0)
+        return render_template("listar_reclamos.html", reclamos=[], pagina=None, departamento=departamento)
 
 
 
@@ -239,6 +306,11 @@ def mis_reclamos():
         flash('Error al listar los reclamos: ' + str(e), 'danger')
     return render_template("mis_reclamos.html")
 
+def _es_jefe_de(departamento):
+    # Igual que en jefe_dashboard, el departamento de un jefe sale de su rol (Jefe_<departamento>)
+    rol = session.get('rol') or ''
+    return rol.startswith("Jefe_") and rol.removeprefix("Jefe_") == departamento
+
 @app.route('/jefe_dashboard')
 def jefe_dashboard():
     if 'id' not in session:
@@ -258,9 +330,32 @@ def ver_analiticas(departamento):
         flash('Debes iniciar sesión primero', 'warning')
         return redirect(url_for('inicio'))
 
-    # Generar estadísticas del departamento
-    analitica = Analitica(repo_reclamo)  
-    stats = analitica.generar_estadisticas(departamento)
+    # Las estadísticas se generan en el trabajo "analiticas": la primera visita lo envía y la página espera
+    # su resultado (la consulta y los gráficos no bloquean el hilo de la petición)
+    periodo = request.args.get('periodo', PERIODO_SERIE)
+    if periodo not in NOMBRES_PERIODOS:
+        flash('Período inválido, se muestra la evolución por semana', 'warning')
+        periodo = PERIODO_SERIE
+    id_trabajo = request.args.get('trabajo')
+    estado = cola_trabajos.estado(id_trabajo, id_usuario=session['id']) if id_trabajo else None
+    resultado = cola_trabajos.resultado(id_trabajo, id_usuario=session['id']) if estado else None
+    if estado is None or estado["tipo"] != 'analiticas' or (estado["estado"] == TERMINADO and resultado is None):
+        # Sin trabajo, o con uno de otro usuario o cuyo resultado ya se borró: se envía uno nuevo
+        id_trabajo = cola_trabajos.enviar('analiticas', id_usuario=session['id'], departamento=departamento,
+                                          periodo=periodo)
+        return redirect(url_for('ver_analiticas', departamento=departamento, periodo=periodo, trabajo=id_trabajo))
+
+    if resultado is None:
+        # Todavía en curso (o con error): la página consulta el estado y se recarga al terminar
+        return render_template(
+            'ver_analiticas.html',
+            departamento=departamento,
+            periodo=periodo,
+            trabajo=url_for('estado_trabajo', id_trabajo=id_trabajo),
+            error=estado["error"] if estado["estado"] == ERROR else None
+        )
+    with open(resultado[0], encoding='utf-8') as archivo:
+        stats = json.load(archivo)
 
     return render_template(
         'ver_analiticas.html',  
@@ -269,8 +364,14 @@ def ver_analiticas(departamento):
         porcentajes=stats["porcentajes"],
         mediana_proceso=stats["mediana_proceso"], 
         mediana_resueltos=stats["mediana_resueltos"],
+        p90_proceso=stats["p90_proceso"],
+        p90_resueltos=stats["p90_resueltos"],
         ruta_nube=stats["ruta_nube"],
-        ruta_torta=stats["ruta_torta"]
+        ruta_torta=stats["ruta_torta"],
+        periodo=periodo,
+        periodos=NOMBRES_PERIODOS,
+        serie=stats["serie"],
+        columnas_serie=COLUMNAS_SERIE
     )
 
 
@@ -279,12 +380,23 @@ def manejar_reclamos(departamento):
     page = request.args.get('page', 1, type=int)
     per_page = 20
     rol = session.get('rol')
+    # orden=urgencia muestra primero los reclamos activos más urgentes (ver modules/cola_urgencia.py)
+    orden = request.args.get('orden', 'recientes')
+    pagina = None
     try:
-        reclamos, total = gestor_reclamos.listar_reclamos_paginados(page=page, per_page=per_page, departamento=departamento)
-        return render_template("manejar_reclamos.html", reclamos=reclamos,departamento=departamento, page=page, per_page=per_page, total=total, rol=rol)
+        if orden == 'urgencia':
+            reclamos = cola_urgencia.listar_reclamos_urgentes(departamento, per_page, desde=(page - 1) * per_page)
+            total = cola_urgencia.cantidad(departamento)
+        else:
+            # Los más recientes se paginan por cursor ("antes"/"despues"), así cualquier página cuesta lo mismo
+            reclamos, pagina = gestor_reclamos.listar_reclamos_por_cursor(
+                per_page=per_page, departamento=departamento,
+                antes_de=request.args.get('antes', type=int), despues_de=request.args.get('despues', type=int))
+            total = pagina["total"]
+        return render_template("manejar_reclamos.html", reclamos=reclamos,departamento=departamento, page=page, per_page=per_page, total=total, pagina=pagina, rol=rol, orden=orden)
     except Exception as e:
         flash(str(e), 'danger')
-        return render_template("manejar_reclamos.html", reclamos=[], departamento=departamento, page=1, per_page=per_page, total=0)
+        return render_template("manejar_reclamos.html", reclamos=[], departamento=departamento, page=1, per_page=per_page, total=0, pagina=None, orden=orden)
 
 
 @app.route('/iniciar_resolucion/<int:id_reclamo>', methods=['GET', 'POST'])
@@ -368,27 +480,106 @@ def derivar_reclamo(id_reclamo):
 
     return redirect(url_for('manejar_reclamos',departamento = reclamo.departamento))
 
+# Las descargas de un solo departamento siguen siendo directas (además de los trabajos): se envían por partes,
+# con memoria acotada, y la página de analítica las pide como trabajo. Los reportes de todos los departamentos
+# solo se generan como trabajo (POST /trabajos/reportes_masivos).
 @app.route('/analiticas/<departamento>/reporte.<formato>')
 def descargar_reporte(departamento, formato):
     if 'id' not in session:
         flash('Debes iniciar sesión primero', 'warning')
         return redirect(url_for('inicio'))
 
-    analitica = Analitica(repo_reclamo)
+    analitica = Analitica(repo_reclamo, agregados_reclamos, graficos_reclamos, reportes_generados,
+                          instantanea_reclamos)
+
+    try:
+        partes, mime, filename = analitica.exportar_por_partes(departamento, formato)
+    except ValueError as e:
+        flash(str(e), 'danger')
+        return redirect(url_for('jefe_dashboard'))
+
+    # El reporte se envía a medida que se genera, sin armarlo entero antes de responder
+    return Response(
+        stream_with_context(partes),
+        mimetype=mime,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/analiticas/<departamento>/datos.<formato>')
+def descargar_datos(departamento, formato):
+    if 'id' not in session:
+        flash('Debes iniciar sesión primero', 'warning')
+        return redirect(url_for('inicio'))
+    # Los datos incluyen el contenido de cada reclamo: solo los descarga el jefe del departamento
+    if not _es_jefe_de(departamento):
+        flash("No tienes permisos para descargar los datos de este departamento", "danger")
+        return redirect(url_for('inicio'))
+
+    analitica = Analitica(repo_reclamo, agregados_reclamos, graficos_reclamos, reportes_generados,
+                          instantanea_reclamos)
 
     try:
-        buffer, mime, filename = analitica.exportar_archivo(departamento, formato)
+        partes, mime, filename = analitica.exportar_datos_por_partes(departamento, formato)
     except ValueError as e:
         flash(str(e), 'danger')
         return redirect(url_for('jefe_dashboard'))
 
-    return send_file(
-        buffer,
-        as_attachment=True,
-        download_name=filename,
-        mimetype=mime
+    # Las filas se leen de la base y se envían por lotes, sin cargar todos los reclamos en memoria
+    return Response(
+        stream_with_context(partes),
+        mimetype=mime,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
+@app.route('/trabajos/<tipo>', methods=['POST'])
+def enviar_trabajo(tipo):
+    if 'id' not in session:
+        return jsonify(error='Debes iniciar sesión primero'), 401
+    if tipo == 'reportes_masivos' and session.get('rol') != 'Jefe_Secretaria_Tecnica':
+        return jsonify(error='No tienes permisos para generar los reportes de todos los departamentos'), 403
+    if tipo == 'datos' and not _es_jefe_de(request.values.get('departamento')):
+        return jsonify(error='No tienes permisos para descargar los datos de este departamento'), 403
+
+    try:
+        id_trabajo = cola_trabajos.enviar(tipo, id_usuario=session['id'], **request.values.to_dict())
+    except (ValueError, TypeError) as e:
+        return jsonify(error=str(e)), 400
+
+    # Se responde enseguida; el cliente consulta el estado hasta que el resultado esté listo
+    return jsonify(
+        id_trabajo=id_trabajo,
+        estado=url_for('estado_trabajo', id_trabajo=id_trabajo),
+        resultado=url_for('resultado_trabajo', id_trabajo=id_trabajo)
+    ), 202
+
+@app.route('/trabajos/<id_trabajo>')
+def estado_trabajo(id_trabajo):
+    if 'id' not in session:
+        return jsonify(error='Debes iniciar sesión primero'), 401
+    estado = cola_trabajos.estado(id_trabajo, id_usuario=session['id'])
+    if estado is None:
+        return jsonify(error='Trabajo inexistente'), 404
+    return jsonify(estado)
+
+@app.route('/trabajos/<id_trabajo>/resultado')
+def resultado_trabajo(id_trabajo):
+    if 'id' not in session:
+        return jsonify(error='Debes iniciar sesión primero'), 401
+    resultado = cola_trabajos.resultado(id_trabajo, id_usuario=session['id'])
+    if resultado is None:
+        estado = cola_trabajos.estado(id_trabajo, id_usuario=session['id'])
+        if estado is None:
+            return jsonify(error='Trabajo inexistente'), 404
+        return jsonify(estado), 409
+    ruta, mime, nombre = resultado
+    return send_file(os.path.abspath(ruta), mimetype=mime, as_attachment=nombre is not None, download_name=nombre)
+
+@app.route('/metricas/bd')
+def ver_metricas_bd():
+    if session.get('rol') != 'Jefe_Secretaria_Tecnica':
+        return jsonify(error='No tienes permisos para ver las métricas'), 403
+    return jsonify(metricas_pool())
+
 @app.route('/logout')
 def logout():
     session.clear() 
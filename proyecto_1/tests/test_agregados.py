@@ -0,0 +1,127 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, text, update
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base, ModeloReclamo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.agregados import AgregadosReclamos
+from modules.dominio import Reclamo
+
+
+class TestAgregadosReclamos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.agregados = AgregadosReclamos(self.repo)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.agregados])
+
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Luz quemada en el aula", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Piso sucio", "Maestranza", 4)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 2)
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Wifi lento", "Soporte_Informatico", None)
+
+    def editar(self, id_reclamo, **cambios):
+        r = self.repo.obtener_registro_por_filtro("id_reclamo", id_reclamo)
+        datos = dict(estado=r.estado, departamento=r.departamento, tiempo_en_proceso=r.tiempo_en_proceso)
+        datos.update(cambios)
+        self.gestor.editar_Reclamo(r.id_reclamo, r.id_creador, datos["estado"], r.contenido, datos["departamento"],
+                                   datos["tiempo_en_proceso"], r.r_imagen, r.fecha_y_hora)
+
+    def test_resumen_inicial(self):
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual(resumen["total"], 3)
+        self.assertEqual(resumen["conteo"]["Pendiente"], 1)
+        self.assertEqual(resumen["mediana_proceso"], 4)
+        self.assertEqual(resumen["mediana_resueltos"], 2)
+        self.assertEqual(resumen["palabras"]["luz"], 1)
+
+    def test_alta_actualiza_resumen(self):
+        self.agregados.obtener_resumen("Maestranza")
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Luz del pasillo", "Maestranza", 6)
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual(resumen["total"], 4)
+        self.assertEqual(resumen["mediana_proceso"], 5)
+        self.assertEqual(resumen["palabras"]["luz"], 2)
+
+    def test_notificacion_de_un_reclamo_ya_contado(self):
+        # Reclamo guardado antes de calcular los agregados pero notificado después (dos hilos a la vez)
+        self.repo.guardar_registro(Reclamo(None, 1, "En proceso", "Luz del pasillo", "Maestranza",
+                                           tiempo_en_proceso=6))
+        nuevo = self.repo.obtener_registro_por_filtro("contenido", "Luz del pasillo")
+        self.assertEqual(self.agregados.obtener_resumen("Maestranza")["total"], 4)
+        self.agregados.reclamo_agregado(nuevo)
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual((resumen["total"], resumen["mediana_proceso"], resumen["palabras"]["luz"]), (4, 5, 2))
+        # Un cambio que la consulta ya vio (resuelto) se notifica con el estado anterior
+        self.editar(nuevo.id_reclamo, estado="Resuelto")
+        self.agregados.reclamo_modificado(nuevo, self.repo.obtener_registro_por_filtro("id_reclamo", nuevo.id_reclamo))
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual(resumen["conteo"], {"Pendiente": 1, "En proceso": 1, "Resuelto": 2})
+
+    def test_cambio_de_estado_actualiza_resumen(self):
+        version = self.agregados.obtener_resumen("Maestranza")["version"]
+        self.editar(2, estado="Resuelto")
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual(resumen["conteo"]["Resuelto"], 2)
+        self.assertNotIn("En proceso", resumen["conteo"])
+        self.assertIsNone(resumen["mediana_proceso"])
+        self.assertEqual(resumen["mediana_resueltos"], 3)
+        self.assertAlmostEqual(resumen["p90_resueltos"], 3.8)
+        self.assertGreater(resumen["version"], version)
+
+    def test_derivar_mueve_el_reclamo_de_departamento(self):
+        self.agregados.obtener_resumen("Maestranza")
+        self.agregados.obtener_resumen("Soporte_Informatico")
+        self.editar(1, departamento="Soporte_Informatico")
+        self.assertEqual(self.agregados.obtener_resumen("Maestranza")["total"], 2)
+        self.assertEqual(self.agregados.obtener_resumen("Maestranza")["palabras"]["luz"], 0)
+        self.assertEqual(self.agregados.obtener_resumen("Soporte_Informatico")["total"], 2)
+
+    def test_coincide_con_un_calculo_desde_cero(self):
+        self.agregados.obtener_resumen("Maestranza")
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Ventana rota", "Maestranza", 9)
+        self.editar(1, estado="En proceso", tiempo_en_proceso=1)
+        self.editar(3, estado="Invalido", tiempo_en_proceso=None)
+        incremental = self.agregados.obtener_resumen("Maestranza")
+        desde_cero = AgregadosReclamos(self.repo).obtener_resumen("Maestranza")
+        for clave in ("total", "conteo", "mediana_proceso", "mediana_resueltos", "p90_proceso", "p90_resueltos", "palabras"):
+            self.assertEqual(incremental[clave], desde_cero[clave], clave)
+
+    def test_sincroniza_cambios_de_otros_procesos(self):
+        version = self.agregados.obtener_resumen("Maestranza")["version"]
+        # Otro proceso (sin notificar a los agregados) resuelve un reclamo, cambia el texto de otro y agrega uno
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 2)
+                             .values(estado="Resuelto", tiempo_en_proceso=6))
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 3).values(contenido="Banco roto"))
+        self.session.commit()
+        self.repo.importar_filas(("id_creador", "estado", "contenido", "departamento", "fecha_y_hora"),
+                                 [[(1, "Pendiente", "Luz del pasillo", "Maestranza", datetime(2025, 1, 1))]])
+        self.agregados.sincronizar()
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        desde_cero = AgregadosReclamos(self.repo).obtener_resumen("Maestranza")
+        for clave in ("total", "conteo", "mediana_proceso", "mediana_resueltos", "p90_proceso", "p90_resueltos", "palabras"):
+            self.assertEqual(resumen[clave], desde_cero[clave], clave)
+        self.assertGreater(resumen["version"], version)
+
+        # Volver a sincronizar sin cambios nuevos no cambia la versión
+        version = resumen["version"]
+        self.agregados.sincronizar()
+        self.assertEqual(self.agregados.obtener_resumen("Maestranza")["version"], version)
+
+        # Una baja no deja filas modificadas: se detecta por el total del departamento
+        self.session.execute(text("DELETE FROM reclamos WHERE id_reclamo = 1"))
+        self.session.commit()
+        self.agregados.sincronizar()
+        resumen = self.agregados.obtener_resumen("Maestranza")
+        self.assertEqual((resumen["total"], resumen["palabras"]["luz"]), (3, 1))
+        self.assertGreater(resumen["version"], version)
+
+
+if __name__ == '__main__':
+    unittest.main()
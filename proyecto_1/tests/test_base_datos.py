@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from sqlalchemy import text
+from modules.base_datos import (crear_engine, liberar_sesion_por_hilo, metricas_pool, obtener_engine,
+                                obtener_sesion_por_hilo, POOL_TAMANO)
+from modules.escritor_agrupado import EscritorAgrupado
+from modules.migraciones import MIGRACIONES, version_actual
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.dominio import Reclamo
+
+
+class TestBaseDatos(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        self.url = f"sqlite:///{os.path.join(directorio, 'base.db')}"
+        self.addCleanup(lambda: obtener_engine(self.url).dispose())
+
+    def test_un_engine_migrado_por_url(self):
+        engine = obtener_engine(self.url)
+        self.assertIs(obtener_engine(self.url), engine)
+        self.assertIs(crear_engine(self.url).kw["bind"], engine)
+        self.assertEqual(version_actual(engine), MIGRACIONES[-1][0])
+        self.assertEqual(metricas_pool(self.url)["tamano"], POOL_TAMANO)
+
+    def test_una_sesion_por_hilo(self):
+        sesiones = obtener_sesion_por_hilo(self.url)
+        propia = sesiones()
+        self.assertIs(sesiones(), propia)
+        de_otro_hilo = []
+        hilo = threading.Thread(target=lambda: de_otro_hilo.append(sesiones()))
+        hilo.start()
+        hilo.join()
+        self.assertIsNot(de_otro_hilo[0], propia)
+        liberar_sesion_por_hilo(self.url)
+        self.assertIsNot(sesiones(), propia)
+        liberar_sesion_por_hilo(self.url)
+
+    def test_repositorio_compartido_entre_hilos(self):
+        sesiones = obtener_sesion_por_hilo(self.url)
+        repo = RepositorioReclamosSQLAlchemy(sesiones)
+        gestor = GestorDeReclamos(repo)
+        errores = []
+
+        def crear(i):
+            try:
+                gestor.agregar_nuevo_Reclamo(1, "Pendiente", f"Reclamo {i}", "Maestranza", None)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                liberar_sesion_por_hilo(self.url)
+
+        hilos = [threading.Thread(target=crear, args=(i,)) for i in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+        self.assertEqual(repo.contar_reclamos("Maestranza"), 8)
+        liberar_sesion_por_hilo(self.url)
+        # Al liberar las sesiones todas las conexiones volvieron al pool
+        metricas = metricas_pool(self.url)
+        self.assertEqual(metricas["en_uso"], 0)
+        self.assertGreaterEqual(metricas["prestamos"], 8)
+
+    def test_pragmas_sqlite(self):
+        with obtener_engine(self.url).connect() as conexion:
+            self.assertEqual(conexion.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conexion.execute(text("PRAGMA synchronous")).scalar(), 1)      # NORMAL
+            self.assertEqual(conexion.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+
+    def test_escritor_agrupado(self):
+        sesiones = obtener_sesion_por_hilo(self.url)
+        escritor = EscritorAgrupado(crear_engine(self.url), espera=0.05)
+        self.addCleanup(escritor.cerrar)
+        repo = RepositorioReclamosSQLAlchemy(sesiones, escritor)
+        ids, errores = [], []
+
+        def crear(i):
+            try:
+                reclamo = Reclamo(None, 1, "Pendiente", f"Reclamo {i}", "Maestranza", None)
+                repo.guardar_registro(reclamo)
+                ids.append(reclamo.id_reclamo)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                liberar_sesion_por_hilo(self.url)
+
+        hilos = [threading.Thread(target=crear, args=(i,)) for i in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+        self.assertEqual(sorted(ids), list(range(1, 9)))
+        self.assertEqual(repo.contar_reclamos("Maestranza"), 8)
+        # Las escrituras concurrentes se confirmaron en menos transacciones que escrituras
+        estadisticas = escritor.estadisticas()
+        self.assertEqual(estadisticas["escrituras"], 8)
+        self.assertLess(estadisticas["lotes"], 8)
+
+        # Una escritura que falla no afecta a las demás del lote
+        reclamo = repo.obtener_registro_por_filtro("id_reclamo", ids[0])
+        reclamo.estado = "En proceso"
+        inexistente = repo.obtener_registro_por_filtro("id_reclamo", ids[1])
+        inexistente.id_reclamo = 999
+        resultados = []
+
+        def modificar(entidad):
+            try:
+                repo.modificar_registro(entidad)
+                resultados.append("ok")
+            except ValueError:
+                resultados.append("error")
+            finally:
+                liberar_sesion_por_hilo(self.url)
+
+        hilos = [threading.Thread(target=modificar, args=(e,)) for e in (reclamo, inexistente)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(sorted(resultados), ["error", "ok"])
+        self.assertEqual(repo.obtener_registro_por_filtro("id_reclamo", ids[0]).estado, "En proceso")
+        liberar_sesion_por_hilo(self.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base, ModeloReclamo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.dominio import Reclamo
+from modules.buscador_similares import BuscadorReclamosSimilares, IndiceInvertido
+
+
+def tokenizar(texto):
+    return texto.lower().split()
+
+
+class TestIndiceInvertido(unittest.TestCase):
+
+    def test_buscar_ordena_por_puntaje(self):
+        indice = IndiceInvertido()
+        indice.agregar(1, ["proyector", "aula", "roto"])
+        indice.agregar(2, ["luz", "aula", "quemada"])
+        indice.agregar(3, ["proyector", "roto", "proyector"])
+        resultados = indice.buscar(["proyector", "roto"], k=5)
+        self.assertEqual([id_reclamo for id_reclamo, _ in resultados], [3, 1])
+
+    def test_eliminar_quita_el_reclamo(self):
+        indice = IndiceInvertido()
+        indice.agregar(1, ["proyector", "roto"])
+        indice.eliminar(1)
+        self.assertEqual(len(indice), 0)
+        self.assertEqual(indice.buscar(["proyector"], k=5), [])
+
+    def test_buscar_respeta_k(self):
+        indice = IndiceInvertido()
+        for i in range(10):
+            indice.agregar(i, ["wifi", "lento"])
+        self.assertEqual(len(indice.buscar(["wifi"], k=3)), 3)
+
+
+class TestBuscadorReclamosSimilares(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.buscador = BuscadorReclamosSimilares(self.repo, tokenizador=tokenizar)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.buscador])
+
+    def agregar(self, contenido, departamento="Maestranza", estado="Pendiente"):
+        self.gestor.agregar_nuevo_Reclamo(1, estado, contenido, departamento, None)
+
+    def test_devuelve_solo_reclamos_activos_del_departamento(self):
+        self.agregar("La luz del aula 3 esta quemada")
+        self.agregar("La luz del pasillo esta quemada", estado="Resuelto")
+        self.agregar("La luz del laboratorio no enciende", departamento="Soporte_Informatico")
+        resultados = self.buscador.buscar_reclamos("luz quemada en el aula", "Maestranza")
+        self.assertEqual(len(resultados), 1)
+        reclamo, puntaje = resultados[0]
+        self.assertEqual(reclamo.contenido, "La luz del aula 3 esta quemada")
+        self.assertGreater(puntaje, 0)
+
+    def test_indice_se_actualiza_al_agregar(self):
+        self.agregar("El baño del primer piso esta sucio")
+        self.assertEqual(self.buscador.buscar("proyector roto", "Maestranza"), [])
+        self.agregar("El proyector del aula 2 esta roto")
+        resultados = self.buscador.buscar_reclamos("proyector roto", "Maestranza")
+        self.assertEqual(resultados[0][0].contenido, "El proyector del aula 2 esta roto")
+
+    def test_notificacion_de_un_reclamo_ya_indexado(self):
+        # Reclamo guardado antes de construir el índice pero notificado después
+        self.agregar("El baño del primer piso esta sucio")
+        self.repo.guardar_registro(Reclamo(None, 1, "Pendiente", "El proyector del aula 2 esta roto", "Maestranza"))
+        antes = self.buscador.buscar("proyector roto", "Maestranza")
+        self.buscador.reclamo_agregado(self.repo.obtener_registro_por_filtro("id_reclamo", 2))
+        self.assertEqual(self.buscador.buscar("proyector roto", "Maestranza"), antes)
+
+    def test_indice_se_actualiza_al_resolver(self):
+        self.agregar("El proyector del aula 2 esta roto")
+        reclamo = self.repo.obtener_todos_los_registros()[0]
+        self.assertEqual(len(self.buscador.buscar("proyector", "Maestranza")), 1)
+        self.gestor.editar_Reclamo(reclamo.id_reclamo, reclamo.id_creador, "Resuelto", reclamo.contenido,
+                                   reclamo.departamento, 3, reclamo.r_imagen, reclamo.fecha_y_hora)
+        self.assertEqual(self.buscador.buscar("proyector", "Maestranza"), [])
+
+    def test_sincroniza_cambios_de_otros_procesos(self):
+        self.agregar("El proyector del aula 2 esta roto")
+        self.agregar("La luz del aula 3 esta quemada")
+        self.assertEqual(len(self.buscador.buscar("proyector", "Maestranza")), 1)
+        # Otro proceso (sin notificar al buscador) resuelve el 1, cambia el texto del 2 y agrega uno
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 1).values(estado="Resuelto"))
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 2)
+                             .values(contenido="El proyector del aula 3 no enciende"))
+        self.session.commit()
+        self.repo.guardar_registro(Reclamo(None, 1, "Pendiente", "Proyector roto en el laboratorio", "Maestranza"))
+        self.buscador.sincronizar()
+        self.assertEqual(sorted(id_reclamo for id_reclamo, _ in self.buscador.buscar("proyector", "Maestranza")), [2, 3])
+        self.assertEqual(self.buscador.buscar("quemada", "Maestranza"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.agregados import AgregadosReclamos
+from modules.cache_graficos import CacheGraficos
+from modules.graficador import Graficador
+
+
+class TestCacheGraficos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.agregados = AgregadosReclamos(self.repo)
+        self.graficos = CacheGraficos(self.agregados, self.directorio)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.agregados, self.graficos])
+
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Luz quemada en el aula", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 2)
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Wifi lento", "Soporte_Informatico", None)
+
+        self.torta = mock.patch.object(Graficador, "generar_torta", wraps=Graficador.generar_torta).start()
+        self.nube = mock.patch.object(Graficador, "generar_nube_frecuencias",
+                                      wraps=Graficador.generar_nube_frecuencias).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def obtener(self, departamento="Maestranza"):
+        return self.graficos.obtener_graficos(departamento, self.agregados.obtener_resumen(departamento))
+
+    def test_no_redibuja_si_no_cambian_los_datos(self):
+        primeras = self.obtener()
+        segundas = self.obtener()
+        self.assertEqual(primeras, segundas)
+        self.assertTrue(os.path.exists(primeras["ruta_torta"]))
+        self.assertTrue(os.path.exists(primeras["ruta_nube"]))
+        self.assertEqual(self.torta.call_count, 1)
+        self.assertEqual(self.nube.call_count, 1)
+
+    def test_archivos_distintos_por_departamento(self):
+        maestranza = self.obtener("Maestranza")
+        soporte = self.obtener("Soporte_Informatico")
+        self.assertNotEqual(maestranza["ruta_torta"], soporte["ruta_torta"])
+        self.assertIn("Maestranza", maestranza["ruta_torta"])
+
+    def test_redibuja_solo_el_grafico_que_cambio(self):
+        anteriores = self.obtener()
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Luz quemada", "Maestranza", 3)
+        nuevas = self.obtener()
+        self.assertNotEqual(anteriores["ruta_torta"], nuevas["ruta_torta"])
+        self.assertEqual(self.torta.call_count, 2)
+
+        # Un reclamo nuevo con la misma proporción de estados solo cambia la nube
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Proyector roto", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Aire roto", "Maestranza", 4)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Baño sucio", "Maestranza", 1)
+        self.obtener()
+        self.assertEqual(self.nube.call_count, 3)
+        self.assertEqual(self.torta.call_count, 2)
+
+    def test_archivos_reemplazados_se_borran_despues_de_la_gracia(self):
+        anteriores = self.obtener()
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Luz quemada", "Maestranza", 3)
+        nuevas = self.obtener()
+        # Una página que recibió la ruta anterior todavía la puede pedir
+        self.assertTrue(os.path.exists(anteriores["ruta_torta"]))
+
+        graficos = CacheGraficos(self.agregados, self.directorio, gracia=0)
+        graficos.obtener_graficos("Maestranza", self.agregados.obtener_resumen("Maestranza"))
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Ventana rota", "Maestranza", 5)
+        graficos.obtener_graficos("Maestranza", self.agregados.obtener_resumen("Maestranza"))
+        self.assertFalse(os.path.exists(nuevas["ruta_torta"]))
+
+    def test_departamento_sin_reclamos(self):
+        self.assertEqual(self.obtener("Secretaria_Tecnica"),
+                         {"ruta_nube": None, "ruta_torta": None, "imagen_nube": None, "imagen_torta": None})
+
+    def test_conserva_la_imagen_en_memoria(self):
+        graficos = self.obtener()
+        with open(graficos["ruta_torta"], "rb") as archivo:
+            self.assertEqual(archivo.read(), graficos["imagen_torta"])
+
+    def test_pre_renderizado_en_segundo_plano(self):
+        graficos = CacheGraficos(self.agregados, self.directorio, pre_renderizar=True)
+        self.gestor.agregar_observador(graficos)
+        graficos.obtener_graficos("Maestranza", self.agregados.obtener_resumen("Maestranza"))
+        llamadas = self.torta.call_count
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Ventana rota", "Maestranza", 5)
+        graficos.esperar()
+        self.assertEqual(self.torta.call_count, llamadas + 1)
+        graficos.obtener_graficos("Maestranza", self.agregados.obtener_resumen("Maestranza"))
+        self.assertEqual(self.torta.call_count, llamadas + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
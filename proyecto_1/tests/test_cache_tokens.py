@@ -0,0 +1,63 @@
+import unittest
+from modules.cache_tokens import CacheLRU, CacheTokensReclamos
+
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_cuenta_aciertos_y_fallos(self):
+        cache = CacheLRU(10)
+        llamadas = []
+        calcular = lambda clave: llamadas.append(clave) or clave.upper()
+        self.assertEqual(cache.obtener("a", calcular), "A")
+        self.assertEqual(cache.obtener("a", calcular), "A")
+        self.assertEqual(llamadas, ["a"])
+        self.assertEqual(cache.aciertos, 1)
+        self.assertEqual(cache.fallos, 1)
+
+    def test_descarta_el_menos_usado(self):
+        cache = CacheLRU(2)
+        cache.obtener("a", str.upper)
+        cache.obtener("b", str.upper)
+        cache.obtener("a", str.upper)   # "b" pasa a ser el menos usado
+        cache.obtener("c", str.upper)
+        self.assertEqual(len(cache), 2)
+        cache.obtener("a", str.upper)
+        self.assertEqual(cache.aciertos, 2)
+        cache.obtener("b", str.upper)
+        self.assertEqual(cache.fallos, 4)
+
+    def test_tamano_invalido(self):
+        with self.assertRaises(ValueError):
+            CacheLRU(0)
+
+
+class TestCacheTokensReclamos(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = CacheTokensReclamos(100)
+        self.llamadas = 0
+
+    def tokenizar(self, texto):
+        self.llamadas += 1
+        return texto.split()
+
+    def test_reutiliza_tokens_del_mismo_reclamo(self):
+        self.cache.obtener(1, "luz quemada", self.tokenizar, "nube")
+        tokens = self.cache.obtener(1, "luz quemada", self.tokenizar, "nube")
+        self.assertEqual(tokens, ("luz", "quemada"))
+        self.assertEqual(self.llamadas, 1)
+
+    def test_recalcula_si_cambia_el_contenido(self):
+        self.cache.obtener(1, "luz quemada", self.tokenizar, "nube")
+        tokens = self.cache.obtener(1, "proyector roto", self.tokenizar, "nube")
+        self.assertEqual(tokens, ("proyector", "roto"))
+        self.assertEqual(self.llamadas, 2)
+
+    def test_tipos_de_tokenizacion_separados(self):
+        self.cache.obtener(1, "luz quemada", self.tokenizar, "nube")
+        self.cache.obtener(1, "luz quemada", self.tokenizar, "raices")
+        self.assertEqual(self.llamadas, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
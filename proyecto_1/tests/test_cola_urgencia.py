@@ -0,0 +1,118 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base, ModeloReclamo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy, RepositorioUsuariosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.gestor_usuarios import GestorDeUsuarios
+from modules.dominio import Reclamo
+from modules.cola_urgencia import ColaUrgenciaReclamos, calcular_urgencia
+
+
+class TestColaUrgenciaReclamos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.repo_usuarios = RepositorioUsuariosSQLAlchemy(self.session)
+        self.cola = ColaUrgenciaReclamos(self.repo)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.cola])
+        self.gestor_usuarios = GestorDeUsuarios(self.repo_usuarios, observadores=[self.cola])
+
+        self.ahora = datetime(2025, 6, 1, 12, 0, 0)
+        # id 1: pendiente de hace 10 días, id 2: en proceso de hace 20 días, id 3: pendiente de hoy, id 4: resuelto
+        self.guardar("Pendiente", "Luz quemada", self.ahora - timedelta(days=10))
+        self.guardar("En proceso", "Piso sucio", self.ahora - timedelta(days=20), 3)
+        self.guardar("Pendiente", "Puerta rota", self.ahora)
+        self.guardar("Resuelto", "Ventana rota", self.ahora - timedelta(days=90), 1)
+        for i in range(3):
+            self.gestor_usuarios.registrar_nuevo_usuario(f"U{i}", f"u{i}@mail.com", "clave", "Perez",
+                                                         f"usuario{i}", "Estudiante", "Usuario_Final")
+
+    def guardar(self, estado, contenido, fecha, tiempo=None, departamento="Maestranza"):
+        self.repo.guardar_registro(Reclamo(None, 1, estado, contenido, departamento, None, fecha, tiempo))
+
+    def ids_urgentes(self, cantidad=10, desde=0):
+        return [id_reclamo for id_reclamo, _ in self.cola.obtener_mas_urgentes("Maestranza", cantidad, desde, self.ahora)]
+
+    def test_solo_reclamos_activos_ordenados_por_urgencia(self):
+        self.assertEqual(self.ids_urgentes(), [2, 1, 3])
+        self.assertEqual(self.cola.cantidad("Maestranza"), 3)
+
+    def test_urgencia_combina_estado_antiguedad_y_adherentes(self):
+        urgencias = dict(self.cola.obtener_mas_urgentes("Maestranza", 3, ahora=self.ahora))
+        self.assertAlmostEqual(urgencias[1], calcular_urgencia("Pendiente", self.ahora - timedelta(days=10), 0, self.ahora))
+        self.assertAlmostEqual(urgencias[1], 15.0)
+        self.assertAlmostEqual(urgencias[2], 20.0)
+
+    def test_paginado(self):
+        self.assertEqual(self.ids_urgentes(2), [2, 1])
+        self.assertEqual(self.ids_urgentes(2, desde=2), [3])
+
+    def test_adhesion_sube_la_prioridad(self):
+        self.ids_urgentes()
+        for id_usuario in (1, 2, 3):
+            self.gestor_usuarios.registrar_reclamo_a_seguir(id_usuario, 1)
+        self.assertEqual(self.ids_urgentes(), [1, 2, 3])
+
+    def test_alta_y_cambios_de_estado(self):
+        self.ids_urgentes()
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Proyector roto", "Maestranza", None)
+        self.assertIn(5, self.ids_urgentes())
+        reclamo = self.repo.obtener_registro_por_filtro("id_reclamo", 2)
+        self.gestor.editar_Reclamo(2, 1, "Resuelto", reclamo.contenido, reclamo.departamento, 3, None, reclamo.fecha_y_hora)
+        self.assertNotIn(2, self.ids_urgentes())
+        self.assertEqual(self.cola.cantidad("Maestranza"), 3)
+
+    def test_notificacion_de_un_reclamo_ya_en_la_cola(self):
+        # Reclamo guardado (y con un adherente) antes de armar la cola pero notificado después
+        self.guardar("Pendiente", "Proyector roto", self.ahora - timedelta(days=30))
+        self.gestor_usuarios.registrar_reclamo_a_seguir(1, 5)
+        self.assertEqual(self.ids_urgentes(1), [5])
+        self.cola.reclamo_agregado(self.repo.obtener_registro_por_filtro("id_reclamo", 5))
+        self.assertEqual(self.cola.cantidad("Maestranza"), 4)
+        self.assertEqual(self.cola.listar_reclamos_urgentes("Maestranza", 1)[0]["n_adherentes"], 1)
+
+    def test_derivar_conserva_los_adherentes(self):
+        self.ids_urgentes()
+        self.cola.cantidad("Soporte_Informatico")
+        self.gestor_usuarios.registrar_reclamo_a_seguir(1, 3)
+        reclamo = self.repo.obtener_registro_por_filtro("id_reclamo", 3)
+        self.gestor.editar_Reclamo(3, 1, reclamo.estado, reclamo.contenido, "Soporte_Informatico", None, None, reclamo.fecha_y_hora)
+        self.assertEqual(self.ids_urgentes(), [2, 1])
+        urgentes = self.cola.listar_reclamos_urgentes("Soporte_Informatico", 5)
+        self.assertEqual([r["id_reclamo"] for r in urgentes], [3])
+        self.assertEqual(urgentes[0]["n_adherentes"], 1)
+
+    def test_coincide_con_una_cola_armada_desde_cero(self):
+        self.ids_urgentes()
+        self.gestor_usuarios.registrar_reclamo_a_seguir(2, 3)
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Aire acondicionado", "Maestranza", 5)
+        reclamo = self.repo.obtener_registro_por_filtro("id_reclamo", 1)
+        self.gestor.editar_Reclamo(1, 1, "En proceso", reclamo.contenido, reclamo.departamento, 2, None, reclamo.fecha_y_hora)
+        desde_cero = ColaUrgenciaReclamos(self.repo)
+        self.assertEqual(self.cola.obtener_mas_urgentes("Maestranza", 10, ahora=self.ahora),
+                         desde_cero.obtener_mas_urgentes("Maestranza", 10, ahora=self.ahora))
+
+    def test_sincroniza_cambios_de_otros_procesos(self):
+        self.assertEqual(self.ids_urgentes(), [2, 1, 3])
+        # Otro proceso (sin notificar a la cola) resuelve el reclamo 2 y adhiere tres usuarios al 3
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 2).values(estado="Resuelto"))
+        self.session.commit()
+        for id_usuario in (1, 2, 3):
+            self.repo_usuarios.asociar_registro(id_usuario, 3)
+        self.cola.sincronizar()
+        self.assertEqual(self.ids_urgentes(), [1, 3])
+        self.assertEqual(self.cola.listar_reclamos_urgentes("Maestranza", 2)[1]["n_adherentes"], 3)
+        desde_cero = ColaUrgenciaReclamos(self.repo)
+        self.assertEqual(self.cola.obtener_mas_urgentes("Maestranza", 10, ahora=self.ahora),
+                         desde_cero.obtener_mas_urgentes("Maestranza", 10, ahora=self.ahora))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import threading
+import unittest
+from modules.escritor_agrupado import EscritorAgrupado
+
+
+class SesionFalsa:
+    '''Sesión mínima para el escritor: las escrituras de las pruebas no usan la base.'''
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def commit(self):
+        pass
+
+
+class TestEscritorAgrupado(unittest.TestCase):
+
+    def crear_escritor(self, **opciones):
+        escritor = EscritorAgrupado(SesionFalsa, **opciones)
+        self.addCleanup(escritor.cerrar)
+        return escritor
+
+    def test_escritura_sola_que_falla_no_se_repite(self):
+        escritor = self.crear_escritor()
+        llamadas = []
+
+        def fallar(sesion):
+            llamadas.append(sesion)
+            raise ValueError("No se encontró el reclamo con ese id")
+
+        with self.assertRaises(ValueError):
+            escritor.ejecutar(fallar)
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(escritor.estadisticas()["escrituras"], 0)
+
+    def test_lote_con_una_escritura_que_falla(self):
+        escritor = self.crear_escritor(espera=0.05)
+        resultados = {}
+        fallos = []
+
+        def escritura(i):
+            if i == 3:
+                fallos.append(i)
+                raise ValueError("falla")
+            return i * 10
+
+        def enviar(i):
+            try:
+                resultados[i] = escritor.ejecutar(lambda sesion: escritura(i))
+            except ValueError:
+                resultados[i] = "error"
+
+        hilos = [threading.Thread(target=enviar, args=(i,)) for i in range(6)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(resultados, {0: 0, 1: 10, 2: 20, 3: "error", 4: 40, 5: 50})
+        # La escritura que falló no se volvió a ejecutar con las demás
+        self.assertEqual(fallos, [3])
+
+    def test_cerrar_mientras_se_envian_escrituras(self):
+        escritor = EscritorAgrupado(SesionFalsa, espera=0.001)
+        resultados = []
+
+        def enviar():
+            for i in range(200):
+                try:
+                    resultados.append(escritor.ejecutar(lambda sesion: i))
+                except RuntimeError:
+                    resultados.append("cerrado")
+                    return
+
+        hilos = [threading.Thread(target=enviar) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        escritor.cerrar()
+        for hilo in hilos:
+            hilo.join(timeout=10)
+        # Ninguna escritura quedó esperando para siempre: o se confirmó o se rechazó
+        self.assertFalse(any(hilo.is_alive() for hilo in hilos))
+        with self.assertRaises(RuntimeError):
+            escritor.ejecutar(lambda sesion: None)
+        escritor.cerrar()
+
+    def test_tiempo_maximo(self):
+        liberar = threading.Event()
+        escritor = self.crear_escritor(tiempo_maximo=0.1)
+        self.addCleanup(liberar.set)
+        with self.assertRaises(TimeoutError):
+            escritor.ejecutar(lambda sesion: liberar.wait(10))
+
+    def test_tiempo_maximo_cancela_la_escritura_en_cola(self):
+        escritor = self.crear_escritor(max_lote=1, espera=0, tiempo_maximo=0.2)
+        empezo, liberar = threading.Event(), threading.Event()
+        self.addCleanup(liberar.set)
+        errores = []
+
+        def bloquear(sesion):
+            empezo.set()
+            liberar.wait(10)
+
+        def enviar_bloqueante():
+            try:
+                escritor.ejecutar(bloquear)
+            except TimeoutError as e:
+                errores.append(str(e))
+
+        ocupado = threading.Thread(target=enviar_bloqueante)
+        ocupado.start()
+        empezo.wait(10)
+        # La segunda escritura queda en la cola detrás de la que ocupa al escritor: al vencer el tiempo se cancela
+        ejecutadas = []
+        with self.assertRaisesRegex(TimeoutError, "se canceló"):
+            escritor.ejecutar(lambda sesion: ejecutadas.append(1))
+        ocupado.join()
+        liberar.set()
+        escritor.cerrar()
+        self.assertEqual(ejecutadas, [])
+        # La que ya había empezado no se puede cancelar, y se avisa que todavía puede confirmarse
+        self.assertIn("todavía puede confirmarse", errores[0])
+        self.assertEqual(escritor.estadisticas()["escrituras"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
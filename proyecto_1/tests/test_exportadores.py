@@ -0,0 +1,95 @@
+import base64
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base, ModeloReclamo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.agregados import AgregadosReclamos
+from modules.analitica import Analitica
+from modules.cache_graficos import CacheGraficos
+from modules.cache_tokens import CacheLRU
+from modules.exportadores import ExportadorHTML, ExportadorPDF
+
+
+class TestExportadores(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.agregados = AgregadosReclamos(self.repo)
+        self.reportes = CacheLRU(8)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.agregados])
+        self.analitica = Analitica(self.repo, self.agregados, CacheGraficos(self.agregados, self.directorio), self.reportes)
+
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Luz quemada en el aula", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 2)
+
+    def test_html_embebe_las_imagenes_en_memoria(self):
+        stats = self.analitica.generar_estadisticas("Maestranza")
+        partes = list(ExportadorHTML().generar_partes(stats, "Maestranza"))
+        self.assertGreater(len(partes), 1)
+        contenido = b"".join(partes).decode("utf-8")
+        imagenes = re.findall(r"data:image/png;base64,([A-Za-z0-9+/=]+)'", contenido)
+        self.assertEqual([base64.b64decode(i) for i in imagenes], [stats["imagen_torta"], stats["imagen_nube"]])
+        self.assertIn("Total de Reclamos:</strong> 2", contenido)
+        self.assertIn("<h3>Evolución por semana</h3>", contenido)
+        self.assertEqual(contenido.count("<tr><td>"), len(stats["serie"]))
+
+    def test_pdf_sin_archivos_en_disco(self):
+        stats = self.analitica.generar_estadisticas("Maestranza")
+        os.remove(stats["ruta_torta"])
+        os.remove(stats["ruta_nube"])
+        pdf = b"".join(ExportadorPDF().generar_partes(stats, "Maestranza"))
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        self.assertIn(b"/Subtype /Image", pdf)
+
+    def test_reporte_cacheado_por_huella_de_la_base(self):
+        # Reclamos sin modificaciones recientes: el reporte se guarda y se reutiliza
+        self.session.execute(update(ModeloReclamo).values(actualizado=datetime(2024, 1, 1)))
+        self.session.commit()
+        primero = self.analitica.exportar_archivo("Maestranza", "html")[0].getvalue()
+        partes, mime, nombre = self.analitica.exportar_por_partes("Maestranza", "html")
+        self.assertEqual(b"".join(partes), primero)
+        self.assertEqual((mime, nombre), ("text/html", "reporte_Maestranza.html"))
+        self.assertEqual(self.reportes.aciertos, 1)
+
+        # Un cambio que no pasa por los observadores (otro proceso) también genera un reporte nuevo
+        self.session.execute(update(ModeloReclamo).where(ModeloReclamo.id_reclamo == 1).values(estado="Resuelto"))
+        self.session.commit()
+        nuevo = self.analitica.exportar_archivo("Maestranza", "html")[0].getvalue()
+        self.assertNotEqual(nuevo, primero)
+        self.assertIn("Resuelto: 100.0%", nuevo.decode("utf-8"))
+        self.assertEqual(self.reportes.aciertos, 1)
+
+    def test_reporte_con_cambios_recientes_no_se_guarda(self):
+        self.analitica.exportar_archivo("Maestranza", "html")
+        self.analitica.exportar_archivo("Maestranza", "html")
+        self.assertEqual((len(self.reportes), self.reportes.aciertos), (0, 0))
+
+    def test_reporte_incompleto_no_se_guarda(self):
+        self.session.execute(update(ModeloReclamo).values(actualizado=datetime(2024, 1, 1)))
+        self.session.commit()
+        partes, _, _ = self.analitica.exportar_por_partes("Maestranza", "pdf")
+        next(partes)
+        partes.close()
+        self.assertEqual(len(self.reportes), 0)
+
+    def test_formato_desconocido(self):
+        with self.assertRaises(ValueError):
+            self.analitica.exportar_por_partes("Maestranza", "docx")
+
+
+if __name__ == '__main__':
+    unittest.main()
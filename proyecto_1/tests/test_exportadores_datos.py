@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.analitica import Analitica
+from modules.exportadores_datos import ExportadorCSV, ExportadorJSONL, ExportadorParquet
+from modules.fabrica_exportadores import obtener_exportador, obtener_exportador_datos
+
+
+class TestExportadoresDatos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.gestor = GestorDeReclamos(self.repo)
+        self.analitica = Analitica(self.repo)
+
+        for i in range(7):
+            self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", f"Luz quemada, aula {i}", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(2, "Resuelto", 'Wifi "lento"', "Soporte_Informatico", 3)
+
+    def test_iterar_filas_por_lotes(self):
+        lotes = list(self.repo.iterar_filas(("id_reclamo", "departamento"), "Maestranza", tamano_lote=3))
+        self.assertEqual([len(lote) for lote in lotes], [3, 3, 1])
+        self.assertEqual([fila[0] for lote in lotes for fila in lote], list(range(1, 8)))
+
+    def test_csv(self):
+        partes = list(ExportadorCSV().exportar(self.repo, tamano_lote=3))
+        self.assertEqual(len(partes), 4)    # encabezado + 3 lotes
+        filas = list(csv.DictReader(io.StringIO(b"".join(partes).decode("utf-8"))))
+        self.assertEqual(len(filas), 8)
+        self.assertEqual(filas[0]["contenido"], "Luz quemada, aula 0")
+        self.assertEqual(filas[-1]["contenido"], 'Wifi "lento"')
+        self.assertEqual(filas[-1]["tiempo_en_proceso"], "3")
+
+    def test_jsonl_de_un_departamento(self):
+        partes, mime, nombre = self.analitica.exportar_datos_por_partes("Soporte_Informatico", "jsonl")
+        lineas = b"".join(partes).decode("utf-8").splitlines()
+        self.assertEqual((mime, nombre), ("application/x-ndjson", "reclamos_Soporte_Informatico.jsonl"))
+        self.assertEqual(len(lineas), 1)
+        reclamo = json.loads(lineas[0])
+        self.assertEqual(reclamo["estado"], "Resuelto")
+        self.assertEqual(reclamo["id_creador"], 2)
+        self.assertIsInstance(reclamo["fecha_y_hora"], str)
+
+    @unittest.skipUnless(ExportadorParquet.disponible(), "pyarrow no está instalado")
+    def test_parquet(self):
+        import pyarrow.parquet
+        contenido = b"".join(ExportadorParquet().exportar(self.repo, tamano_lote=3))
+        tabla = pyarrow.parquet.read_table(io.BytesIO(contenido))
+        self.assertEqual(tabla.num_rows, 8)
+        self.assertEqual(tabla.column("departamento").to_pylist()[-1], "Soporte_Informatico")
+
+    def test_formatos_desconocidos(self):
+        with self.assertRaises(ValueError):
+            obtener_exportador("csv")
+        with self.assertRaises(ValueError):
+            obtener_exportador_datos("pdf")
+        with self.assertRaises(ValueError):
+            self.analitica.exportar_datos_por_partes("Maestranza", "xlsx")
+
+
+if __name__ == '__main__':
+    unittest.main()
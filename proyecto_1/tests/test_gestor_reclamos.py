@@ -1,10 +1,17 @@
+import tempfile
 import unittest
-from sqlalchemy import create_engine
+from unittest import mock
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from modules.modelos import Base
 from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy, RepositorioUsuariosSQLAlchemy
 from modules.gestor_reclamos import GestorDeReclamos
 from modules.gestor_usuarios import GestorDeUsuarios
+from modules.agregados import AgregadosReclamos
+from modules.buscador_similares import BuscadorReclamosSimilares
+from modules.cache_graficos import CacheGraficos
+from modules.cola_urgencia import ColaUrgenciaReclamos
+from modules.dominio import Reclamo
 
 class TestGestorDeReclamos(unittest.TestCase):
 
@@ -133,6 +140,108 @@ class TestGestorDeReclamos(unittest.TestCase):
         self.assertEqual(reclamos, [])
         self.assertEqual(total, 0)
 
+    def test_listar_reclamos_por_cursor(self):
+        for i in range(25):
+            self.gestor_reclamos.agregar_nuevo_Reclamo(
+                id_creador=self.usuario.id,
+                estado="Pendiente",
+                contenido=f"Reclamo {i+1}",
+                departamento="DeptoA" if i % 2 == 0 else "DeptoB",
+                tiempo_en_proceso=2
+            )
+        # Se recorren todas las páginas hacia adelante y se vuelve hacia atrás
+        paginas = []
+        reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=10)
+        self.assertIsNone(pagina["anterior"])
+        self.assertEqual(pagina["total"], 25)
+        paginas.append([r['id_reclamo'] for r in reclamos])
+        while pagina["siguiente"] is not None:
+            reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=10, antes_de=pagina["siguiente"])
+            paginas.append([r['id_reclamo'] for r in reclamos])
+        self.assertEqual(paginas, [list(range(25, 15, -1)), list(range(15, 5, -1)), list(range(5, 0, -1))])
+
+        reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=10, despues_de=pagina["anterior"])
+        self.assertEqual([r['id_reclamo'] for r in reclamos], paginas[1])
+        reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=10, despues_de=pagina["anterior"])
+        self.assertEqual([r['id_reclamo'] for r in reclamos], paginas[0])
+        self.assertIsNone(pagina["anterior"])
+        self.assertEqual(pagina["siguiente"], 16)
+
+    def test_listar_reclamos_por_cursor_con_departamento(self):
+        for i in range(7):
+            self.gestor_reclamos.agregar_nuevo_Reclamo(self.usuario.id, "Pendiente", f"Reclamo {i+1}",
+                                                       "Deptoa" if i < 5 else "Deptob", 2)
+        reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=3, departamento="Deptoa")
+        self.assertEqual([r['id_reclamo'] for r in reclamos], [5, 4, 3])
+        self.assertEqual(pagina["total"], 5)
+        reclamos, pagina = self.gestor_reclamos.listar_reclamos_por_cursor(per_page=3, departamento="Deptoa",
+                                                                           antes_de=pagina["siguiente"])
+        self.assertEqual([r['id_reclamo'] for r in reclamos], [2, 1])
+        self.assertIsNone(pagina["siguiente"])
+        self.assertEqual(reclamos[0]['n_adherentes'], 0)
+
+    def test_total_cacheado_se_invalida_al_guardar(self):
+        self.assertEqual(self.repo_reclamos.contar_reclamos("Deptoa"), 0)
+        self.gestor_reclamos.agregar_nuevo_Reclamo(self.usuario.id, "Pendiente", "Luz quemada", "Deptoa", 2)
+        self.assertEqual(self.repo_reclamos.contar_reclamos("Deptoa"), 1)
+        self.assertEqual(self.repo_reclamos.contar_reclamos(), 1)
+
+    def test_numero_reclamos_se_cuenta_sin_cargar_reclamos(self):
+        self.gestor_reclamos.agregar_nuevo_Reclamo(self.usuario.id, "Pendiente", "Luz quemada", "Deptoa", 2)
+        with mock.patch.object(self.repo_reclamos, "obtener_todos_los_registros") as obtener_todos:
+            gestor = GestorDeReclamos(self.repo_reclamos)
+            self.assertEqual(gestor.numero_Reclamos, 1)
+            gestor.agregar_nuevo_Reclamo(self.usuario.id, "Pendiente", "Agua cortada", "Deptoa", 2)
+            self.assertEqual(gestor.numero_Reclamos, 2)
+            obtener_todos.assert_not_called()
+
+    def test_operaciones_masivas_notifican_a_los_observadores(self):
+        agregados = AgregadosReclamos(self.repo_reclamos)
+        gestor = GestorDeReclamos(self.repo_reclamos, observadores=[agregados])
+        self.assertEqual(agregados.obtener_resumen("Maestranza")["total"], 0)
+        reclamos = [Reclamo(None, self.usuario.id, "Pendiente", f"Luz quemada {i}", "Maestranza") for i in range(5)]
+        gestor.agregar_Reclamos(reclamos, tamano_lote=2)
+        self.assertEqual(gestor.numero_Reclamos, 5)
+        self.assertEqual(agregados.obtener_resumen("Maestranza")["conteo"], {"Pendiente": 5})
+
+        for reclamo in reclamos[:3]:
+            reclamo.estado = "En proceso"
+            reclamo.tiempo_en_proceso = 4
+        gestor.editar_Reclamos(reclamos[:3], tamano_lote=2)
+        resumen = agregados.obtener_resumen("Maestranza")
+        self.assertEqual((resumen["conteo"], resumen["mediana_proceso"]), ({"Pendiente": 2, "En proceso": 3}, 4))
+
+        gestor.cambiar_departamentos({reclamos[0].id_reclamo: "Soporte_Informatico",
+                                      reclamos[3].id_reclamo: "Soporte_Informatico"})
+        self.assertEqual(agregados.obtener_resumen("Maestranza")["conteo"], {"Pendiente": 1, "En proceso": 2})
+        self.assertEqual(agregados.obtener_resumen("Soporte_Informatico")["total"], 2)
+        # Los agregados mantenidos con las notificaciones coinciden con los calculados desde cero
+        for departamento in ("Maestranza", "Soporte_Informatico"):
+            self.assertEqual(agregados.obtener_resumen(departamento)["conteo"],
+                             AgregadosReclamos(self.repo_reclamos).obtener_resumen(departamento)["conteo"])
+        with self.assertRaises(ValueError):
+            gestor.cambiar_departamentos({999: "Maestranza"})
+
+    def test_arranque_no_consulta_los_reclamos(self):
+        # Lo mismo que arma server.py al importarse: ningún observador ni gestor lee la tabla de reclamos
+        self.gestor_reclamos.agregar_nuevo_Reclamo(self.usuario.id, "Pendiente", "Luz quemada", "Deptoa", 2)
+        sentencias = []
+        engine = self.session.get_bind()
+
+        def registrar(conexion, cursor, sentencia, *_):
+            sentencias.append(sentencia)
+
+        event.listen(engine, "before_cursor_execute", registrar)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", registrar)
+        with tempfile.TemporaryDirectory() as directorio:
+            agregados = AgregadosReclamos(self.repo_reclamos)
+            cola_urgencia = ColaUrgenciaReclamos(self.repo_reclamos)
+            graficos = CacheGraficos(agregados, directorio=directorio)
+            GestorDeReclamos(self.repo_reclamos, observadores=[BuscadorReclamosSimilares(self.repo_reclamos),
+                                                              agregados, cola_urgencia, graficos])
+            GestorDeUsuarios(self.repo_usuarios, observadores=[cola_urgencia])
+        self.assertEqual([s for s in sentencias if "FROM reclamos" in s], [])
+
 
     
 if __name__ == '__main__':
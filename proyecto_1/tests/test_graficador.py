@@ -0,0 +1,59 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from PIL import Image
+from modules.graficador import Graficador, guardar_atomico
+
+FIRMA_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+class TestGraficador(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def test_generar_devuelve_png_en_memoria(self):
+        torta = Graficador.generar_torta({"Pendiente": 40, "Resuelto": 60})
+        nube = Graficador.generar_nube_frecuencias(Counter({"luz": 3, "puerta": 1}))
+        self.assertTrue(torta.startswith(FIRMA_PNG))
+        self.assertTrue(nube.startswith(FIRMA_PNG))
+        self.assertEqual(Image.open(io.BytesIO(nube)).size, (800, 400))
+
+    def test_guardar_atomico_no_deja_temporales(self):
+        guardar_atomico(b"viejo", self.ruta("grafico.png"))
+        guardar_atomico(b"nuevo", self.ruta("grafico.png"))
+        self.assertEqual(os.listdir(self.directorio), ["grafico.png"])
+        with open(self.ruta("grafico.png"), "rb") as archivo:
+            self.assertEqual(archivo.read(), b"nuevo")
+
+    def test_graficos_concurrentes_desde_hilos(self):
+        porcentajes = [{"Pendiente": i, "Resuelto": 100 - i} for i in range(10, 90, 10)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Cada hilo escribe su propio archivo y además todos escriben el mismo
+            propias = list(pool.map(lambda i: Graficador.graficar_torta(porcentajes[i], self.ruta(f"torta_{i}.png")),
+                                    range(len(porcentajes))))
+            compartidas = list(pool.map(lambda p: Graficador.graficar_torta(p, self.ruta("torta.png")), porcentajes))
+        esperadas = [Graficador.generar_torta(p) for p in porcentajes]
+        for ruta, esperada in zip(propias, esperadas):
+            with open(ruta, "rb") as archivo:
+                self.assertEqual(archivo.read(), esperada)
+        with open(compartidas[0], "rb") as archivo:
+            self.assertIn(archivo.read(), esperadas)
+
+    def test_graficos_desde_un_pool_de_procesos(self):
+        porcentajes = [{"Pendiente": 30, "Resuelto": 70}, {"Pendiente": 50, "Invalido": 50}]
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            imagenes = list(pool.map(Graficador.generar_torta, porcentajes))
+        self.assertEqual(imagenes, [Graficador.generar_torta(p) for p in porcentajes])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from modules.agregados import AgregadosReclamos
+from modules.dominio import Reclamo
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.instantanea_reclamos import InstantaneaReclamos
+from modules.modelos import Base
+from modules.repositorio_concreto import PERIODOS, RepositorioReclamosSQLAlchemy
+
+
+class TestInstantaneaReclamos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.session = self.Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.instantanea = InstantaneaReclamos(self.repo, tamano_lote=2, vigencia=0)
+        self.gestor = GestorDeReclamos(self.repo, observadores=[self.instantanea])
+
+        datos = [("Pendiente", "Maestranza", None, datetime(2024, 5, 1, 9)),
+                 ("En proceso", "Maestranza", 4, datetime(2024, 5, 1, 18)),
+                 ("En proceso", "Maestranza", 7, datetime(2024, 5, 3, 10)),
+                 ("Resuelto", "Maestranza", 2, datetime(2024, 6, 2, 11)),
+                 ("Pendiente", "Soporte_Informatico", None, datetime(2024, 6, 5, 12))]
+        for estado, departamento, tiempo, fecha in datos:
+            self.repo.guardar_registro(Reclamo(None, 1, estado, "Luz quemada", departamento,
+                                               fecha_y_hora=fecha, tiempo_en_proceso=tiempo))
+
+    def escribir_desde_otro_proceso(self, sentencia, **parametros):
+        '''Ejecuta una sentencia con otra sesión, sin pasar por GestorDeReclamos (como lo haría otro proceso).'''
+        otra = self.Session()
+        otra.execute(text(sentencia), parametros)
+        otra.commit()
+        otra.close()
+
+    def test_resumen_igual_a_agregados(self):
+        resumen = self.instantanea.obtener_resumen("Maestranza")
+        esperado = AgregadosReclamos(self.repo).obtener_resumen("Maestranza")
+        for clave in ("total", "conteo", "mediana_proceso", "mediana_resueltos", "p90_proceso", "p90_resueltos"):
+            self.assertEqual(resumen[clave], esperado[clave], clave)
+        self.assertAlmostEqual(resumen["porcentajes"]["En proceso"], 50)
+        self.assertEqual(self.instantanea.obtener_resumen()["total"], 5)
+        self.assertEqual(self.instantanea.obtener_resumen("Secretaria_Tecnica"),
+                         {"total": 0, "conteo": {}, "porcentajes": {}, "mediana_proceso": None,
+                          "mediana_resueltos": None, "p90_proceso": None, "p90_resueltos": None})
+
+    def test_conteos_por_periodo_iguales_a_la_consulta(self):
+        for periodo in PERIODOS:
+            for departamento in ("Maestranza", None):
+                esperado = sorted((inicio, estado, tiempo, cantidad) for _, inicio, estado, tiempo, cantidad
+                                  in self.repo.obtener_conteos_por_periodo(periodo, departamento))
+                self.assertEqual(sorted(self.instantanea.conteos_por_periodo(departamento, periodo)), esperado,
+                                 (periodo, departamento))
+        with self.assertRaises(ValueError):
+            self.instantanea.conteos_por_periodo("Maestranza", "anio")
+
+    def test_cambios_del_gestor_se_aplican_sin_consultar(self):
+        instantanea = InstantaneaReclamos(self.repo, vigencia=3600)
+        gestor = GestorDeReclamos(self.repo, observadores=[instantanea])
+        self.assertEqual(instantanea.obtener_resumen()["total"], 5)
+        gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 10)
+        r = self.repo.obtener_registro_por_filtro("id_reclamo", 1)
+        gestor.editar_Reclamo(r.id_reclamo, r.id_creador, "Resuelto", r.contenido, "Soporte_Informatico", 3,
+                              r.r_imagen, r.fecha_y_hora)
+        instantanea.reclamo_eliminado(self.repo.obtener_registro_por_filtro("id_reclamo", 4))
+        self.assertEqual(instantanea.obtener_resumen("Maestranza")["conteo"], {"En proceso": 2, "Resuelto": 1})
+        soporte = instantanea.obtener_resumen("Soporte_Informatico")
+        self.assertEqual(soporte["conteo"], {"Pendiente": 1, "Resuelto": 1})
+        self.assertEqual(soporte["mediana_resueltos"], 3)
+        self.assertEqual(len(instantanea), 5)
+
+    def test_marca_de_agua_por_momento_de_modificacion(self):
+        self.assertEqual(self.instantanea.actualizar(), 5)
+        marca = self.instantanea.marca_agua
+        self.assertIsNotNone(marca)
+        # Otro proceso confirma tarde una modificación y un alta con un actualizado anterior a la marca
+        anterior = marca - timedelta(minutes=1)
+        self.escribir_desde_otro_proceso("UPDATE reclamos SET estado = 'Resuelto', tiempo_en_proceso = 9, "
+                                         "actualizado = :a WHERE id_reclamo = 3", a=anterior)
+        self.escribir_desde_otro_proceso("INSERT INTO reclamos (id_creador, estado, contenido, departamento, "
+                                         "fecha_y_hora, tiempo_en_proceso, actualizado) VALUES "
+                                         "(1, 'Resuelto', 'Puerta rota', 'Maestranza', :f, 1, :a)",
+                                         f=datetime(2024, 6, 3, 8), a=anterior)
+        resumen = self.instantanea.obtener_resumen("Maestranza")
+        self.assertEqual(resumen["conteo"], {"Pendiente": 1, "En proceso": 1, "Resuelto": 3})
+        self.assertEqual(resumen["mediana_resueltos"], 2)
+        self.assertEqual(len(self.instantanea), 6)
+        self.assertEqual(self.instantanea.marca_agua, marca)
+
+    def test_baja_de_otro_proceso_recarga(self):
+        self.instantanea.actualizar()
+        self.escribir_desde_otro_proceso("DELETE FROM reclamos WHERE id_reclamo = 2")
+        self.assertEqual(self.instantanea.obtener_resumen("Maestranza")["conteo"],
+                         {"Pendiente": 1, "En proceso": 1, "Resuelto": 1})
+        self.assertEqual(len(self.instantanea), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+from sqlalchemy import create_engine, inspect, text
+from modules.migraciones import INDICES_FILTROS, MIGRACIONES, migrar, version_actual
+from modules.modelos import Base
+
+# Consultas frecuentes que deben resolverse con los índices de la migración 2
+CONSULTAS = {
+    "conteo por departamento y estado":
+        "SELECT count(id_reclamo) FROM reclamos WHERE departamento = 'Maestranza' AND estado = 'En proceso'",
+    "página por cursor de un departamento":
+        "SELECT * FROM reclamos WHERE departamento = 'Maestranza' AND id_reclamo < :cursor "
+        "ORDER BY id_reclamo DESC LIMIT 21",
+    "reclamos de un usuario":
+        "SELECT * FROM reclamos WHERE id_creador = 7",
+    "reclamos de un período":
+        "SELECT count(id_reclamo) FROM reclamos WHERE fecha_y_hora >= :desde",
+    "adherentes de varios reclamos":
+        "SELECT id_reclamo, count(id_usuario) FROM usuarios_reclamos WHERE id_reclamo IN (5, 50, 500) "
+        "GROUP BY id_reclamo",
+}
+
+
+def plan(conexion, consulta, parametros):
+    return " | ".join(fila[-1] for fila in conexion.execute(text("EXPLAIN QUERY PLAN " + consulta), parametros))
+
+
+class TestMigraciones(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+
+    def indices(self, tabla):
+        return {indice["name"] for indice in inspect(self.engine).get_indexes(tabla)}
+
+    def test_base_nueva(self):
+        self.assertEqual(version_actual(self.engine), 0)
+        self.assertEqual(migrar(self.engine), [version for version, _, _ in MIGRACIONES])
+        self.assertEqual(version_actual(self.engine), MIGRACIONES[-1][0])
+        self.assertIn("ix_reclamos_departamento_estado_id", self.indices("reclamos"))
+        # Una segunda vez no hay nada pendiente
+        self.assertEqual(migrar(self.engine), [])
+
+    def test_base_anterior_a_las_migraciones(self):
+        # Tablas creadas como antes de las migraciones: sin índices ni schema_version
+        with self.engine.begin() as conexion:
+            conexion.execute(text("CREATE TABLE reclamos (id_reclamo INTEGER PRIMARY KEY, id_creador INTEGER NOT NULL, "
+                                  "estado VARCHAR(20) NOT NULL, contenido VARCHAR(1000) NOT NULL, r_imagen VARCHAR(255), "
+                                  "fecha_y_hora DATETIME NOT NULL, departamento VARCHAR(50), tiempo_en_proceso INTEGER)"))
+            conexion.execute(text("INSERT INTO reclamos VALUES (1, 1, 'Pendiente', 'Luz', NULL, '2024-01-01', 'Maestranza', NULL)"))
+        self.assertEqual(self.indices("reclamos"), set())
+
+        migrar(self.engine)
+        self.assertEqual(self.indices("reclamos") | self.indices("usuarios_reclamos"),
+                         {nombre for nombre, _, _ in INDICES_FILTROS} | {"ix_reclamos_actualizado"})
+        with self.engine.connect() as conexion:
+            self.assertEqual(conexion.execute(text("SELECT count(*) FROM reclamos")).scalar(), 1)
+            # Los reclamos existentes toman como última modificación su fecha de creación
+            self.assertEqual(conexion.execute(text("SELECT actualizado FROM reclamos")).scalar(), "2024-01-01")
+
+    def test_normaliza_valores_viejos(self):
+        migrar(self.engine, hasta=2)
+        with self.engine.begin() as conexion:
+            conexion.execute(text("INSERT INTO reclamos (id_creador, estado, contenido, fecha_y_hora, departamento) "
+                                  "VALUES (1, 'Pendiente', 'Luz', '2024-01-01', 'Secretaría Técnica')"))
+            conexion.execute(text("INSERT INTO usuarios (nombre, apellido, email, nombre_usuario, password, rol) "
+                                  "VALUES ('Juan', 'Perez', 'juan@mail.com', 'juanp', 'x', 'Usuario_final')"))
+        migrar(self.engine)
+        with self.engine.connect() as conexion:
+            self.assertEqual(conexion.execute(text("SELECT departamento FROM reclamos")).scalar(), "Secretaria_Tecnica")
+            self.assertEqual(conexion.execute(text("SELECT rol FROM usuarios")).scalar(), "Usuario_Final")
+
+    def test_consultas_frecuentes_usan_indices(self):
+        migrar(self.engine)
+        parametros = {"cursor": 10, "desde": datetime(2024, 1, 1)}
+        with self.engine.connect() as conexion:
+            for nombre, consulta in CONSULTAS.items():
+                plan_consulta = plan(conexion, consulta, parametros)
+                self.assertIn("INDEX", plan_consulta, nombre)
+                self.assertNotRegex(plan_consulta, r"^SCAN (reclamos|usuarios_reclamos)$", nombre)
+
+    def test_migrar_hasta_una_version(self):
+        self.assertEqual(migrar(self.engine, hasta=1), [1])
+        self.assertEqual(version_actual(self.engine), 1)
+        self.assertEqual(migrar(self.engine), [version for version, _, _ in MIGRACIONES[1:]])
+
+    def test_esquema_inicial_fijo(self):
+        # La migración 1 crea las tablas como eran antes de las migraciones, sin las de los modelos nuevos
+        migrar(self.engine, hasta=1)
+        self.assertEqual(set(inspect(self.engine).get_table_names()),
+                         {"reclamos", "usuarios", "usuarios_reclamos", "schema_version"})
+        self.assertEqual(self.indices("reclamos"), set())
+
+    def test_esquema_igual_a_los_modelos(self):
+        # Las migraciones son las que crean el esquema: una base nueva queda con las tablas, columnas e índices
+        # de los modelos, y una en la que ColaTrabajos ya había creado la tabla trabajos (antes de la migración 4) también
+        with self.engine.begin() as conexion:
+            conexion.execute(text("CREATE TABLE trabajos (id_trabajo VARCHAR(32) PRIMARY KEY, tipo VARCHAR(30) NOT NULL, "
+                                  "parametros VARCHAR(500) NOT NULL, estado VARCHAR(20) NOT NULL, id_usuario INTEGER, "
+                                  "creado DATETIME NOT NULL, terminado DATETIME, error VARCHAR(500), "
+                                  "ruta_resultado VARCHAR(255), mime VARCHAR(100), nombre_archivo VARCHAR(255))"))
+        nueva = create_engine('sqlite:///:memory:')
+        for engine in (self.engine, nueva):
+            migrar(engine)
+            inspector = inspect(engine)
+            self.assertEqual(set(inspector.get_table_names()) - {"schema_version"}, set(Base.metadata.tables))
+            for nombre, tabla in Base.metadata.tables.items():
+                self.assertEqual([columna["name"] for columna in inspector.get_columns(nombre)],
+                                 [columna.name for columna in tabla.columns], nombre)
+                self.assertEqual({indice["name"] for indice in inspector.get_indexes(nombre)},
+                                 {indice.name for indice in tabla.indexes}, nombre)
+
+    def test_procesos_que_migran_a_la_vez(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        url = f"sqlite:///{os.path.join(directorio.name, 'base.db')}"
+        barrera = threading.Barrier(4)
+        resultados = []
+
+        def lenta(conexion):
+            # Una migración que falla si se aplica dos veces, y que tarda lo suficiente para que se crucen
+            time.sleep(0.2)
+            conexion.execute(text("CREATE TABLE auditoria (id INTEGER PRIMARY KEY)"))
+
+        def migrar_en_otro_proceso():
+            engine = create_engine(url)
+            try:
+                barrera.wait()
+                resultados.append(migrar(engine))
+            finally:
+                engine.dispose()
+
+        migraciones = MIGRACIONES + ((MIGRACIONES[-1][0] + 1, "Tabla de auditoría", lenta),)
+        self.enterContext(mock.patch("modules.migraciones.MIGRACIONES", migraciones))
+
+        hilos = [threading.Thread(target=migrar_en_otro_proceso) for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        # Ninguno falló, y cada migración la aplicó uno solo de ellos
+        self.assertEqual(len(resultados), len(hilos))
+        self.assertEqual(sorted(version for aplicadas in resultados for version in aplicadas),
+                         [version for version, _, _ in migraciones])
+        engine = create_engine(url)
+        self.addCleanup(engine.dispose)
+        with engine.connect() as conexion:
+            self.assertEqual(conexion.execute(text("SELECT count(*) FROM schema_version")).scalar(), len(migraciones))
+
+
+if __name__ == '__main__':
+    unittest.main()
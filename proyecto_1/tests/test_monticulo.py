@@ -1,5 +1,6 @@
 import unittest
-from modules.monticulos import MonticuloMediana
+import random
+from modules.monticulos import MonticuloMediana, MonticuloPercentil, PercentilesMoviles
 
 class TestMonticuloMediana(unittest.TestCase):
 
@@ -42,12 +43,96 @@ class TestMonticuloMediana(unittest.TestCase):
         self.monticulo.construir_monticulo(lista)
         self.assertEqual(self.monticulo.mediana, 30)
         self.monticulo.agregar_valor(60)
-        self.monticulo._MonticuloMediana__definir_mediana()
         self.assertEqual(self.monticulo.mediana, 35.0)
 
     def test_devolver_tamaño_correcto(self):
         self.monticulo.construir_monticulo([1, 2, 3, 4])
         self.assertEqual(self.monticulo.devolver_tamaño(), 4)
 
+    def test_eliminar_valor_actualiza_mediana(self):
+        self.monticulo.construir_monticulo([10, 20, 30, 40, 50])
+        self.monticulo.eliminar_valor(50)
+        self.assertEqual(self.monticulo.mediana, 25.0)
+        self.monticulo.eliminar_valor(10)
+        self.assertEqual(self.monticulo.mediana, 30)
+        self.assertEqual(self.monticulo.devolver_tamaño(), 3)
+
+    def test_eliminar_valor_repetido_quita_una_sola_aparicion(self):
+        self.monticulo.construir_monticulo([4, 4, 4, 9])
+        self.monticulo.eliminar_valor(4)
+        self.assertEqual(self.monticulo.mediana, 4)
+        self.assertEqual(self.monticulo.devolver_tamaño(), 3)
+
+    def test_eliminar_hasta_vaciar(self):
+        self.monticulo.construir_monticulo([1, 2])
+        self.monticulo.eliminar_valor(1)
+        self.monticulo.eliminar_valor(2)
+        self.assertIsNone(self.monticulo.mediana)
+        self.assertEqual(self.monticulo.devolver_tamaño(), 0)
+
+    def test_eliminar_valor_inexistente(self):
+        self.monticulo.construir_monticulo([1, 2, 3])
+        with self.assertRaises(ValueError):
+            self.monticulo.eliminar_valor(7)
+
+    def test_actualizar_valor(self):
+        self.monticulo.construir_monticulo([1, 2, 3])
+        self.monticulo.actualizar_valor(1, 10)
+        self.assertEqual(self.monticulo.mediana, 3)
+
+
+class TestMonticuloPercentil(unittest.TestCase):
+
+    def percentil_ordenado(self, valores, p):
+        '''Percentil con interpolación lineal calculado ordenando la lista (como numpy.percentile).'''
+        ordenados = sorted(valores)
+        posicion = p * (len(ordenados) - 1) / 100
+        abajo = int(posicion)
+        if abajo + 1 >= len(ordenados):
+            return ordenados[abajo]
+        return ordenados[abajo] + (ordenados[abajo + 1] - ordenados[abajo]) * (posicion - abajo)
+
+    def test_percentil_90(self):
+        monticulo = MonticuloPercentil(90)
+        monticulo.construir_monticulo(list(range(1, 11)))
+        self.assertAlmostEqual(monticulo.valor, 9.1)
+
+    def test_percentil_invalido(self):
+        with self.assertRaises(ValueError):
+            MonticuloPercentil(120)
+
+    def test_coincide_con_ordenar_tras_altas_bajas_y_cambios(self):
+        azar = random.Random(7)
+        for p in (0, 50, 90, 99, 100):
+            monticulo = MonticuloPercentil(p)
+            valores = []
+            for _ in range(500):
+                operacion = azar.random()
+                if operacion < 0.5 or not valores:
+                    valor = azar.randint(0, 40)
+                    monticulo.agregar_valor(valor)
+                    valores.append(valor)
+                elif operacion < 0.75:
+                    monticulo.eliminar_valor(valores.pop(azar.randrange(len(valores))))
+                else:
+                    i = azar.randrange(len(valores))
+                    nuevo = azar.randint(0, 40)
+                    monticulo.actualizar_valor(valores[i], nuevo)
+                    valores[i] = nuevo
+                if valores:
+                    self.assertAlmostEqual(monticulo.valor, self.percentil_ordenado(valores, p))
+                else:
+                    self.assertIsNone(monticulo.valor)
+                self.assertEqual(monticulo.devolver_tamaño(), len(valores))
+
+    def test_percentiles_moviles(self):
+        percentiles = PercentilesMoviles((50, 90))
+        for valor in range(1, 11):
+            percentiles.agregar_valor(valor)
+        percentiles.eliminar_valor(10)
+        self.assertEqual(percentiles.percentil(50), 5)
+        self.assertAlmostEqual(percentiles.percentil(90), 8.2)
+        self.assertEqual(percentiles.devolver_tamaño(), 9)
+
 if __name__ == '__main__':
     unittest.main()
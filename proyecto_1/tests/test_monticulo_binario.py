@@ -1,4 +1,6 @@
-from modules.monticulos import MonticuloBinario 
+from modules.monticulos import MonticuloBinario, MonticuloIndexado
+import heapq
+import random
 import unittest
 
 class TestMonticuloBinario(unittest.TestCase):
@@ -50,7 +52,80 @@ class TestMonticuloBinario(unittest.TestCase):
         valores = [heap.eliminar() for _ in range(3)]
         self.assertEqual(sorted(valores), [2, 6, 7])
         self.assertEqual(heap.tamanoActual, 0)
+
+    def test_eliminar_en_orden_monticulo_max(self):
+        heap = MonticuloBinario("max")
+        datos = [3, 9, 1, 7, 5, 8, 2]
+        for d in datos:
+            heap.insertar(d)
+        valores = [heap.eliminar() for _ in range(len(datos))]
+        self.assertEqual(valores, sorted(datos, reverse=True))
     
+    def test_clave(self):
+        heap = MonticuloBinario("max", clave=lambda par: par[1])
+        heap.heapify([("a", 2), ("b", 9), ("c", 5)])
+        self.assertEqual([heap.pop()[0] for _ in range(3)], ["b", "c", "a"])
+
+    def test_pushpop_y_replace(self):
+        heap = MonticuloBinario("min")
+        heap.heapify([5, 3, 8])
+        self.assertEqual(heap.pushpop(1), 1)
+        self.assertEqual(heap.pushpop(4), 3)
+        self.assertEqual(heap.replace(10), 4)
+        self.assertEqual([heap.pop() for _ in range(3)], [5, 8, 10])
+
+    def test_coincide_con_heapq(self):
+        azar = random.Random(0)
+        datos = [azar.randint(0, 100) for _ in range(500)]
+        heap = MonticuloBinario("min")
+        heap.heapify(datos[:50])
+        referencia = datos[:50]
+        heapq.heapify(referencia)
+        for i, d in enumerate(datos[50:]):
+            if i % 3 == 0:
+                heap.push(d)
+                heapq.heappush(referencia, d)
+            elif i % 3 == 1:
+                self.assertEqual(heap.pushpop(d), heapq.heappushpop(referencia, d))
+            else:
+                self.assertEqual(heap.replace(d), heapq.heapreplace(referencia, d))
+        self.assertEqual([heap.pop() for _ in range(len(heap))],
+                         [heapq.heappop(referencia) for _ in range(len(referencia))])
+
+    def test_monticulo_vacio(self):
+        heap = MonticuloBinario("min")
+        with self.assertRaises(IndexError):
+            heap.peek()
+        with self.assertRaises(IndexError):
+            heap.pop()
+
+
+class TestMonticuloIndexado(unittest.TestCase):
+    def setUp(self):
+        self.heap = MonticuloIndexado()
+        for clave, prioridad in [("a", 5), ("b", 3), ("c", 8), ("d", 1)]:
+            self.heap.insertar(clave, prioridad)
+
+    def test_eliminar_en_orden_de_prioridad(self):
+        valores = [self.heap.eliminar()[1] for _ in range(4)]
+        self.assertEqual(valores, ["c", "a", "b", "d"])
+
+    def test_cambiar_prioridad(self):
+        self.heap.cambiar_prioridad("d", 10)
+        self.heap.cambiar_prioridad("c", 0)
+        self.assertEqual(self.heap.primeros(4), [(10, "d"), (5, "a"), (3, "b"), (0, "c")])
+
+    def test_quitar(self):
+        self.assertEqual(self.heap.quitar("a"), 5)
+        self.assertNotIn("a", self.heap)
+        self.assertEqual(len(self.heap), 3)
+        self.assertEqual(self.heap.eliminar(), (8, "c"))
+
+    def test_primeros_no_modifica_el_monticulo(self):
+        self.assertEqual(self.heap.primeros(2), [(8, "c"), (5, "a")])
+        self.assertEqual(len(self.heap), 4)
+        self.assertEqual(self.heap.primeros(10), [(8, "c"), (5, "a"), (3, "b"), (1, "d")])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from modules.dominio import Reclamo , Usuario
+from modules.dominio import Estado, Reclamo , Usuario
 from datetime import datetime
 
 class TestReclamo(unittest.TestCase):
@@ -27,6 +27,15 @@ class TestReclamo(unittest.TestCase):
         with self.assertRaises(ValueError):
             Reclamo(1, 1, "Pendiente", "Desc", " ", None, 3, None)
 
+    def test_sin_dict_y_estado_compartido(self):
+        reclamo = Reclamo(1, 1, Estado.EN_PROCESO, "Desc", " maestranza ", tiempo_en_proceso=3)
+        self.assertFalse(hasattr(reclamo, "__dict__"))
+        with self.assertRaises(AttributeError):
+            reclamo.otro_atributo = 1
+        # El estado queda como el texto compartido de Estado y el departamento normalizado
+        self.assertIs(reclamo.estado, Estado.EN_PROCESO.value)
+        self.assertEqual(reclamo.departamento, "Maestranza")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.reclasificar import reclasificar_reclamos
+from modules.agregados import AgregadosReclamos
+
+
+class ClasificadorFalso:
+    """Clasifica por palabras clave, con las mismas etiquetas que el modelo real."""
+    def __init__(self):
+        self.llamadas = 0
+
+    def clasificar(self, reclamos):
+        self.llamadas += 1
+        etiquetas = []
+        for texto in reclamos:
+            if "computadora" in texto:
+                etiquetas.append("soporte informático")
+            elif "???" in texto:
+                etiquetas.append("otro")
+            else:
+                etiquetas.append("maestranza")
+        return etiquetas
+
+
+class TestReclasificar(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.gestor = GestorDeReclamos(self.repo)
+        for i in range(7):
+            self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", f"La computadora {i} no enciende", "Maestranza", None)
+        for i in range(3):
+            self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", f"El piso {i} esta sucio", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "???", "Maestranza", None)
+
+    def test_actualiza_departamentos_por_lotes(self):
+        clasificador = ClasificadorFalso()
+        resumen = reclasificar_reclamos(self.repo, clasificador, tamano_lote=3, informar=lambda mensaje: None)
+        self.assertEqual(resumen["procesados"], 11)
+        self.assertEqual(resumen["cambiados"], 7)
+        self.assertEqual(resumen["no_reconocidos"], 1)
+        self.assertEqual(clasificador.llamadas, 4)
+        self.session.expire_all()
+        self.assertEqual(len(self.repo.obtener_registros_por_filtro("departamento", "Soporte_Informatico")), 7)
+
+    def test_notifica_a_los_observadores_del_gestor(self):
+        agregados = AgregadosReclamos(self.repo)
+        self.assertEqual(agregados.obtener_resumen("Maestranza")["total"], 11)
+        reclasificar_reclamos(self.repo, ClasificadorFalso(), informar=lambda mensaje: None,
+                              gestor=GestorDeReclamos(self.repo, observadores=[agregados]))
+        self.assertEqual(agregados.obtener_resumen("Maestranza")["total"], 4)
+        self.assertEqual(agregados.obtener_resumen("Soporte_Informatico")["total"], 7)
+
+    def test_simulacion_no_modifica(self):
+        resumen = reclasificar_reclamos(self.repo, ClasificadorFalso(), aplicar=False, informar=lambda mensaje: None)
+        self.assertEqual(resumen["cambiados"], 7)
+        self.session.expire_all()
+        self.assertEqual(self.repo.obtener_registros_por_filtro("departamento", "Soporte_Informatico"), [])
+
+    def test_tamano_lote_invalido(self):
+        with self.assertRaises(ValueError):
+            reclasificar_reclamos(self.repo, ClasificadorFalso(), tamano_lote=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
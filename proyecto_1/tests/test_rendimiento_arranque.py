@@ -0,0 +1,77 @@
+# Benchmark del arranque del servidor: arma los mismos repositorios, observadores y gestores que server.py
+# (sin el clasificador ni los recursos de NLTK, que no dependen de la base) sobre bases con distinta cantidad
+# de reclamos y muestra cuánto tarda, junto con lo que tardaría contar los reclamos cargándolos todos.
+# Que el arranque no lea la tabla de reclamos lo verifica test_gestor_reclamos; este benchmark no se ejecuta
+# con el resto de las pruebas. Se indican las cantidades de reclamos de las bases:
+#     BENCHMARK_ARRANQUE=1000,200000 python -m pytest -s tests/test_rendimiento_arranque.py
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from modules.agregados import AgregadosReclamos
+from modules.base_datos import crear_engine, obtener_engine
+from modules.buscador_similares import BuscadorReclamosSimilares
+from modules.cache_graficos import CacheGraficos
+from modules.cola_urgencia import ColaUrgenciaReclamos
+from modules.dominio import Reclamo
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.gestor_usuarios import GestorDeUsuarios
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy, RepositorioUsuariosSQLAlchemy
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_ARRANQUE", "1000,20000").split(",")]
+
+
+def medir(funcion, repeticiones=5):
+    '''Devuelve el mejor tiempo (en segundos) de ejecutar la función.'''
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_ARRANQUE"), "Benchmark (variable BENCHMARK_ARRANQUE)")
+class TestRendimientoArranque(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def crear_base(self, n):
+        '''Crea una base en archivo con n reclamos y devuelve su fábrica de sesiones.'''
+        url = f"sqlite:///{os.path.join(self.directorio, f'base_{n}.db')}"
+        self.addCleanup(lambda: obtener_engine(url).dispose())
+        fabrica = crear_engine(url)
+        with fabrica() as sesion:
+            RepositorioReclamosSQLAlchemy(sesion).guardar_registros(
+                Reclamo(None, i % 50 + 1, "Pendiente", f"Reclamo número {i}", "Maestranza") for i in range(n))
+        return fabrica
+
+    def arrancar(self, fabrica):
+        '''Arma los objetos que server.py crea al importarse.'''
+        with fabrica() as sesion:
+            repo_reclamo, repo_usuario = RepositorioReclamosSQLAlchemy(sesion), RepositorioUsuariosSQLAlchemy(sesion)
+            agregados = AgregadosReclamos(repo_reclamo)
+            cola_urgencia = ColaUrgenciaReclamos(repo_reclamo)
+            observadores = [BuscadorReclamosSimilares(repo_reclamo), agregados, cola_urgencia,
+                            CacheGraficos(agregados, directorio=self.directorio)]
+            GestorDeReclamos(repo_reclamo, observadores=observadores)
+            GestorDeUsuarios(repo_usuario, observadores=[cola_urgencia])
+
+    def test_arranque(self):
+        for n in TAMANOS:
+            fabrica = self.crear_base(n)
+            arranque = medir(lambda: self.arrancar(fabrica))
+            with fabrica() as sesion:
+                repo = RepositorioReclamosSQLAlchemy(sesion)
+                cargando = medir(lambda: len(repo.obtener_todos_los_registros()), repeticiones=1)
+                contando = medir(repo.contar_total_reclamos)
+            print(f"\nn={n}: arranque {arranque * 1000:.2f} ms; contar cargando los reclamos "
+                  f"{cargando * 1000:.1f} ms, con COUNT {contando * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    unittest.main()
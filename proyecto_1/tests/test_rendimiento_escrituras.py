@@ -0,0 +1,76 @@
+# Prueba de carga de escrituras concurrentes sobre SQLite (modules/base_datos.py y modules/escritor_agrupado.py).
+# Varios hilos, como los pedidos del servidor, alternan altas de reclamos y listados por cursor contra una
+# base en archivo, en tres configuraciones: journal por defecto (solo con busy_timeout), WAL con los PRAGMAs de
+# PRAGMAS_SQLITE, y WAL con escritor agrupado. Muestra las operaciones por segundo de cada una y verifica
+# que no haya errores (por ejemplo, "database is locked") y que se hayan guardado todos los reclamos.
+# No se ejecuta con el resto de las pruebas (las escrituras concurrentes sin errores las verifica test_base_datos);
+# se indican la cantidad de hilos y de altas por hilo:
+#     BENCHMARK_ESCRITURAS=16,200 python -m pytest -s tests/test_rendimiento_escrituras.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from modules.base_datos import crear_engine, liberar_sesion_por_hilo, obtener_engine, obtener_sesion_por_hilo
+from modules.dominio import Reclamo
+from modules.escritor_agrupado import EscritorAgrupado
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+
+HILOS, ALTAS = (int(v) for v in os.environ.get("BENCHMARK_ESCRITURAS", "8,20").split(","))
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_ESCRITURAS"), "Benchmark (variable BENCHMARK_ESCRITURAS)")
+class TestRendimientoEscrituras(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def medir(self, nombre, pragmas, agrupar):
+        '''Ejecuta la carga sobre una base nueva y devuelve las operaciones por segundo.'''
+        url = f"sqlite:///{os.path.join(self.directorio, nombre + '.db')}"
+        engine = obtener_engine(url, pragmas)
+        self.addCleanup(engine.dispose)
+        escritor = EscritorAgrupado(crear_engine(url)) if agrupar else None
+        repo = RepositorioReclamosSQLAlchemy(obtener_sesion_por_hilo(url), escritor)
+        errores = []
+
+        def trabajar(hilo):
+            try:
+                for i in range(ALTAS):
+                    repo.guardar_registro(Reclamo(None, hilo, "Pendiente", f"Reclamo {hilo}-{i}", "Maestranza"))
+                    repo.obtener_reclamos_por_cursor(20, "Maestranza")
+                    liberar_sesion_por_hilo(url)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                liberar_sesion_por_hilo(url)
+
+        hilos = [threading.Thread(target=trabajar, args=(h,)) for h in range(HILOS)]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.perf_counter() - inicio
+        if escritor is not None:
+            print(f"  escritor agrupado: {escritor.estadisticas()['escrituras_por_lote']:.1f} escrituras por commit")
+            escritor.cerrar()
+
+        self.assertEqual(errores, [], nombre)
+        self.assertEqual(repo.contar_reclamos("Maestranza"), HILOS * ALTAS, nombre)
+        liberar_sesion_por_hilo(url)
+        return 2 * HILOS * ALTAS / segundos
+
+    def test_escrituras_concurrentes(self):
+        print(f"\n{HILOS} hilos x {ALTAS} (alta + listado):")
+        for nombre, pragmas, agrupar in (("journal por defecto", {"busy_timeout": 30000}, False),
+                                         ("WAL", None, False),
+                                         ("WAL + escritor agrupado", None, True)):
+            operaciones = self.medir(nombre.replace(" ", "_"), pragmas, agrupar)
+            print(f"  {nombre:<25} {operaciones:10.0f} operaciones/s")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# Benchmark de los índices de la migración 2 (modules/migraciones.py).
+# Para cada consulta frecuente muestra el plan de SQLite (EXPLAIN QUERY PLAN) y el tiempo sin y con
+# los índices, y verifica que con los índices el plan ya no recorra la tabla entera.
+# No se ejecuta con el resto de las pruebas (el uso de los índices lo verifica test_migraciones);
+# se indican las cantidades de reclamos a medir:
+#     BENCHMARK_INDICES=20000,200000 python -m pytest -s tests/test_rendimiento_indices.py
+import os
+import random
+import time
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from modules.migraciones import INDICES_FILTROS, migrar
+from tests.test_migraciones import CONSULTAS, plan
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_INDICES", "20000").split(",")]
+DEPARTAMENTOS = ("Maestranza", "Soporte_Informatico", "Secretaria_Tecnica")
+ESTADOS = ("Pendiente", "En proceso", "Resuelto", "Invalido")
+
+
+def medir(conexion, consulta, parametros, repeticiones=5):
+    '''Devuelve el mejor tiempo (en segundos) de ejecutar la consulta.'''
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        conexion.execute(text(consulta), parametros).fetchall()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_INDICES"), "Benchmark (variable BENCHMARK_INDICES)")
+class TestRendimientoIndices(unittest.TestCase):
+
+    def crear_base(self, n):
+        '''Crea una base con n reclamos y adherentes, con el esquema migrado pero sin los índices de filtro.'''
+        engine = create_engine('sqlite:///:memory:')
+        migrar(engine)
+        azar = random.Random(n)
+        inicio = datetime(2024, 1, 1)
+        with engine.begin() as conexion:
+            for nombre, _, _ in INDICES_FILTROS:
+                conexion.execute(text(f"DROP INDEX {nombre}"))
+            conexion.execute(text(
+                "INSERT INTO reclamos (id_reclamo, id_creador, estado, contenido, fecha_y_hora, departamento) "
+                "VALUES (:id, :creador, :estado, 'reclamo', :fecha, :departamento)"),
+                [{"id": i, "creador": azar.randint(1, n // 10 + 1), "estado": azar.choice(ESTADOS),
+                  "fecha": inicio + timedelta(minutes=i), "departamento": azar.choice(DEPARTAMENTOS)}
+                 for i in range(1, n + 1)])
+            conexion.execute(text("INSERT OR IGNORE INTO usuarios_reclamos VALUES (:usuario, :reclamo)"),
+                             [{"usuario": azar.randint(1, 1000), "reclamo": azar.randint(1, n)} for _ in range(n)])
+        return engine
+
+    def test_planes_con_y_sin_indices(self):
+        for n in TAMANOS:
+            engine = self.crear_base(n)
+            parametros = {"cursor": n // 2, "desde": datetime(2024, 1, 1) + timedelta(minutes=n - 100)}
+            with engine.connect() as conexion:
+                antes = {nombre: (plan(conexion, c, parametros), medir(conexion, c, parametros))
+                         for nombre, c in CONSULTAS.items()}
+            # Se vuelven a crear los índices con la migración, como en una base existente
+            with engine.begin() as conexion:
+                conexion.execute(text("DELETE FROM schema_version WHERE version >= 2"))
+            migrar(engine)
+            with engine.connect() as conexion:
+                for nombre, consulta in CONSULTAS.items():
+                    plan_despues = plan(conexion, consulta, parametros)
+                    segundos = medir(conexion, consulta, parametros)
+                    print(f"\n{nombre} n={n}: {antes[nombre][1] * 1000:.2f} ms -> {segundos * 1000:.2f} ms"
+                          f"\n  sin índices: {antes[nombre][0]}\n  con índices: {plan_despues}")
+                    self.assertIn("INDEX", plan_despues, nombre)
+                    self.assertNotRegex(plan_despues, r"^SCAN (reclamos|usuarios_reclamos)$", nombre)
+            engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# Benchmark de la instantánea por columnas de la analítica: carga bases con distinta cantidad de reclamos y
+# compara el resumen de estadísticas (porcentajes por estado, medianas y p90 de tiempo) y los conteos semanales
+# calculados con numpy sobre InstantaneaReclamos contra el mismo cálculo con listas por comprensión sobre
+# las filas en Python, y verifica que la instantánea sea más rápida. También muestra cuánto tarda la carga
+# inicial y la actualización incremental por marca de agua (columna actualizado).
+# Solo corre si se define la variable de entorno, con las cantidades de reclamos a medir:
+#     BENCHMARK_INSTANTANEA=200000,2000000 python -m pytest -s tests/test_rendimiento_instantanea.py
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import unittest
+from collections import Counter
+from datetime import datetime, timedelta
+from modules.agregados import calcular_porcentajes
+from modules.base_datos import crear_engine, obtener_engine
+from modules.dominio import VALORES_ESTADO
+from modules.instantanea_reclamos import COLUMNAS_INSTANTANEA, InstantaneaReclamos
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_INSTANTANEA", "200000").split(",")]
+DEPARTAMENTOS = ("Maestranza", "Soporte_Informatico", "Secretaria_Tecnica")
+
+
+def medir(funcion, repeticiones=3):
+    '''Devuelve el mejor tiempo (en segundos) de ejecutar la función.'''
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor
+
+
+def resumen_con_listas(filas, departamento):
+    '''El resumen de la instantánea calculado recorriendo las filas con listas por comprensión.'''
+    filas = [fila for fila in filas if fila[2] == departamento]
+    conteo = Counter(fila[1] for fila in filas)
+    resumen = {"total": len(filas), "porcentajes": calcular_porcentajes(conteo)}
+    for estado in ("En proceso", "Resuelto"):
+        tiempos = [fila[3] for fila in filas if fila[1] == estado and fila[3] is not None]
+        resumen[estado] = statistics.median(tiempos), statistics.quantiles(tiempos, n=10, method="inclusive")[-1]
+    resumen["serie"] = sorted(Counter((fila[4].date() - timedelta(days=fila[4].weekday()), fila[1], fila[3])
+                                      for fila in filas).items())
+    return resumen
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_INSTANTANEA"), "Benchmark (variable BENCHMARK_INSTANTANEA)")
+class TestRendimientoInstantanea(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+
+    def crear_repositorio(self, n):
+        '''Crea una base en archivo con n reclamos y devuelve su repositorio.'''
+        url = f"sqlite:///{os.path.join(self.directorio, f'base_{n}.db')}"
+        self.addCleanup(lambda: obtener_engine(url).dispose())
+        sesion = crear_engine(url)()
+        self.addCleanup(sesion.close)
+        repo = RepositorioReclamosSQLAlchemy(sesion)
+        inicio = datetime(2024, 1, 1)
+        # Con actualizado igual a la fecha de creación, como una base en uso y no recién importada
+        filas = [(i % 50 + 1, VALORES_ESTADO[i % 4], "Reclamo", DEPARTAMENTOS[i % 3], i % 15 + 1 if i % 4 else None,
+                  inicio + timedelta(minutes=7 * i), inicio + timedelta(minutes=7 * i)) for i in range(n)]
+        repo.importar_filas(("id_creador", "estado", "contenido", "departamento", "tiempo_en_proceso", "fecha_y_hora",
+                             "actualizado"), [filas])
+        return repo
+
+    def test_instantanea_mas_rapida_que_listas(self):
+        for n in TAMANOS:
+            repo = self.crear_repositorio(n)
+            instantanea = InstantaneaReclamos(repo)
+            carga = medir(instantanea.actualizar, repeticiones=1)
+            incremental = medir(instantanea.actualizar)
+            filas = [fila for lote in repo.iterar_filas(COLUMNAS_INSTANTANEA, tamano_lote=50000) for fila in lote]
+
+            def con_numpy():
+                instantanea.obtener_resumen("Maestranza")
+                instantanea.conteos_por_periodo("Maestranza", "semana")
+
+            vectorizado = medir(con_numpy)
+            listas = medir(lambda: resumen_con_listas(filas, "Maestranza"))
+            print(f"\nn={n}: carga {carga * 1000:.0f} ms, actualización sin cambios {incremental * 1000:.2f} ms; "
+                  f"resumen y conteos con numpy {vectorizado * 1000:.1f} ms, con listas {listas * 1000:.1f} ms "
+                  f"(x{listas / vectorizado:.1f})")
+            self.assertLess(vectorizado, listas)
+
+
+if __name__ == '__main__':
+    unittest.main()
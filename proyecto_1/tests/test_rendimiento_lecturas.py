@@ -0,0 +1,66 @@
+# Benchmark de las lecturas de reclamos para listar: compara, por fila, el camino con entidades
+# (ModeloReclamo -> Reclamo con todas sus validaciones -> to_dict) con la proyección de columnas
+# a VistaReclamo que usan obtener_reclamos_paginados, obtener_registros_por_filtro y obtener_registros_por_ids.
+# Verifica que ambos devuelvan lo mismo y que la proyección sea más rápida.
+# No se ejecuta con el resto de las pruebas (que la proyección devuelva lo mismo que las entidades lo verifica
+# test_repositorio_bases); se indican las cantidades de reclamos a medir:
+#     BENCHMARK_LECTURAS=5000,50000 python -m pytest -s tests/test_rendimiento_lecturas.py
+import os
+import time
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.dominio import Reclamo
+from modules.modelos import Base, ModeloReclamo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_LECTURAS", "5000").split(",")]
+
+
+def medir(funcion, repeticiones=3):
+    '''Ejecuta la función varias veces y devuelve (mejor tiempo en segundos, resultado de la última ejecución).'''
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor, resultado
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_LECTURAS"), "Benchmark (variable BENCHMARK_LECTURAS)")
+class TestRendimientoLecturas(unittest.TestCase):
+
+    def crear_repo(self, n):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        sesion = sessionmaker(bind=engine)()
+        self.addCleanup(sesion.close)
+        repo = RepositorioReclamosSQLAlchemy(sesion)
+        repo.guardar_registros(Reclamo(None, i % 50 + 1, "En proceso", f"Reclamo número {i}", "Maestranza",
+                                       tiempo_en_proceso=i % 15 + 1) for i in range(n))
+        return sesion, repo
+
+    @staticmethod
+    def leer_con_entidades(sesion, n):
+        '''El camino anterior: cada fila se convierte en un Reclamo validado y después en diccionario.'''
+        modelos = sesion.query(ModeloReclamo).order_by(ModeloReclamo.id_reclamo.desc()).limit(n).all()
+        reclamos = [Reclamo(id_reclamo=m.id_reclamo, id_creador=m.id_creador, estado=m.estado,
+                            fecha_y_hora=m.fecha_y_hora, contenido=m.contenido, departamento=m.departamento,
+                            r_imagen=m.r_imagen, tiempo_en_proceso=m.tiempo_en_proceso).to_dict() for m in modelos]
+        sesion.expunge_all()
+        return reclamos
+
+    def test_proyeccion_mas_rapida_que_entidades(self):
+        for n in TAMANOS:
+            sesion, repo = self.crear_repo(n)
+            segundos_entidades, con_entidades = medir(lambda: self.leer_con_entidades(sesion, n))
+            segundos_vistas, con_vistas = medir(lambda: repo.obtener_reclamos_paginados(1, n)[0])
+            self.assertEqual(con_vistas, con_entidades)
+            print(f"\nn={n}: entidades {segundos_entidades / n * 1e6:.1f} µs/fila, "
+                  f"proyección {segundos_vistas / n * 1e6:.1f} µs/fila (x{segundos_entidades / segundos_vistas:.1f})")
+            self.assertLess(segundos_vistas, segundos_entidades)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Benchmark de memoria de las entidades del dominio: mide con tracemalloc cuánto ocupa tener muchos reclamos
+# en memoria (como la analítica o la búsqueda de similares) con Reclamo (__slots__ y estado/departamento
+# compartidos) y con una clase equivalente a la anterior (atributos en el __dict__ de cada instancia y
+# un texto nuevo por reclamo), y verifica que Reclamo ocupe menos.
+# No se ejecuta con el resto de las pruebas (que las entidades no tengan __dict__ lo verifican test_reclamo
+# y test_usuario); se indican las cantidades de reclamos a medir:
+#     BENCHMARK_MEMORIA=100000,500000 python -m pytest -s tests/test_rendimiento_memoria.py
+import gc
+import os
+import time
+import tracemalloc
+import unittest
+from datetime import datetime
+from modules.dominio import Reclamo
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_MEMORIA", "100000").split(",")]
+ESTADOS = ("Pendiente", "En proceso", "Resuelto", "Invalido")
+
+
+class ReclamoConDict:
+    '''Reclamo como estaba antes: los mismos atributos, en el __dict__ de cada instancia.'''
+    def __init__(self, id_reclamo, id_creador, estado, contenido, departamento, fecha_y_hora, tiempo_en_proceso):
+        self.__id_reclamo = id_reclamo
+        self.__id_creador = id_creador
+        self.__estado = estado
+        self.__fecha_y_hora = fecha_y_hora
+        self.__contenido = contenido.strip()
+        self.__departamento = departamento.strip().title()
+        self.__tiempo_en_proceso = tiempo_en_proceso
+        self.__r_imagen = None
+
+    @property
+    def estado(self):
+        return self.__estado
+
+
+def filas(n):
+    '''Datos de n reclamos como los devuelve el driver de la base: un objeto de texto nuevo por valor.'''
+    fecha = datetime(2024, 1, 1)
+    for i in range(n):
+        yield (i + 1, i % 50 + 1, ESTADOS[i % 4].encode().decode(), f"Reclamo número {i}",
+               "maestranza".encode().decode(), fecha, i % 15 + 1)
+
+
+def medir(crear, n):
+    '''Devuelve (bytes por reclamo, microsegundos por lectura del estado) de tener n reclamos en una lista.'''
+    gc.collect()
+    tracemalloc.start()
+    reclamos = [crear(*fila) for fila in filas(n)]
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    for reclamo in reclamos:
+        reclamo.estado
+    return memoria / n, (time.perf_counter() - inicio) / n * 1e6
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_MEMORIA"), "Benchmark (variable BENCHMARK_MEMORIA)")
+class TestRendimientoMemoria(unittest.TestCase):
+
+    def test_memoria_de_reclamos(self):
+        for n in TAMANOS:
+            bytes_antes, lectura_antes = medir(
+                lambda i, c, e, t, d, f, tp: ReclamoConDict(i, c, e, t, d, f, tp), n)
+            bytes_ahora, lectura_ahora = medir(
+                lambda i, c, e, t, d, f, tp: Reclamo(i, c, e, t, d, fecha_y_hora=f, tiempo_en_proceso=tp), n)
+            print(f"\nn={n}: con __dict__ {bytes_antes:.0f} bytes/reclamo ({lectura_antes:.3f} µs por lectura), "
+                  f"con __slots__ {bytes_ahora:.0f} bytes/reclamo ({lectura_ahora:.3f} µs por lectura), "
+                  f"{n * (bytes_antes - bytes_ahora) / 2 ** 20:.1f} MB menos")
+            self.assertLess(bytes_ahora, bytes_antes)
+
+
+if __name__ == '__main__':
+    unittest.main()
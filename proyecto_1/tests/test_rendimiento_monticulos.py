@@ -0,0 +1,188 @@
+# Benchmarks de los montículos (mediana, percentiles y cola de urgencia dependen de MonticuloBinario).
+# Cada prueba mide el montículo propio contra heapq con los mismos datos, verifica que los resultados
+# coincidan y falla si el montículo es más de RELACION_MAXIMA veces más lento que heapq.
+# No se ejecutan con el resto de las pruebas; se indican las cantidades de elementos a medir:
+#     BENCHMARK_MONTICULOS=10000,100000,1000000 python -m pytest -s tests/test_rendimiento_monticulos.py
+import heapq
+import os
+import random
+import statistics
+import time
+import unittest
+from modules.monticulos import MonticuloBinario, MonticuloIndexado, MonticuloMediana
+
+TAMANOS = [int(t) for t in os.environ.get("BENCHMARK_MONTICULOS", "10000").split(",")]
+RELACION_MAXIMA = float(os.environ.get("BENCHMARK_RELACION_MAXIMA", "25"))
+
+
+def medir(funcion, repeticiones):
+    '''Ejecuta la función varias veces y devuelve (mejor tiempo en segundos, resultado de la última ejecución).'''
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = segundos if mejor is None else min(mejor, segundos)
+    return mejor, resultado
+
+
+@unittest.skipUnless(os.environ.get("BENCHMARK_MONTICULOS"), "Benchmark (variable BENCHMARK_MONTICULOS)")
+class TestRendimientoMonticulos(unittest.TestCase):
+
+    def comparar(self, nombre, n, propio, referencia):
+        '''Mide las dos funciones, verifica que devuelvan lo mismo e informa el throughput de cada una.'''
+        repeticiones = 3 if n <= 100000 else 1
+        segundos_propio, resultado_propio = medir(propio, repeticiones)
+        segundos_referencia, resultado_referencia = medir(referencia, repeticiones)
+        self.assertEqual(resultado_propio, resultado_referencia, nombre)
+        relacion = segundos_propio / max(segundos_referencia, 1e-9)
+        print(f"\n{nombre} n={n}: {n / segundos_propio:,.0f} op/s "
+              f"(heapq {n / segundos_referencia:,.0f} op/s, x{relacion:.1f})")
+        self.assertLess(relacion, RELACION_MAXIMA, f"{nombre} n={n} es x{relacion:.1f} más lento que heapq")
+
+    def test_insertar_y_eliminar_min(self):
+        for n in TAMANOS:
+            datos = [random.random() for _ in range(n)]
+
+            def propio():
+                heap = MonticuloBinario("min")
+                for d in datos:
+                    heap.push(d)
+                return [heap.pop() for _ in range(n)]
+
+            def referencia():
+                heap = []
+                for d in datos:
+                    heapq.heappush(heap, d)
+                return [heapq.heappop(heap) for _ in range(n)]
+
+            self.comparar("push/pop min", n, propio, referencia)
+
+    def test_insertar_y_eliminar_max(self):
+        for n in TAMANOS:
+            datos = [random.randint(0, n) for _ in range(n)]
+
+            def propio():
+                heap = MonticuloBinario("max")
+                for d in datos:
+                    heap.push(d)
+                return [heap.pop() for _ in range(n)]
+
+            def referencia():
+                heap = []
+                for d in datos:
+                    heapq.heappush(heap, -d)
+                return [-heapq.heappop(heap) for _ in range(n)]
+
+            self.comparar("push/pop max", n, propio, referencia)
+
+    def test_heapify(self):
+        for n in TAMANOS:
+            datos = [random.random() for _ in range(n)]
+
+            def propio():
+                heap = MonticuloBinario("min")
+                heap.heapify(datos)
+                return heap.peek(), len(heap)
+
+            def referencia():
+                heap = list(datos)
+                heapq.heapify(heap)
+                return heap[0], len(heap)
+
+            self.comparar("heapify", n, propio, referencia)
+
+    def test_pushpop_y_replace(self):
+        for n in TAMANOS:
+            datos = [random.random() for _ in range(n)]
+            base = datos[:100]
+
+            def propio():
+                heap = MonticuloBinario("min")
+                heap.heapify(base)
+                return [heap.pushpop(d) if i % 2 else heap.replace(d) for i, d in enumerate(datos)]
+
+            def referencia():
+                heap = list(base)
+                heapq.heapify(heap)
+                return [heapq.heappushpop(heap, d) if i % 2 else heapq.heapreplace(heap, d) for i, d in enumerate(datos)]
+
+            self.comparar("pushpop/replace", n, propio, referencia)
+
+    def test_clave(self):
+        for n in TAMANOS:
+            datos = [(random.random(), i) for i in range(n)]
+
+            def propio():
+                heap = MonticuloBinario("max", clave=lambda par: par[0])
+                heap.heapify(datos)
+                return [heap.pop()[1] for _ in range(min(n, 1000))]
+
+            def referencia():
+                return [i for _, i in heapq.nlargest(min(n, 1000), datos)]
+
+            self.comparar("heapify+pop con clave", n, propio, referencia)
+
+    def test_mediana(self):
+        for n in TAMANOS:
+            datos = [random.randint(0, 1000) for _ in range(n)]
+
+            def propio():
+                monticulo = MonticuloMediana()
+                for d in datos:
+                    monticulo.agregar_valor(d)
+                return monticulo.mediana
+
+            def referencia():
+                # Mediana con dos heaps de heapq, sin bajas
+                abajo, arriba = [], []
+                for d in datos:
+                    if abajo and d > -abajo[0]:
+                        heapq.heappush(arriba, d)
+                    else:
+                        heapq.heappush(abajo, -d)
+                    if len(abajo) > len(arriba) + 1:
+                        heapq.heappush(arriba, -heapq.heappop(abajo))
+                    elif len(arriba) > len(abajo):
+                        heapq.heappush(abajo, -heapq.heappop(arriba))
+                if len(abajo) > len(arriba):
+                    return -abajo[0]
+                return (-abajo[0] + arriba[0]) / 2
+
+            self.comparar("mediana", n, propio, referencia)
+            self.assertEqual(propio(), statistics.median(datos))
+
+    def test_prioridades(self):
+        for n in TAMANOS:
+            prioridades = [random.random() for _ in range(n)]
+            aumentos = [(random.randrange(n), random.random()) for _ in range(n // 10)]
+
+            def propio():
+                heap = MonticuloIndexado()
+                for clave, prioridad in enumerate(prioridades):
+                    heap.insertar(clave, prioridad)
+                for clave, aumento in aumentos:
+                    heap.cambiar_prioridad(clave, heap.prioridad(clave) + aumento)
+                return [clave for _, clave in heap.primeros(20)]
+
+            def referencia():
+                # Con heapq el cambio de prioridad se hace agregando una entrada nueva y descartando las viejas al sacar
+                actuales = list(prioridades)
+                heap = []
+                for clave, prioridad in enumerate(prioridades):
+                    heapq.heappush(heap, (-prioridad, clave))
+                for clave, aumento in aumentos:
+                    actuales[clave] += aumento
+                    heapq.heappush(heap, (-actuales[clave], clave))
+                primeros = []
+                while len(primeros) < 20:
+                    prioridad, clave = heapq.heappop(heap)
+                    if -prioridad == actuales[clave]:
+                        primeros.append(clave)
+                return primeros
+
+            self.comparar("cola de prioridad", n, propio, referencia)
+
+
+if __name__ == '__main__':
+    unittest.main()
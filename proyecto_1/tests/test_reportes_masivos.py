@@ -0,0 +1,78 @@
+import unittest
+import zipfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.modelos import Base
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.agregados import AgregadosReclamos
+from modules.reportes_masivos import (GLOBAL, calcular_estadisticas_masivas, generar_reportes_masivos,
+                                      percentil_histograma)
+
+
+class TestReportesMasivos(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        self.gestor = GestorDeReclamos(self.repo)
+
+        self.gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Luz quemada en el aula", "Maestranza", None)
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Piso sucio", "Maestranza", 4)
+        self.gestor.agregar_nuevo_Reclamo(1, "En proceso", "Luz del pasillo", "Maestranza", 7)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 2)
+        self.gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Wifi lento", "Soporte_Informatico", 5)
+
+    def test_percentil_histograma(self):
+        self.assertIsNone(percentil_histograma({}, 50))
+        self.assertEqual(percentil_histograma({1: 1, 3: 1}, 50), 2)
+        self.assertAlmostEqual(percentil_histograma({1: 3, 10: 1}, 90), 7.3)
+
+    def test_estadisticas_coinciden_con_agregados(self):
+        estadisticas = calcular_estadisticas_masivas(self.repo, tamano_lote=2)
+        agregados = AgregadosReclamos(self.repo)
+        for departamento in ("Maestranza", "Soporte_Informatico"):
+            resumen = agregados.obtener_resumen(departamento)
+            stats = estadisticas[departamento]
+            self.assertEqual(stats["total"], resumen["total"])
+            for clave in ("mediana_proceso", "mediana_resueltos", "p90_proceso", "p90_resueltos"):
+                self.assertEqual(stats[clave], resumen[clave], clave)
+            self.assertEqual(stats["palabras"], resumen["palabras"])
+
+    def test_global_suma_todos_los_departamentos(self):
+        estadisticas = calcular_estadisticas_masivas(self.repo)
+        self.assertEqual(estadisticas[GLOBAL]["total"], 5)
+        self.assertAlmostEqual(estadisticas[GLOBAL]["porcentajes"]["Pendiente"], 20)
+        self.assertEqual(estadisticas[GLOBAL]["mediana_resueltos"], 3.5)
+        self.assertEqual(sum(fila["creados"] for fila in estadisticas[GLOBAL]["serie"]), 5)
+        self.assertEqual(sum(fila["creados"] for fila in estadisticas["Maestranza"]["serie"]), 4)
+        self.assertEqual(estadisticas[GLOBAL]["palabras"]["luz"], 2)
+
+    def test_zip_con_un_reporte_por_departamento_y_formato(self):
+        salida = generar_reportes_masivos(self.repo, ("pdf", "html"), procesos=1, informar=lambda _: None)
+        with zipfile.ZipFile(salida) as archivo_zip:
+            nombres = set(archivo_zip.namelist())
+            self.assertEqual(nombres, {f"reporte_{d}.{f}" for d in ("Maestranza", "Soporte_Informatico", GLOBAL)
+                                       for f in ("pdf", "html")})
+            self.assertTrue(archivo_zip.read("reporte_Maestranza.pdf").startswith(b"%PDF"))
+            self.assertIn(b"Maestranza", archivo_zip.read("reporte_Maestranza.html"))
+
+    def test_pool_de_procesos(self):
+        salida = generar_reportes_masivos(self.repo, ("html",), procesos=2, informar=lambda _: None)
+        with zipfile.ZipFile(salida) as archivo_zip:
+            self.assertEqual(len(archivo_zip.namelist()), 3)
+            self.assertIn(b"data:image/png;base64,", archivo_zip.read(f"reporte_{GLOBAL}.html"))
+
+    def test_argumentos_invalidos(self):
+        with self.assertRaises(ValueError):
+            generar_reportes_masivos(self.repo, ("docx",))
+        with self.assertRaises(ValueError):
+            generar_reportes_masivos(self.repo, procesos=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from datetime import date, datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.agregados import AgregadosReclamos
+from modules.analitica import Analitica
+from modules.cache_graficos import CacheGraficos
+from modules.dominio import Reclamo
+from modules.modelos import Base
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.series_temporales import armar_serie
+
+
+class TestSeriesTemporales(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+        self.session = Session()
+        self.repo = RepositorioReclamosSQLAlchemy(self.session)
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        agregados = AgregadosReclamos(self.repo)
+        self.analitica = Analitica(self.repo, agregados, CacheGraficos(agregados, directorio))
+
+        # 5 y 12 de mayo de 2024 son domingos: cuentan en la semana que empezó el lunes anterior
+        datos = [("Pendiente", None, datetime(2024, 5, 5, 9)),
+                 ("Resuelto", 2, datetime(2024, 5, 6, 10)),
+                 ("Resuelto", 6, datetime(2024, 5, 12, 23)),
+                 ("En proceso", 4, datetime(2024, 5, 12, 8)),
+                 ("Invalido", None, datetime(2024, 6, 3, 12))]
+        for estado, tiempo, fecha in datos:
+            self.repo.guardar_registro(Reclamo(None, 1, estado, "Luz quemada", "Maestranza",
+                                               fecha_y_hora=fecha, tiempo_en_proceso=tiempo))
+        self.repo.guardar_registro(Reclamo(None, 1, "Pendiente", "Wifi lento", "Soporte_Informatico",
+                                           fecha_y_hora=datetime(2024, 5, 7)))
+
+    def test_armar_serie(self):
+        serie = armar_serie([(date(2024, 5, 1), "Resuelto", 2, 1), (date(2024, 5, 1), "Pendiente", None, 2),
+                             (date(2024, 6, 1), "Resuelto", 4, 3), (date(2024, 6, 1), "En proceso", 1, 1)], "mes")
+        self.assertEqual(serie, [
+            {"periodo": date(2024, 5, 1), "creados": 3, "resueltos": 1, "abiertos": 2, "abiertos_acumulados": 2,
+             "mediana_resolucion": 2, "p90_resolucion": 2},
+            {"periodo": date(2024, 6, 1), "creados": 4, "resueltos": 3, "abiertos": 1, "abiertos_acumulados": 3,
+             "mediana_resolucion": 4, "p90_resolucion": 4}])
+        self.assertEqual(armar_serie([]), [])
+
+    def test_periodos_sin_reclamos(self):
+        serie = armar_serie([(date(2024, 4, 29), "Pendiente", None, 2), (date(2024, 5, 20), "Resuelto", 3, 1)],
+                            "semana")
+        self.assertEqual([(f["periodo"], f["creados"], f["abiertos_acumulados"]) for f in serie],
+                         [(date(2024, 4, 29), 2, 2), (date(2024, 5, 6), 0, 2), (date(2024, 5, 13), 0, 2),
+                          (date(2024, 5, 20), 1, 2)])
+        self.assertIsNone(serie[1]["mediana_resolucion"])
+        meses = armar_serie([(date(2023, 11, 1), "Pendiente", None, 1), (date(2024, 2, 1), "Pendiente", None, 1)],
+                            "mes")
+        self.assertEqual([f["periodo"] for f in meses],
+                         [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)])
+        dias = armar_serie([(date(2024, 2, 28), "Pendiente", None, 1), (date(2024, 3, 1), "Pendiente", None, 1)],
+                           "dia")
+        self.assertEqual(len(dias), 3)
+        with self.assertRaises(ValueError):
+            armar_serie([(date(2024, 1, 1), "Pendiente", None, 1), (date(2025, 1, 1), "Pendiente", None, 1)], "año")
+
+    def test_conteos_por_periodo(self):
+        semanas = Counter()
+        for _, inicio, estado, _, cantidad in self.repo.obtener_conteos_por_periodo("semana", "Maestranza"):
+            semanas[(inicio, estado)] += cantidad
+        self.assertEqual(semanas, {(date(2024, 4, 29), "Pendiente"): 1, (date(2024, 5, 6), "Resuelto"): 2,
+                                   (date(2024, 5, 6), "En proceso"): 1, (date(2024, 6, 3), "Invalido"): 1})
+        meses = self.repo.obtener_conteos_por_periodo("mes")
+        self.assertEqual({inicio for _, inicio, _, _, _ in meses}, {date(2024, 5, 1), date(2024, 6, 1)})
+        self.assertEqual(len(self.repo.obtener_conteos_por_periodo("dia", "Maestranza")), 5)
+        with self.assertRaises(ValueError):
+            self.repo.obtener_conteos_por_periodo("año")
+
+    def test_estadisticas_incluyen_serie(self):
+        stats = self.analitica.generar_estadisticas("Maestranza", "semana")
+        self.assertEqual(stats["periodo"], "semana")
+        self.assertEqual([(f["periodo"], f["creados"], f["abiertos_acumulados"]) for f in stats["serie"]],
+                         [(date(2024, 4, 29), 1, 1), (date(2024, 5, 6), 3, 2), (date(2024, 5, 13), 0, 2),
+                          (date(2024, 5, 20), 0, 2), (date(2024, 5, 27), 0, 2), (date(2024, 6, 3), 1, 2)])
+        self.assertEqual(stats["serie"][1]["mediana_resolucion"], 4)
+        self.assertEqual(self.analitica.generar_estadisticas("Secretaria_Tecnica")["serie"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
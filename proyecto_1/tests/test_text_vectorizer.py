@@ -0,0 +1,43 @@
+import unittest
+import nltk
+import numpy as np
+from scipy.sparse import issparse
+
+
+def recursos_nltk_disponibles():
+    try:
+        nltk.data.find("corpora/stopwords")
+        nltk.data.find("tokenizers/punkt_tab")
+        return True
+    except LookupError:
+        return False
+
+
+@unittest.skipUnless(recursos_nltk_disponibles(), "Faltan los recursos de NLTK (ver modules/setup_nltk.py)")
+class TestTextVectorizer(unittest.TestCase):
+
+    def setUp(self):
+        from modules.text_vectorizer import TextVectorizer
+        self.textos = ["La computadora del laboratorio no enciende",
+                       "El proyector del aula no enciende",
+                       "El piso del aula está sucio"]
+        self.denso = TextVectorizer().fit(self.textos)
+        self.disperso = TextVectorizer(sparse=True).fit(self.textos)
+
+    def test_transform_denso_por_defecto(self):
+        matriz = self.denso.transform(self.textos)
+        self.assertIsInstance(matriz, np.ndarray)
+        self.assertEqual(matriz.shape, (3, len(self.denso.vocabulario_)))
+
+    def test_transform_disperso_coincide_con_denso(self):
+        matriz = self.disperso.transform(self.textos)
+        self.assertTrue(issparse(matriz))
+        np.testing.assert_array_equal(matriz.toarray(), self.denso.transform(self.textos))
+
+    def test_palabras_fuera_del_vocabulario_se_ignoran(self):
+        matriz = self.disperso.transform(["xyzzy plugh"])
+        self.assertEqual(matriz.nnz, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
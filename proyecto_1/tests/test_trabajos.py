@@ -0,0 +1,148 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from modules.migraciones import migrar
+from modules.modelos import ModeloTrabajo
+from modules.repositorio_concreto import RepositorioReclamosSQLAlchemy
+from modules.gestor_reclamos import GestorDeReclamos
+from modules.trabajos import ColaTrabajos, ERROR, EN_CURSO, TERMINADO
+
+
+class TestColaTrabajos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+        # Base en archivo: los hilos del pool usan conexiones propias y tienen que ver los mismos datos
+        engine = create_engine(f"sqlite:///{self.directorio}/base.db")
+        self.addCleanup(engine.dispose)
+        migrar(engine)
+        self.Session = sessionmaker(bind=engine)
+        self.cola = self.crear_cola()
+
+        gestor = GestorDeReclamos(RepositorioReclamosSQLAlchemy(self.Session()))
+        gestor.agregar_nuevo_Reclamo(1, "Pendiente", "Luz quemada", "Maestranza", None)
+        gestor.agregar_nuevo_Reclamo(1, "Resuelto", "Puerta rota", "Maestranza", 2)
+
+    def crear_cola(self, **opciones):
+        cola = ColaTrabajos(self.Session, os.path.join(self.directorio, "trabajos"), **opciones)
+        self.addCleanup(cola.cerrar)
+        return cola
+
+    @staticmethod
+    def contar(sesion, departamento):
+        return {"total": len(RepositorioReclamosSQLAlchemy(sesion).obtener_registros_por_filtro("departamento", departamento))}
+
+    def test_resultado_json(self):
+        self.cola.registrar_tarea("contar", self.contar)
+        id_trabajo = self.cola.enviar("contar", id_usuario=7, departamento="Maestranza")
+        self.assertEqual(self.cola.esperar(id_trabajo, timeout=10)["estado"], TERMINADO)
+        ruta, mime, nombre = self.cola.resultado(id_trabajo)
+        self.assertEqual((mime, nombre), ("application/json", None))
+        with open(ruta) as archivo:
+            self.assertEqual(json.load(archivo), {"total": 2})
+
+    def test_resultado_por_partes(self):
+        self.cola.registrar_tarea("archivo", lambda sesion, n: (iter([b"ab"] * n), "text/plain", "datos.txt"))
+        id_trabajo = self.cola.enviar("archivo", n=3)
+        self.cola.esperar(id_trabajo, timeout=10)
+        ruta, mime, nombre = self.cola.resultado(id_trabajo)
+        with open(ruta, "rb") as archivo:
+            self.assertEqual(archivo.read(), b"ababab")
+        self.assertEqual(nombre, "datos.txt")
+
+    def test_enviar_no_espera_al_trabajo(self):
+        liberar = threading.Event()
+        self.cola.registrar_tarea("lento", lambda sesion: liberar.wait(10))
+        id_trabajo = self.cola.enviar("lento")
+        self.assertIn(self.cola.estado(id_trabajo)["estado"], ("Pendiente", EN_CURSO))
+        self.assertIsNone(self.cola.resultado(id_trabajo))
+        liberar.set()
+        self.assertEqual(self.cola.esperar(id_trabajo, timeout=10)["estado"], TERMINADO)
+
+    def test_error_de_la_tarea(self):
+        def fallar(sesion):
+            raise RuntimeError("sin datos")
+        self.cola.registrar_tarea("fallar", fallar)
+        estado = self.cola.esperar(self.cola.enviar("fallar"), timeout=10)
+        self.assertEqual((estado["estado"], estado["error"]), (ERROR, "sin datos"))
+        self.assertEqual(os.listdir(os.path.join(self.directorio, "trabajos")), [])
+
+    def test_validacion_y_tipo_desconocido(self):
+        def validar(formato):
+            if formato != "csv":
+                raise ValueError("Formato no soportado")
+        self.cola.registrar_tarea("exportar", lambda sesion, formato: b"", validar)
+        with self.assertRaises(ValueError):
+            self.cola.enviar("exportar", formato="docx")
+        with self.assertRaises(ValueError):
+            self.cola.enviar("desconocido")
+
+    def test_solo_lo_consulta_quien_lo_pidio(self):
+        self.cola.registrar_tarea("contar", self.contar)
+        id_trabajo = self.cola.enviar("contar", id_usuario=7, departamento="Maestranza")
+        self.cola.esperar(id_trabajo, timeout=10)
+        self.assertIsNone(self.cola.estado(id_trabajo, id_usuario=8))
+        self.assertIsNone(self.cola.resultado(id_trabajo, id_usuario=8))
+        self.assertIsNotNone(self.cola.resultado(id_trabajo, id_usuario=7))
+
+    def test_limpiar_borra_trabajos_viejos(self):
+        cola = self.crear_cola(conservar=timedelta(0))
+        cola.registrar_tarea("contar", self.contar)
+        id_trabajo = cola.enviar("contar", departamento="Maestranza")
+        cola.esperar(id_trabajo, timeout=10)
+        cola.limpiar()
+        self.assertIsNone(cola.estado(id_trabajo))
+        self.assertEqual(os.listdir(os.path.join(self.directorio, "trabajos")), [])
+
+    def test_trabajos_interrumpidos_al_reiniciar(self):
+        cola = self.crear_cola(proceso="servidor:100")
+        liberar = threading.Event()
+        self.addCleanup(liberar.set)
+        cola.registrar_tarea("lento", lambda sesion: liberar.wait(10))
+        id_trabajo = cola.enviar("lento")
+        # Un proceso nuevo con el mismo host:pid: el anterior ya no existe
+        reiniciada = self.crear_cola(proceso="servidor:100")
+        self.assertEqual(reiniciada.estado(id_trabajo)["estado"], ERROR)
+
+    def test_no_interrumpe_trabajos_de_otros_procesos(self):
+        cola = self.crear_cola(proceso="servidor:100")
+        liberar = threading.Event()
+        self.addCleanup(liberar.set)
+        cola.registrar_tarea("lento", lambda sesion: liberar.wait(10))
+        id_trabajo = cola.enviar("lento")
+        otra = self.crear_cola(proceso="servidor:200")
+        otra.limpiar()
+        self.assertIn(otra.estado(id_trabajo)["estado"], ("Pendiente", EN_CURSO))
+        liberar.set()
+        self.assertEqual(cola.esperar(id_trabajo, timeout=10)["estado"], TERMINADO)
+
+    def test_latido_vencido(self):
+        cola = self.crear_cola(proceso="servidor:100", latido=timedelta(milliseconds=50))
+        liberar = threading.Event()
+        self.addCleanup(liberar.set)
+        cola.registrar_tarea("lento", lambda sesion: liberar.wait(10))
+        id_trabajo = cola.enviar("lento")
+        # Mientras el proceso vive renueva el latido (cada 50 ms), así que pasados varios intervalos el trabajo
+        # sigue en curso para otro proceso que lo da por vencido a los 300 ms
+        time.sleep(0.6)
+        otra = self.crear_cola(proceso="servidor:200", latido=timedelta(milliseconds=100))
+        otra.limpiar()
+        self.assertIn(otra.estado(id_trabajo)["estado"], ("Pendiente", EN_CURSO))
+        # Un trabajo de un proceso que dejó de latir (se cayó) lo marcan como interrumpido los demás
+        with self.Session.begin() as sesion:
+            sesion.query(ModeloTrabajo).update({"proceso": "servidor:300",
+                                                "latido": datetime.now() - timedelta(seconds=1)})
+        otra.limpiar()
+        self.assertEqual(otra.estado(id_trabajo)["estado"], ERROR)
+
+
+if __name__ == '__main__':
+    unittest.main()
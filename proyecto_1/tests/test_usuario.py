@@ -25,6 +25,12 @@ class TestUsuario(unittest.TestCase):
         with self.assertRaises(ValueError):
             Usuario(1, "Marta", "Silva", "marta@mail.com", "123", "msilva", "Graduado", "Usuario_final")
 
+    def test_sin_dict(self):
+        user = Usuario(1, "Juan","juan@mail.com", "1234","Pérez", "jperez", "Estudiante", "Usuario_final")
+        self.assertFalse(hasattr(user, "__dict__"))
+        with self.assertRaises(AttributeError):
+            user.otro_atributo = 1
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file